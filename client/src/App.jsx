@@ -1,14 +1,68 @@
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import './App.css';
 
 const initialBoard = Array(9).fill(null);
 
+// Get API URL from environment, fallback to /api
+const apiUrl = import.meta.env.VITE_API_URL || '/api';
+
+// Game channel served only by the ASGI backend (asgi:app), so it is opt-in at
+// build time; the HTTP API is used without it or when it is unavailable
+const socketEnabled = import.meta.env.VITE_ENABLE_WEBSOCKET === 'true';
+
+const socketUrl = () => {
+  const url = new URL(apiUrl, window.location.href);
+  url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:';
+  return `${url.href.replace(/\/$/, '')}/ws`;
+};
+
+const prettyStatus = (s) => {
+  switch (s) {
+    case 'X_wins': return 'You win!';
+    case 'O_wins': return 'Computer wins!';
+    case 'draw': return "It's a draw!";
+    default: return 'Your move';
+  }
+};
+
 function App() {
   const [board, setBoard] = useState(initialBoard);
   const [status, setStatus] = useState('Your move');
   const [isGameOver, setIsGameOver] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [gameId, setGameId] = useState(null);
+  const socketRef = useRef(null);
+  const socketGameRef = useRef(false);
+
+  useEffect(() => {
+    if (!socketEnabled) return undefined;
+    const socket = new WebSocket(socketUrl());
+    socket.onopen = () => {
+      socketRef.current = socket;
+    };
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      setIsLoading(false);
+      if (data.error) {
+        setError('Failed to make move. Please try again.');
+        return;
+      }
+      setBoard(data.board);
+      setStatus(prettyStatus(data.status));
+      setIsGameOver(data.status !== 'in_progress');
+    };
+    socket.onclose = () => {
+      if (socketRef.current === socket) {
+        socketRef.current = null;
+        if (socketGameRef.current) {
+          setIsLoading(false);
+          setError('Connection lost. Please start a new game.');
+        }
+      }
+    };
+    return () => socket.close();
+  }, []);
 
   const handleClick = async (index) => {
     if (board[index] || isGameOver || isLoading) return;
@@ -16,16 +70,39 @@ function App() {
     setIsLoading(true);
     setError(null);
     
+    // One connection carries the whole game; the reply arrives in onmessage
+    const socket = socketRef.current;
+    if (socket && (socketGameRef.current || board.every((cell) => cell === null))) {
+      socketGameRef.current = true;
+      socket.send(JSON.stringify({ index }));
+      return;
+    }
+    
     try {
-      // Get API URL from environment, fallback to /api
-      const apiUrl = import.meta.env.VITE_API_URL || '/api';
+      // The server keeps the board; start a game on the first move
+      let id = gameId;
+      if (!id) {
+        const created = await fetch(`${apiUrl}/games`, { method: 'POST' });
+        if (!created.ok) {
+          throw new Error(`HTTP error! status: ${created.status}`);
+        }
+        id = (await created.json()).game_id;
+        setGameId(id);
+      }
       
-      const response = await fetch(`${apiUrl}/move`, {
+      const response = await fetch(`${apiUrl}/games/${id}/move`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ board, index }),
+        body: JSON.stringify({ index }),
       });
 
+      if (response.status === 404) {
+        // Session expired on the server
+        setGameId(null);
+        setBoard(initialBoard);
+        throw new Error('Game session expired');
+      }
+
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
@@ -44,23 +121,19 @@ function App() {
     } catch (error) {
       setError('Failed to make move. Please try again.');
       console.error('Move error:', error);
-      console.log('API URL used:', import.meta.env.VITE_API_URL || '/api');
+      console.log('API URL used:', apiUrl);
     } finally {
       setIsLoading(false);
     }
   };
 
-  const prettyStatus = (s) => {
-    switch (s) {
-      case 'X_wins': return 'You win!';
-      case 'O_wins': return 'Computer wins!';
-      case 'draw': return "It's a draw!";
-      default: return 'Your move';
-    }
-  };
-
   const resetGame = () => {
+    if (socketGameRef.current && socketRef.current) {
+      socketRef.current.send(JSON.stringify({ action: 'new' }));
+    }
+    socketGameRef.current = false;
     setBoard(initialBoard);
+    setGameId(null);
     setStatus('Your move');
     setIsGameOver(false);
     setError(null);
@@ -0,0 +1,476 @@
+"""ASGI entry point serving the /health and /move contract of main.py.
+
+It also serves ``/ws``, a WebSocket channel that carries a whole game over
+one connection: the server keeps the board per connection, the client sends
+``{"index": n}`` and gets back the same ``board``/``status`` body as /move.
+Send ``{"action": "new"}`` (optionally with ``size``/``win_length``) to
+start over.
+
+Run it under any ASGI server, e.g. ``uvicorn asgi:app --workers 4``. Idle
+and slow connections only hold a coroutine, not a worker. Moves that need a real
+search (boards larger than 3x3) run in a thread pool so the event loop keeps
+serving other requests, and through the search process pool when
+SEARCH_EXECUTOR_WORKERS is set. The app is a plain ASGI callable, so it
+needs no web framework beyond the server.
+
+In production it applies the rate limits, security headers and Sentry setup
+of the Flask app (see integrations.py). /move and every WebSocket move take
+tokens from the same ``move`` bucket per client address.
+"""
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+import request_log
+import serialization
+from request_log import bind, phase
+from serialization import JSON, negotiate
+
+# Largest request body accepted, in bytes (a 15x15 board is about 2 KB)
+MAX_BODY_BYTES = 64 * 1024
+
+
+def header(scope, name: bytes) -> Optional[str]:
+    """Return a request header value, or None if it is absent."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def read_body(receive) -> Optional[bytes]:
+    """Read the whole request body, or return None if it exceeds MAX_BODY_BYTES."""
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def send_json(send, status: int, body: Dict, headers: Optional[List[Tuple[bytes, bytes]]] = None,
+                    media_type: str = JSON) -> None:
+    """Send a complete response encoded as JSON, or as media_type when given."""
+    with phase("encode"):
+        payload = serialization.dumps(body, media_type)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", media_type.encode()), (b"content-length", str(len(payload)).encode()),
+                    (b"vary", b"Accept")] + (headers or []),
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+def create_asgi_app(config_name=None, search_workers=None, max_threads=None):
+    """ASGI application factory.
+
+    search_workers overrides SEARCH_EXECUTOR_WORKERS; max_threads sizes the
+    thread pool that runs large-board searches (default: Config.ASGI_SEARCH_THREADS).
+    """
+    if config_name == 'testing':
+        os.environ['TESTING'] = 'true'
+        os.environ['FLASK_ENV'] = 'testing'
+
+    from startup import StartupProfile
+    profile = StartupProfile()
+    with profile.step("imports"):
+        from config.config import Config, init_logging, logger
+        from schemas import validate_move_input, validate_new_game_input, validate_session_move_input
+        from service import GameService
+        from response_cache import MoveResponseCache
+        from probes import LIVE_PATH, PROBE_PATHS, HealthMonitor
+        import integrations
+
+    with profile.step("config"):
+        init_logging()
+        config = Config.get_config()
+    allowed_origins = set(config.ALLOWED_ORIGINS)
+    # Sentry, security headers and rate limiting; none of them while testing
+    limiter = None
+    security_headers = {False: [], True: []}
+    if not getattr(config, 'TESTING', False):
+        with profile.step("integrations"):
+            limiter = integrations.init_asgi(config)
+            security_headers = {https: integrations.asgi_security_headers(https) for https in (False, True)}
+    rate_limit_headers = limiter is not None and getattr(config, 'RATELIMIT_HEADERS_ENABLED', False)
+    with profile.step("service"):
+        service = GameService(search_workers)
+    move_cache = MoveResponseCache(Config.MOVE_CACHE_SIZE, Config.MOVE_CACHE_MAX_AGE)
+    with profile.step("health_monitor"):
+        health_monitor = HealthMonitor(service)
+    threads = ThreadPoolExecutor(max_workers=max_threads or Config.ASGI_SEARCH_THREADS,
+                                 thread_name_prefix="search")
+
+    def cors_headers(scope) -> List[Tuple[bytes, bytes]]:
+        """Allow the request origin if it is in ALLOWED_ORIGINS."""
+        origin = header(scope, b"origin")
+        if origin in allowed_origins:
+            return [(b"access-control-allow-origin", origin.encode("latin-1")), (b"vary", b"Origin")]
+        return []
+
+    # Limits of routes without the default ones; /metrics is exempt
+    route_limits = {"/metrics": []}
+    if limiter is not None:
+        from rate_limit import RateLimit
+        route_limits["/move"] = [RateLimit(integrations.MOVE_LIMIT)]
+
+    def client_address(scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "127.0.0.1"
+
+    def check_rate_limit(scope, endpoint: str, limits) -> Tuple[Optional[int], List[Tuple[bytes, bytes]]]:
+        """Take a token for a request; return the seconds to wait if it is rejected, and the response headers."""
+        if limiter is None or not limits:
+            return None, []
+        # Inline syncs block the loop for one Redis round trip, which is brief next to a search
+        admitted, bucket = limiter.hit(endpoint, client_address(scope), limits)
+        retry_after = None if admitted else limiter.retry_after(bucket)
+        if rate_limit_headers:
+            headers = [(name.lower().encode(), value.encode())
+                       for name, value in limiter.headers(bucket, rejected=not admitted).items()]
+        else:
+            headers = [] if admitted else [(b"retry-after", str(retry_after).encode())]
+        if not admitted:
+            logger.warning("Rate limit exceeded for %s", client_address(scope))
+        return retry_after, headers
+
+    async def health(scope, receive, send):
+        """Comprehensive health check."""
+        health_status = {
+            "status": "healthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": os.getenv("APP_VERSION", "1.0.0"),
+            "environment": os.getenv("FLASK_ENV", "development"),
+            "checks": {
+                "api": "ok",
+                "game_logic": "ok"
+            }
+        }
+        try:
+            self_test = health_monitor.self_test
+            if self_test["status"] == "failed":
+                raise RuntimeError(self_test["error"])
+            health_status["checks"]["ready"] = health_monitor.is_ready()
+            if service.search_executor is not None:
+                health_status["checks"]["search_executor"] = service.search_executor.stats()
+            health_status["checks"]["move_cache"] = move_cache.stats()
+            health_status["checks"]["startup"] = profile.as_dict()
+        except Exception as e:
+            health_status["status"] = "unhealthy"
+            health_status["checks"]["game_logic"] = f"error: {str(e)}"
+            await send_json(send, 503, health_status, cors_headers(scope))
+            return
+        await send_json(send, 200, health_status, cors_headers(scope))
+
+    async def move(scope, receive, send):
+        """Handle player move and computer response with validation."""
+        headers = cors_headers(scope)
+        media_type = negotiate(header(scope, b"accept"))
+        body = await read_body(receive)
+        if body is None:
+            await send_json(send, 413, {"error": "Request body too large"}, headers, media_type)
+            return
+        content_type = (header(scope, b"content-type") or JSON).partition(";")[0].strip().lower()
+        try:
+            with phase("parse"):
+                json_data = serialization.loads(body, content_type) if body else None
+        except ValueError as e:
+            logger.warning("Invalid request body: %s", e)
+            bind(error="invalid_body")
+            error = "Invalid msgpack data" if content_type in serialization.MSGPACK_TYPES else "Invalid JSON data"
+            await send_json(send, 400, {"error": error}, headers, media_type)
+            return
+
+        if json_data is None:
+            logger.warning("No JSON data received")
+            bind(error="invalid_body")
+            await send_json(send, 400, {"error": "No JSON data provided"}, headers, media_type)
+            return
+
+        with phase("cache"):
+            cache_key = move_cache.key(json_data, media_type)
+            cached = move_cache.get(cache_key) if cache_key is not None else None
+        bind(cache="HIT" if cached is not None else "MISS")
+        if cached is not None:
+            payload, etag, result = cached
+            bind(result=result)
+            await send_cached_move(send, payload, etag, b"HIT", headers, media_type)
+            return
+
+        with phase("validate"):
+            data, errors = validate_move_input(json_data)
+        if errors:
+            logger.warning("Input validation failed: %s", errors)
+            bind(error="invalid_input")
+            await send_json(send, 400, {"error": "Invalid input", "details": errors}, headers, media_type)
+            return
+
+        try:
+            result, status_code = await run_move(data)
+        except Exception as e:
+            logger.error("Error processing move: %s", e)
+            integrations.capture_exception(e)
+            await send_json(send, 500, {"error": "Internal server error"}, headers, media_type)
+            return
+        if status_code != 200 or cache_key is None:
+            await send_json(send, status_code, result, headers, media_type)
+            return
+        with phase("encode"):
+            payload = serialization.dumps(result, media_type)
+        etag = move_cache.put(cache_key, payload, result["status"])
+        await send_cached_move(send, payload, etag, b"MISS", headers, media_type)
+
+    async def send_cached_move(send, payload: bytes, etag: str, cache_status: bytes, headers,
+                               media_type: str) -> None:
+        """Send stored /move response bytes with caching headers."""
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", media_type.encode()),
+                (b"content-length", str(len(payload)).encode()),
+                (b"vary", b"Accept"),
+                (b"etag", etag.encode()),
+                (b"cache-control", move_cache.cache_control.encode()),
+                (b"x-cache", cache_status),
+            ] + headers,
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def run_move(data: Dict) -> Tuple[Dict, int]:
+        """Resolve a validated move, off the event loop when it needs a real search."""
+        if service.search_cost(data) > 0:
+            loop = asyncio.get_running_loop()
+            # Run in a copy of this request's context so the search is logged with it
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(threads, context.run, service.resolve_move, data)
+        # Table lookups and cached 3x3 searches are cheaper than a thread hop
+        return service.resolve_move(data)
+
+    def new_game_state(data: Dict) -> Dict:
+        """Return the state of a fresh game for a validated variant."""
+        board_size = service.get_game(data["size"], data["win_length"]).board_size
+        return {"board": [None] * board_size, "size": data["size"],
+                "win_length": data["win_length"], "status": "in_progress"}
+
+    async def game_channel(scope, receive, send):
+        """Play whole games over one WebSocket connection."""
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        origin = header(scope, b"origin")
+        if origin is not None and origin not in allowed_origins:
+            logger.warning("WebSocket rejected for origin %r", origin)
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        await send({"type": "websocket.accept"})
+
+        async def reply(body: Dict) -> None:
+            await send({"type": "websocket.send", "text": serialization.dumps_json(body).decode()})
+
+        state = new_game_state(validate_new_game_input({})[0])
+        await reply(state)
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            text = message.get("text") or (message.get("bytes") or b"").decode("utf-8", "replace")
+            if len(text) > MAX_BODY_BYTES:
+                await send({"type": "websocket.close", "code": 1009})
+                return
+            try:
+                json_data = serialization.loads_json(text)
+            except ValueError:
+                await reply({"error": "Invalid JSON data"})
+                continue
+
+            if isinstance(json_data, dict) and json_data.get("action") == "new":
+                data, errors = validate_new_game_input({k: v for k, v in json_data.items() if k != "action"})
+                if errors:
+                    await reply({"error": "Invalid input", "details": errors})
+                    continue
+                state = new_game_state(data)
+                await reply(state)
+                continue
+
+            data, errors = validate_session_move_input(json_data)
+            if errors:
+                await reply({"error": "Invalid input", "details": errors})
+                continue
+            if state["status"] != "in_progress":
+                await reply({"error": "Game is already over", "status": state["status"]})
+                continue
+            data, errors = validate_move_input({"board": state["board"], "index": data["index"],
+                                                "size": state["size"], "win_length": state["win_length"]})
+            if errors:
+                await reply({"error": "Invalid input", "details": errors})
+                continue
+
+            token = request_log.begin("WS", scope["path"])
+            bind(route="/ws")
+            retry_after, _ = check_rate_limit(scope, "move", route_limits.get("/move"))
+            if retry_after is not None:
+                request_log.finish(token, 429)
+                await reply({"error": "Rate limit exceeded", "retry_after": str(retry_after)})
+                continue
+            try:
+                body, _ = await run_move(data)
+            except Exception as e:
+                logger.error("Error processing move: %s", e)
+                integrations.capture_exception(e)
+                request_log.finish(token, 500)
+                await reply({"error": "Internal server error"})
+                continue
+            request_log.finish(token, 400 if "error" in body else 200)
+            if "error" not in body:
+                state.update(board=body["board"], status=body["status"])
+            await reply(body)
+
+    async def preflight(scope, receive, send):
+        """Answer CORS preflight requests."""
+        headers = cors_headers(scope)
+        if headers:
+            headers += [(b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+                        (b"access-control-allow-headers", b"Content-Type")]
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send_probe(send, status: int, body: bytes) -> None:
+        """Send a pre-encoded probe response."""
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def prometheus_metrics(scope, receive, send):
+        """Prometheus metrics for every worker process."""
+        scrape = metrics.render()
+        if scrape is None:
+            await send_json(send, 404, {"error": "Metrics are disabled"})
+            return
+        payload, content_type = scrape
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type.encode()),
+                                (b"content-length", str(len(payload)).encode())]})
+        await send({"type": "http.response.body", "body": payload})
+
+    routes = {
+        "/health": {"GET": health},
+        "/metrics": {"GET": prometheus_metrics},
+        "/move": {"POST": move},
+    }
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                logger.info("ASGI app started")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                health_monitor.stop()
+                threads.shutdown(wait=False)
+                service.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+        if scope["type"] == "websocket":
+            if scope["path"] == "/ws":
+                await game_channel(scope, receive, send)
+            else:
+                await send({"type": "websocket.close", "code": 1008})
+            return
+        if scope["type"] != "http":
+            return
+
+        # Probes skip routing, request logging and metrics
+        if scope["path"] in PROBE_PATHS and scope["method"] == "GET":
+            if scope["path"] == LIVE_PATH:
+                await send_probe(send, 200, health_monitor.live_body)
+            else:
+                await send_probe(send, *health_monitor.readiness())
+            return
+
+        token = request_log.begin(scope["method"], scope["path"], header(scope, b"x-request-id"))
+        request_id = request_log.current_request_id().encode("latin-1")
+        https = scope.get("scheme") == "https" or header(scope, b"x-forwarded-proto") == "https"
+        extra_headers = [(b"x-request-id", request_id)] + security_headers[https]
+        status = 500
+
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message["headers"]) + extra_headers
+            await send(message)
+
+        try:
+            await dispatch(scope, receive, send_with_request_id)
+        finally:
+            request_log.finish(token, status)
+
+    async def dispatch(scope, receive, send):
+        """Route an HTTP request to its handler."""
+        route = scope["path"].rstrip("/") or "/"
+        methods = routes.get(route)
+        bind(route=route if methods is not None else "unmatched")
+        if methods is None:
+            logger.warning("404 error: %s", scope["path"])
+            await send_json(send, 404, {"error": "Endpoint not found"}, cors_headers(scope))
+            return
+        if scope["method"] == "OPTIONS":
+            await preflight(scope, receive, send)
+            return
+        handler = methods.get(scope["method"])
+        if handler is None:
+            await send_json(send, 405, {"error": "Method not allowed"},
+                            [(b"allow", ", ".join(methods).encode())] + cors_headers(scope))
+            return
+        if limiter is not None:
+            limits = route_limits.get(route, limiter.default_limits)
+            retry_after, headers = check_rate_limit(scope, route.strip("/") or "index", limits)
+            if retry_after is not None:
+                await send_json(send, 429, {"error": "Rate limit exceeded", "retry_after": str(retry_after)},
+                                headers + cors_headers(scope))
+                return
+            if headers:
+                send = with_headers(send, headers)
+        await handler(scope, receive, send)
+
+    def with_headers(send, headers: List[Tuple[bytes, bytes]]):
+        """Wrap send to add headers to the response start."""
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message["headers"]) + headers
+            await send(message)
+        return send_with_headers
+
+    app.service = service
+    app.health_monitor = health_monitor
+    app.startup = profile
+    return app
+
+
+def __getattr__(name):
+    """Create the module-level ``app`` on first access (``uvicorn asgi:app``)."""
+    if name == "app":
+        global app
+        app = create_asgi_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
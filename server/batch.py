@@ -0,0 +1,118 @@
+"""Vectorized evaluation of many positions at once.
+
+Boards are rows of an ``(N, cells)`` integer array using the cell codes
+below. Win checks gather every win pattern for every board in one indexing
+operation, so analytics and replay jobs can score millions of positions per
+second instead of calling ``TicTacToeGame`` once per position.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from config.config import Config
+from game import TicTacToeGame
+from solved_table import CELLS, enumerate_positions, load_solved_table
+
+EMPTY, HUMAN, COMPUTER = 0, 1, 2
+CELL_CODES = {None: EMPTY, 'X': HUMAN, 'O': COMPUTER}
+SYMBOLS = (None, 'X', 'O')
+NO_MOVE = -1
+
+
+def encode_boards(boards: Sequence[Sequence[Optional[str]]]) -> np.ndarray:
+    """Convert list boards to an ``(N, cells)`` int8 array of cell codes."""
+    return np.array([[CELL_CODES[cell] for cell in board] for board in boards], dtype=np.int8)
+
+
+class BatchEvaluator:
+    """Batch counterpart of ``TicTacToeGame`` for one board variant."""
+
+    def __init__(self, game: Optional[TicTacToeGame] = None):
+        self.game = game or TicTacToeGame()
+        self.board_size = self.game.board_size
+        self.patterns = np.array(self.game.win_patterns, dtype=np.intp)
+        self._move_table = None
+
+    def _as_array(self, boards) -> np.ndarray:
+        boards = np.asarray(boards, dtype=np.int8)
+        if boards.ndim != 2 or boards.shape[1] != self.board_size:
+            raise ValueError(f"Expected an (N, {self.board_size}) array, got {boards.shape}")
+        if boards.size and (boards.min() < EMPTY or boards.max() > COMPUTER):
+            raise ValueError(f"Cell codes must be {EMPTY}, {HUMAN} or {COMPUTER}")
+        return boards
+
+    def winners(self, boards) -> Dict[str, np.ndarray]:
+        """Return boolean arrays marking boards X and O have won."""
+        boards = self._as_array(boards)
+        lines = boards[:, self.patterns]
+        return {
+            "x_wins": (lines == HUMAN).all(axis=2).any(axis=1),
+            "o_wins": (lines == COMPUTER).all(axis=2).any(axis=1),
+        }
+
+    def legal_moves(self, boards) -> np.ndarray:
+        """Return an ``(N, cells)`` boolean mask of empty cells."""
+        return self._as_array(boards) == EMPTY
+
+    def draws(self, boards) -> np.ndarray:
+        """Return a boolean array marking full boards with no winner."""
+        boards = self._as_array(boards)
+        wins = self.winners(boards)
+        return (boards != EMPTY).all(axis=1) & ~wins["x_wins"] & ~wins["o_wins"]
+
+    def move_table(self) -> np.ndarray:
+        """Return the best computer move for every base-3 position code, built on first use.
+
+        Only available for 3x3 boards. Moves come from the solved table
+        (solved_table.py), which shares the position codes, so building it
+        is a copy; without a solved table for the game's search algorithm
+        the same positions are searched once. Positions the computer never
+        faces (finished, or the human to move) map to NO_MOVE.
+        """
+        if self._move_table is None:
+            if self.board_size != CELLS:
+                raise ValueError("Move table is only available for 3x3 boards")
+            solved = self.game.solved_table or load_solved_table(Config.SOLVED_TABLE_PATH)
+            if solved is not None and solved.algorithm == self.game.search_algorithm:
+                table = np.frombuffer(solved.records, dtype=np.int8)[0::2].copy()
+            else:
+                table = np.full(3 ** self.board_size, NO_MOVE, dtype=np.int8)
+                for board in enumerate_positions():
+                    table[self.position_keys(encode_boards([board]))[0]] = self.game.get_computer_move(board)
+            self._move_table = table
+        return self._move_table
+
+    def position_keys(self, boards) -> np.ndarray:
+        """Return the base-3 code of each board (cell i has weight 3**i)."""
+        boards = self._as_array(boards)
+        weights = 3 ** np.arange(self.board_size, dtype=np.int64)
+        return boards.astype(np.int64) @ weights
+
+    def best_moves(self, boards) -> np.ndarray:
+        """Return the computer's move for each board, or NO_MOVE for finished boards.
+
+        3x3 boards are answered from the move table with one gather, so
+        boards the computer never faces get NO_MOVE too.
+        Larger boards cannot be tabulated and are searched one at a time.
+        """
+        boards = self._as_array(boards)
+        if self.board_size == CELLS:
+            return self.move_table()[self.position_keys(boards)].astype(np.intp)
+
+        wins = self.winners(boards)
+        finished = wins["x_wins"] | wins["o_wins"]
+        moves = np.full(len(boards), NO_MOVE, dtype=np.intp)
+        for i in np.flatnonzero(~finished):
+            move = self.game.get_computer_move([SYMBOLS[code] for code in boards[i]])
+            moves[i] = NO_MOVE if move is None else move
+        return moves
+
+    def evaluate(self, boards) -> Dict[str, np.ndarray]:
+        """Return winners, draws, legal-move masks and best moves for every board."""
+        boards = self._as_array(boards)
+        result = self.winners(boards)
+        result["draw"] = (boards != EMPTY).all(axis=1) & ~result["x_wins"] & ~result["o_wins"]
+        result["legal_moves"] = boards == EMPTY
+        result["best_moves"] = self.best_moves(boards)
+        return result
+
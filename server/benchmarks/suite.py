@@ -0,0 +1,243 @@
+"""Benchmark suite of the game engine and /move, compared with a stored baseline.
+
+Run from server/: ``python -m benchmarks.suite`` (or ``make bench``). Times
+``check_winner``, ``is_draw``, ``minimax`` and ``get_computer_move`` from
+empty, early, mid-game and late positions, and /move end to end through the
+Flask test client. Each result is the median of several runs in microseconds
+per call. The run fails when a benchmark is slower than its baseline by more
+than the threshold (``--threshold`` or BENCH_THRESHOLD, default 0.25 = 25%)
+on its first run and on each of ``--retries`` re-runs.
+
+``--save`` (``make bench-baseline``) stores the results as the new baseline.
+Baselines only compare on the machine that recorded them; re-record after
+changing hardware or Python.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from game import TicTacToeGame
+from solved_table import load_solved_table
+from config.config import Config
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+# Positions with the computer ('O') to move
+POSITIONS = {
+    "empty": [None] * 9,
+    "early": [None, None, None, None, 'X', None, None, None, None],
+    "mid": ['X', 'O', None, None, 'X', None, None, None, None],
+    "late": ['X', 'O', 'X', 'X', 'O', None, 'O', 'X', None],
+}
+
+# /move requests: the human's move that leads to each position above
+MOVE_REQUESTS = {
+    "early": {"board": [None] * 9, "index": 4},
+    "mid": {"board": ['X', 'O', None, None, None, None, None, None, None], "index": 4},
+    "late": {"board": ['X', 'O', 'X', None, 'O', None, 'O', 'X', None], "index": 3},
+}
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def engine_cases() -> Iterator[Case]:
+    """Engine calls from each position.
+
+    ``minimax`` and ``get_computer_move/search`` start from empty
+    transposition tables and no solved table, so they time the full search;
+    ``get_computer_move`` is the served path, with the solved table.
+    """
+    game = TicTacToeGame()
+    served = TicTacToeGame()
+    served.solved_table = load_solved_table(Config.SOLVED_TABLE_PATH)
+
+    def cold(func):
+        def run():
+            game.transposition_table.clear()
+            game.alphabeta_table.clear()
+            return func()
+        return run
+
+    for name, board in POSITIONS.items():
+        yield f"check_winner[{name}]", lambda board=board: game.check_winner(board, 'X')
+        yield f"is_draw[{name}]", lambda board=board: game.is_draw(board)
+        yield f"minimax[{name}]", cold(lambda board=board: game.minimax(board, True))
+        yield f"get_computer_move[{name}]", lambda board=board: served.get_computer_move(board)
+        yield f"get_computer_move/search[{name}]", cold(lambda board=board: game.get_computer_move(board))
+
+
+def endpoint_cases(app) -> Iterator[Case]:
+    """/move requests through the test client, answered fresh and from the response cache."""
+    client = app.test_client()
+    move_cache = app.extensions['move_cache']
+
+    def post(request):
+        response = client.post('/move', json=request)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response
+
+    def fresh(request):
+        move_cache.clear()
+        return post(request)
+
+    for name, request in MOVE_REQUESTS.items():
+        yield f"/move[{name}]", lambda request=request: fresh(request)
+    yield "/move[cached]", lambda: post(MOVE_REQUESTS["mid"])
+
+
+def calls_per_run(func: Callable[[], object], min_time: float) -> int:
+    """Number of calls that take at least ``min_time`` seconds."""
+    timer = timeit.Timer(func)
+    func()  # Warm up caches and lazy imports outside the timed runs
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / elapsed) if elapsed > 0 else number * 10)
+
+
+def cases(pattern: str = "") -> Dict[str, Callable[[], object]]:
+    """Every benchmark whose name contains ``pattern``, by name."""
+    from main import create_app
+    app = create_app('testing', search_workers=0)
+    # The self-test thread would compete with the timed code for the GIL
+    app.extensions['health_monitor'].stop(wait=True)
+    return {name: func for name, func in list(engine_cases()) + list(endpoint_cases(app)) if pattern in name}
+
+
+def run(benchmarks: Dict[str, Callable[[], object]], repeat: int = 7, min_time: float = 0.1) -> Dict[str, float]:
+    """Time each benchmark and return its median run in microseconds per call.
+
+    The runs go round-robin, one of each benchmark per round, so a slow
+    stretch of the machine spoils one run of many benchmarks rather than
+    every run of one.
+    """
+    timers = {name: (timeit.Timer(func), calls_per_run(func, min_time)) for name, func in benchmarks.items()}
+    runs = {name: [] for name in benchmarks}
+    for _ in range(repeat):
+        for name, (timer, number) in timers.items():
+            runs[name].append(timer.timeit(number) / number * 1e6)
+    return {name: statistics.median(times) for name, times in runs.items()}
+
+
+def environment() -> Dict[str, object]:
+    """What a baseline was recorded on, as timings from another setup do not compare."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    """Return a stored baseline, or None if there is none."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    """Store results, merged into the existing baseline so a filtered run keeps the others."""
+    baseline = load_baseline(path) or {}
+    merged = dict(baseline.get("results", {}))
+    merged.update({name: round(micros, 3) for name, micros in results.items()})
+    with open(path, 'w') as f:
+        json.dump({"environment": environment(), "results": dict(sorted(merged.items()))}, f, indent=2)
+        f.write('\n')
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float) -> List[Tuple[str, float, Optional[float], str]]:
+    """Return ``(name, micros, baseline micros, status)`` rows.
+
+    Status is ``regressed`` past the threshold, ``improved`` by more than it,
+    ``new`` without a baseline, otherwise ``ok``.
+    """
+    rows = []
+    for name, micros in results.items():
+        base = baseline.get(name)
+        if base is None:
+            status = "new"
+        elif micros > base * (1 + threshold):
+            status = "regressed"
+        elif micros < base * (1 - threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, micros, base, status))
+    return rows
+
+
+def report(rows: List[Tuple[str, float, Optional[float], str]]) -> None:
+    """Print the comparison as a table."""
+    width = max(len(row[0]) for row in rows)
+    print(f"{'benchmark':<{width}} {'us/call':>12} {'baseline':>12} {'change':>8}")
+    for name, micros, base, status in rows:
+        if base is None:
+            print(f"{name:<{width}} {micros:12.2f} {'-':>12} {'':>8}  {status}")
+        else:
+            change = (micros / base - 1) * 100
+            print(f"{name:<{width}} {micros:12.2f} {base:12.2f} {change:+7.1f}%  {status}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite and return the exit status: 1 if a benchmark regressed."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern", nargs="?", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.getenv('BENCH_THRESHOLD', DEFAULT_THRESHOLD)),
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--repeat", type=int, default=7, help="timing runs per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per timing run")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="times a regressed benchmark is re-timed before it counts as regressed")
+    args = parser.parse_args(argv)
+
+    benchmarks = cases(args.pattern)
+    if not benchmarks:
+        print(f"No benchmark matches {args.pattern!r}", file=sys.stderr)
+        return 2
+    results = run(benchmarks, args.repeat, args.min_time)
+    baseline = load_baseline(args.baseline) or {}
+    rows = compare(results, baseline.get("results", {}), args.threshold)
+    if not args.save:
+        # Timings on a busy machine stray for a while; a real regression stays
+        for _ in range(args.retries):
+            regressed = {row[0]: benchmarks[row[0]] for row in rows if row[3] == "regressed"}
+            if not regressed:
+                break
+            for name, micros in run(regressed, args.repeat, args.min_time).items():
+                results[name] = min(results[name], micros)
+            rows = compare(results, baseline.get("results", {}), args.threshold)
+    report(rows)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if baseline.get("environment", environment()) != environment():
+        print(f"Warning: the baseline was recorded on {baseline['environment']}, "
+              f"this is {environment()}", file=sys.stderr)
+    regressed = [row[0] for row in rows if row[3] == "regressed"]
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+              + ", ".join(regressed), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Microbenchmark of /move request validation.
+
+Run from server/: ``python -m benchmarks.validation``. Compares a fresh
+``MoveSchema`` per request followed by ``validate_move`` (the previous /move
+path), the same with a reused schema, and the precompiled ``MoveValidator``,
+which checks cells, board length and index in one pass and leaves only the
+finished-board check to the game, as in the endpoint.
+"""
+import argparse
+import timeit
+
+from game import TicTacToeGame
+from schemas import MoveSchema, MoveValidator
+
+REQUESTS = {
+    "3x3": {"board": ['X', None, None, None, 'O', None, None, None, None], "index": 8},
+    "15x15": {"board": [None] * 112 + ['X'] + [None] * 112, "index": 0, "size": 15},
+}
+
+
+def run(number: int) -> None:
+    games = {3: TicTacToeGame(), 15: TicTacToeGame(dim=15)}
+    reused = MoveSchema()
+    validator = MoveValidator()
+
+    def fresh_schema(request):
+        data = MoveSchema().load(request)
+        games[data["size"]].validate_move(data["board"], data["index"])
+
+    def reused_schema(request):
+        data = reused.load(request)
+        games[data["size"]].validate_move(data["board"], data["index"])
+
+    def compiled(request):
+        data, _ = validator(request)
+        games[data["size"]].is_won(data["board"])
+
+    for name, request in REQUESTS.items():
+        results = {}
+        for label, func in (("fresh MoveSchema", fresh_schema), ("reused MoveSchema", reused_schema),
+                            ("MoveValidator", compiled)):
+            best = min(timeit.repeat(lambda: func(request), number=number, repeat=5))
+            results[label] = best / number * 1e6
+        baseline = results["fresh MoveSchema"]
+        for label, micros in results.items():
+            print(f"{name:>6} {label:<18} {micros:8.2f} us/request  {baseline / micros:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="requests per timing run")
+    run(parser.parse_args().number)
@@ -0,0 +1,299 @@
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+CHUNK_BITS = 9
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+# Heuristic weight of a line holding n pieces of one player and none of the other
+LINE_WEIGHT_BASE = 10
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indices of set bits in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitboardEngine:
+    """Game rules over integer bitboards.
+
+    Each player's pieces are stored as an integer with bit ``i`` set when the
+    player occupies cell ``i``. Win patterns become precomputed masks, so win,
+    draw and move generation checks are a handful of integer operations.
+    """
+
+    def __init__(self, board_size: int, win_patterns: Sequence[Sequence[int]],
+                 symmetries: Sequence[Sequence[int]] = (), dim: Optional[int] = None):
+        self.board_size = board_size
+        self.dim = dim or int(round(board_size ** 0.5))
+        self.full_mask = (1 << board_size) - 1
+        self.win_masks = tuple(sum(1 << i for i in pattern) for pattern in win_patterns)
+        # Cells on more lines are searched first (3x3: center, corners, edges),
+        # ties broken by distance from the center
+        line_counts = [sum(1 for pattern in win_patterns if cell in pattern) for cell in range(board_size)]
+        center = (self.dim - 1) / 2
+        self.move_order = tuple(sorted(
+            range(board_size),
+            key=lambda cell: (-line_counts[cell],
+                              (cell // self.dim - center) ** 2 + (cell % self.dim - center) ** 2,
+                              cell)
+        ))
+        # Index from each cell to the masks of the win lines passing through it
+        self.cell_lines = tuple(
+            tuple(mask for mask in self.win_masks if mask >> cell & 1) for cell in range(board_size)
+        )
+        self.neighbor_masks = tuple(self._neighborhood(cell) for cell in range(board_size))
+        self.neighbor_cells = tuple(tuple(iter_bits(mask)) for mask in self.neighbor_masks)
+        # evaluate() weight of an open line by piece count, with 0 for an empty line
+        longest = max((len(pattern) for pattern in win_patterns), default=0)
+        self.line_weights = (0,) + tuple(LINE_WEIGHT_BASE ** n for n in range(1, longest + 1))
+        self._symmetry_tables = [self._chunk_tables(perm) for perm in symmetries]
+
+    def _neighborhood(self, cell: int) -> int:
+        """Return the mask of cells adjacent to a cell, including diagonals."""
+        row, col = divmod(cell, self.dim)
+        mask = 0
+        for r in range(max(row - 1, 0), min(row + 2, self.dim)):
+            for c in range(max(col - 1, 0), min(col + 2, self.dim)):
+                mask |= 1 << (r * self.dim + c)
+        return mask & ~(1 << cell)
+
+    def _chunk_tables(self, perm: Sequence[int]) -> List[List[int]]:
+        """Precompute lookup tables that apply a cell permutation to a bitboard.
+
+        ``perm`` maps destination cell to source cell; the tables map each
+        CHUNK_BITS-wide slice of the source mask to its permuted bits.
+        """
+        destination = [0] * self.board_size
+        for dest, source in enumerate(perm):
+            destination[source] = dest
+
+        tables = []
+        for start in range(0, self.board_size, CHUNK_BITS):
+            width = min(CHUNK_BITS, self.board_size - start)
+            table = [0] * (1 << width)
+            for chunk in range(1, 1 << width):
+                table[chunk] = sum(1 << destination[start + bit] for bit in iter_bits(chunk))
+            tables.append(table)
+        return tables
+
+    def from_board(self, board: Sequence[Optional[str]]) -> Optional[Tuple[int, int]]:
+        """Convert a list board to ``(x_bits, o_bits)``, or None if it is not a valid board."""
+        if len(board) != self.board_size:
+            return None
+        x_bits = o_bits = 0
+        for i, cell in enumerate(board):
+            if cell == 'X':
+                x_bits |= 1 << i
+            elif cell == 'O':
+                o_bits |= 1 << i
+            elif cell is not None:
+                return None
+        return x_bits, o_bits
+
+    def to_board(self, x_bits: int, o_bits: int) -> List[Optional[str]]:
+        """Convert bitboards back to the list representation."""
+        return ['X' if x_bits >> i & 1 else 'O' if o_bits >> i & 1 else None
+                for i in range(self.board_size)]
+
+    @staticmethod
+    def player_bits(board: Sequence[Optional[str]], player: str) -> int:
+        """Return the bitboard of cells a player occupies in a list board."""
+        bits = 0
+        for i, cell in enumerate(board):
+            if cell == player:
+                bits |= 1 << i
+        return bits
+
+    def is_win(self, bits: int) -> bool:
+        """Check whether a player's bitboard covers any win pattern."""
+        for mask in self.win_masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def wins_at(self, bits: int, cell: int) -> bool:
+        """Check only the win lines through a cell, e.g. right after a piece lands there."""
+        for mask in self.cell_lines[cell]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def winner(self, x_bits: int, o_bits: int, last_move: Optional[int] = None) -> int:
+        """Return 1 if O has a line, -1 if X has one, 0 otherwise.
+
+        With ``last_move``, only the lines through that cell are checked for the
+        player who occupies it, which is enough when the position before the
+        move had no winner.
+        """
+        if last_move is None:
+            if self.is_win(o_bits):
+                return 1
+            if self.is_win(x_bits):
+                return -1
+            return 0
+        if o_bits >> last_move & 1:
+            return 1 if self.wins_at(o_bits, last_move) else 0
+        return -1 if self.wins_at(x_bits, last_move) else 0
+
+    def is_full(self, x_bits: int, o_bits: int) -> bool:
+        return (x_bits | o_bits) == self.full_mask
+
+    def empty_cells(self, x_bits: int, o_bits: int) -> int:
+        """Return the bitboard of unoccupied cells."""
+        return self.full_mask & ~(x_bits | o_bits)
+
+    def ordered_moves(self, empty: int) -> List[int]:
+        """Return the empty cells of a mask in search order."""
+        return [cell for cell in self.move_order if empty >> cell & 1]
+
+    def candidate_moves(self, x_bits: int, o_bits: int) -> List[int]:
+        """Return empty cells next to an existing piece, in search order.
+
+        Used by the depth-limited search on large boards, where cells far from
+        any piece can neither win nor block.
+        """
+        occupied = x_bits | o_bits
+        if not occupied:
+            return list(self.move_order[:1])
+        near = 0
+        for cell in iter_bits(occupied):
+            near |= self.neighbor_masks[cell]
+        return self.ordered_moves(near & ~occupied & self.full_mask)
+
+    def evaluate(self, x_bits: int, o_bits: int) -> int:
+        """Heuristic score for O: open lines count more the fuller they are."""
+        score = 0
+        for mask in self.win_masks:
+            o_count = (o_bits & mask).bit_count()
+            x_count = (x_bits & mask).bit_count()
+            if o_count and not x_count:
+                score += LINE_WEIGHT_BASE ** o_count
+            elif x_count and not o_count:
+                score -= LINE_WEIGHT_BASE ** x_count
+        return score
+
+    def canonical(self, x_bits: int, o_bits: int) -> int:
+        """Return the smallest combined encoding of a position over its symmetries."""
+        best = None
+        shift = self.board_size
+        for tables in self._symmetry_tables:
+            x_perm = o_perm = 0
+            x_rest, o_rest = x_bits, o_bits
+            for table in tables:
+                x_perm |= table[x_rest & CHUNK_MASK]
+                o_perm |= table[o_rest & CHUNK_MASK]
+                x_rest >>= CHUNK_BITS
+                o_rest >>= CHUNK_BITS
+            key = x_perm << shift | o_perm
+            if best is None or key < best:
+                best = key
+        if best is None:
+            return x_bits << shift | o_bits
+        return best
+
+    def minimax(self, x_bits: int, o_bits: int, is_maximizing: bool) -> int:
+        """Score a position for O (the computer) with an exhaustive search."""
+        if self.is_win(o_bits):
+            return 1
+        if self.is_win(x_bits):
+            return -1
+        empty = self.full_mask & ~(x_bits | o_bits)
+        if not empty:
+            return 0
+
+        if is_maximizing:
+            best_score = -2
+            for move in iter_bits(empty):
+                score = self.minimax(x_bits, o_bits | 1 << move, False)
+                if score > best_score:
+                    best_score = score
+            return best_score
+        else:
+            best_score = 2
+            for move in iter_bits(empty):
+                score = self.minimax(x_bits | 1 << move, o_bits, True)
+                if score < best_score:
+                    best_score = score
+            return best_score
+
+
+class SearchBoard:
+    """Mutable position for make/unmake search over one engine's bitboards.
+
+    ``play`` and ``undo`` update the pieces, the heuristic score and the mask
+    of cells next to a piece in place, touching only the lines and neighbors
+    of the played cell. A depth-limited search can then walk the whole tree
+    on one object instead of rebuilding move lists and rescoring every win
+    line at each node.
+    """
+    __slots__ = ('engine', 'x_bits', 'o_bits', 'score', 'near', 'near_counts', '_moves', '_scores')
+
+    def __init__(self, engine: BitboardEngine, x_bits: int = 0, o_bits: int = 0):
+        self.engine = engine
+        self.x_bits = self.o_bits = 0
+        self.score = 0
+        self.near = 0
+        self.near_counts = [0] * engine.board_size
+        self._moves: List[int] = []
+        self._scores: List[int] = []
+        for cell in iter_bits(x_bits):
+            self.play(cell, False)
+        for cell in iter_bits(o_bits):
+            self.play(cell, True)
+        self._moves.clear()
+        self._scores.clear()
+
+    def play(self, cell: int, is_o: bool) -> None:
+        """Place a piece for O (or X) on an empty cell."""
+        engine = self.engine
+        weights = engine.line_weights
+        self._moves.append(cell)
+        self._scores.append(self.score)
+
+        own, other = (self.o_bits, self.x_bits) if is_o else (self.x_bits, self.o_bits)
+        delta = 0
+        for mask in engine.cell_lines[cell]:
+            other_count = (other & mask).bit_count()
+            own_count = (own & mask).bit_count()
+            if not other_count:
+                delta += weights[own_count + 1] - weights[own_count]
+            elif not own_count:
+                # The line was open for the other player and is now blocked
+                delta += weights[other_count]
+        self.score += delta if is_o else -delta
+
+        if is_o:
+            self.o_bits |= 1 << cell
+        else:
+            self.x_bits |= 1 << cell
+        counts = self.near_counts
+        for neighbor in engine.neighbor_cells[cell]:
+            if not counts[neighbor]:
+                self.near |= 1 << neighbor
+            counts[neighbor] += 1
+
+    def undo(self) -> None:
+        """Take back the most recent play."""
+        cell = self._moves.pop()
+        self.score = self._scores.pop()
+        keep = ~(1 << cell)
+        self.x_bits &= keep
+        self.o_bits &= keep
+        counts = self.near_counts
+        for neighbor in self.engine.neighbor_cells[cell]:
+            counts[neighbor] -= 1
+            if not counts[neighbor]:
+                self.near &= ~(1 << neighbor)
+
+    def empty_cells(self) -> int:
+        """Return the bitboard of unoccupied cells."""
+        return self.engine.full_mask & ~(self.x_bits | self.o_bits)
+
+    def candidate_moves(self) -> List[int]:
+        """Return empty cells next to a piece in search order, like ``BitboardEngine.candidate_moves``."""
+        occupied = self.x_bits | self.o_bits
+        if not occupied:
+            return list(self.engine.move_order[:1])
+        return self.engine.ordered_moves(self.near & ~occupied)
@@ -0,0 +1,42 @@
+from typing import Dict, List, Tuple
+
+# Supported (board dimension, win length) variants:
+# classic 3x3, 4x4 four-in-a-row, 5x5 four-in-a-row and 15x15 gomoku
+BOARD_VARIANTS = ((3, 3), (4, 4), (5, 4), (15, 5))
+
+# Default win length for each supported dimension
+DEFAULT_WIN_LENGTHS = {dim: win_length for dim, win_length in reversed(BOARD_VARIANTS)}
+
+# Line directions as (row step, column step): rows, columns, diagonals, anti-diagonals
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def generate_win_patterns(dim: int, win_length: int) -> List[List[int]]:
+    """Generate every run of win_length cells in a row, column or diagonal of a dim x dim board."""
+    if dim < 1 or not 1 <= win_length <= dim:
+        raise ValueError(f"Invalid board variant: {dim}x{dim} with win length {win_length}")
+
+    patterns = []
+    span = win_length - 1
+    for row_step, col_step in DIRECTIONS:
+        for row in range(dim):
+            for col in range(dim):
+                end_row, end_col = row + row_step * span, col + col_step * span
+                if 0 <= end_row < dim and 0 <= end_col < dim:
+                    patterns.append([(row + row_step * i) * dim + col + col_step * i
+                                     for i in range(win_length)])
+    return patterns
+
+
+# Win patterns are generated once at load time and looked up by variant
+WIN_PATTERN_INDEX: Dict[Tuple[int, int], List[List[int]]] = {
+    variant: generate_win_patterns(*variant) for variant in BOARD_VARIANTS
+}
+
+
+def get_win_patterns(dim: int, win_length: int) -> List[List[int]]:
+    """Return the win patterns for a variant, generating and indexing unknown ones on first use."""
+    key = (dim, win_length)
+    if key not in WIN_PATTERN_INDEX:
+        WIN_PATTERN_INDEX[key] = generate_win_patterns(dim, win_length)
+    return WIN_PATTERN_INDEX[key]
@@ -1,28 +1,96 @@
 import os
+import sys
 import logging
+from typing import Dict
+from .board import BOARD_VARIANTS, DEFAULT_WIN_LENGTHS, get_win_patterns
+from .logs import collect_exited_logs, configure_logging, configure_structlog
 
-# Create logs directory if it doesn't exist
 log_dir = os.path.join(os.path.dirname(__file__), '..', 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=os.path.join(log_dir, 'app.log'),
-    filemode='a'
-)
 
 logger = logging.getLogger(__name__)
 
 class Config:
     """Application configuration settings."""
     
-    BOARD_SIZE = 9
-    WIN_PATTERNS = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-        [0, 4, 8], [2, 4, 6]              # diagonals
-    ]
+    # Default board; other supported variants are listed in BOARD_VARIANTS
+    BOARD_DIM = 3
+    WIN_LENGTH = 3
+    BOARD_SIZE = BOARD_DIM * BOARD_DIM
+    WIN_PATTERNS = get_win_patterns(BOARD_DIM, WIN_LENGTH)
+    BOARD_VARIANTS = BOARD_VARIANTS
+    DEFAULT_WIN_LENGTHS = DEFAULT_WIN_LENGTHS
+    
+    # Boards up to this many cells are solved exhaustively; larger boards use a
+    # depth-limited search that stops after SEARCH_TIME_BUDGET seconds
+    EXHAUSTIVE_SEARCH_MAX_CELLS = 9
+    SEARCH_TIME_BUDGET = float(os.getenv('SEARCH_TIME_BUDGET', 1.0))
+    
+    # Search cache (canonical positions kept in LRU order)
+    TRANSPOSITION_TABLE_SIZE = int(os.getenv('TRANSPOSITION_TABLE_SIZE', 8192))
+    
+    # Search engine: 'minimax' (exhaustive) or 'alphabeta' (pruned, prefers fastest win)
+    SEARCH_ALGORITHM = os.getenv('SEARCH_ALGORITHM', 'minimax')
+    
+    # Precomputed perfect-play table (see solved_table.py)
+    SOLVED_TABLE_PATH = os.getenv('SOLVED_TABLE_PATH',
+                                  os.path.join(os.path.dirname(__file__), '..', 'data', 'solved_table.bin'))
+    
+    # Optional process pool for expensive searches (0 workers keeps searches in the request thread)
+    SEARCH_EXECUTOR_WORKERS = int(os.getenv('SEARCH_EXECUTOR_WORKERS', 0))
+    SEARCH_EXECUTOR_MAX_PENDING = int(os.getenv('SEARCH_EXECUTOR_MAX_PENDING', 8))
+    SEARCH_EXECUTOR_TASK_TIMEOUT = float(os.getenv('SEARCH_EXECUTOR_TASK_TIMEOUT', 5.0))
+    SEARCH_EXECUTOR_COST_THRESHOLD = float(os.getenv('SEARCH_EXECUTOR_COST_THRESHOLD', 0.05))
+    SEARCH_EXECUTOR_FALLBACK_BUDGET = float(os.getenv('SEARCH_EXECUTOR_FALLBACK_BUDGET', 0.1))
+    
+    # Threads that run large-board searches off the event loop in the ASGI app
+    ASGI_SEARCH_THREADS = int(os.getenv('ASGI_SEARCH_THREADS', 4))
+    
+    # /move response cache: entries kept in each worker and Cache-Control max-age (seconds)
+    MOVE_CACHE_SIZE = int(os.getenv('MOVE_CACHE_SIZE', 4096))
+    MOVE_CACHE_MAX_AGE = int(os.getenv('MOVE_CACHE_MAX_AGE', 3600))
+    
+    # Server-side game sessions: in memory unless SESSION_STORE_URL points at Redis
+    SESSION_STORE_URL = os.getenv('SESSION_STORE_URL', '')
+    SESSION_TTL = int(os.getenv('SESSION_TTL', 3600))
+    SESSION_MAX_GAMES = int(os.getenv('SESSION_MAX_GAMES', 10000))
+    
+    # Batch /moves endpoint: items per request and rate limit (charged per item)
+    MAX_BATCH_MOVES = int(os.getenv('MAX_BATCH_MOVES', 50))
+    MOVES_RATE_LIMIT = os.getenv('MOVES_RATE_LIMIT', '300 per minute')
+    
+    # Production rate limiting: 'hybrid' admits requests from per-worker token
+    # buckets synced with RATELIMIT_STORAGE_URL every RATELIMIT_SYNC_INTERVAL
+    # seconds, each worker spending at most RATELIMIT_SYNC_ERROR of a limit
+    # between syncs (see rate_limit.py); 'storage' checks the store on every request
+    RATELIMIT_MODE = os.getenv('RATELIMIT_MODE', 'hybrid')
+    RATELIMIT_SYNC_INTERVAL = float(os.getenv('RATELIMIT_SYNC_INTERVAL', 1.0))
+    RATELIMIT_SYNC_ERROR = float(os.getenv('RATELIMIT_SYNC_ERROR', 0.1))
+    
+    # Logging: 'sync' writes from the request thread, 'queued' hands records to a
+    # background writer with rotation (LOG_ROTATE_WHEN is 'size' or a
+    # TimedRotatingFileHandler interval such as 'midnight') and INFO sampling
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_MODE = os.getenv('LOG_MODE', 'sync')
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'size')
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    LOG_INFO_SAMPLE_RATE = float(os.getenv('LOG_INFO_SAMPLE_RATE', 1.0))
+    
+    # Log format: 'text' lines or 'json' objects (one per line, with request context);
+    # LOG_TO_STDOUT writes to stdout instead of logs/app.log
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    LOG_TO_STDOUT = os.getenv('LOG_TO_STDOUT', 'false').lower() == 'true'
+    
+    # Seconds between background self-tests behind /health/ready
+    HEALTH_SELF_TEST_INTERVAL = float(os.getenv('HEALTH_SELF_TEST_INTERVAL', 30))
+    
+    # 'lazy' defers optional integrations (Sentry) until they are first used;
+    # 'eager' sets everything up while the app is created
+    STARTUP_MODE = os.getenv('STARTUP_MODE', 'eager')
+    
+    # Prometheus /metrics; with several workers also set PROMETHEUS_MULTIPROC_DIR (see metrics.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
     
     ALLOWED_ORIGINS = [origin.strip() for origin in 
                     os.getenv('ALLOWED_ORIGINS', 'http://localhost:5173').split(',')]
@@ -48,4 +116,55 @@ class Config:
         else:
             # Default to development
             from .development import DevelopmentConfig
-            return DevelopmentConfig()
\ No newline at end of file
+            return DevelopmentConfig()
+
+
+_logging_configured = False
+
+
+def log_settings() -> Dict[str, object]:
+    """The LOG_* settings of the environment's config class, falling back to Config.
+
+    So ProductionConfig's stdout and JSON defaults apply without any LOG_*
+    variables set, while DevelopmentConfig and TestingConfig keep their own.
+    """
+    config = Config.get_config()
+    return {name: getattr(config, name, getattr(Config, name))
+            for name in dir(Config) if name.startswith('LOG_')}
+
+
+def init_logging():
+    """Create the logs directory and configure logging, once per process.
+
+    Called by the app factories rather than on import, so importing a module
+    for a script or a test does not open log files or start threads.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    settings = log_settings()
+    if not settings['LOG_TO_STDOUT']:
+        os.makedirs(log_dir, exist_ok=True)
+    configure_logging(
+        settings['LOG_MODE'],
+        os.path.join(log_dir, 'app.log'),
+        level=settings['LOG_LEVEL'],
+        rotate_when=settings['LOG_ROTATE_WHEN'],
+        max_bytes=settings['LOG_MAX_BYTES'],
+        backup_count=settings['LOG_BACKUP_COUNT'],
+        queue_size=settings['LOG_QUEUE_SIZE'],
+        info_sample_rate=settings['LOG_INFO_SAMPLE_RATE'],
+        fmt=settings['LOG_FORMAT'],
+        stream=sys.stdout if settings['LOG_TO_STDOUT'] else None,
+    )
+    if settings['LOG_FORMAT'] == 'json':
+        configure_structlog(settings['LOG_FORMAT'])
+
+
+def collect_worker_logs() -> None:
+    """Fold the queued-mode log files of exited processes into ``logs/app.log``."""
+    settings = log_settings()
+    if settings['LOG_MODE'] != 'queued' or settings['LOG_TO_STDOUT'] or not os.path.isdir(log_dir):
+        return
+    collect_exited_logs(os.path.join(log_dir, 'app.log'), settings['LOG_MAX_BYTES'], settings['LOG_BACKUP_COUNT'])
@@ -1,4 +1,5 @@
 import os
+from .board import get_win_patterns
 
 class DevelopmentConfig:
     """Development configuration."""
@@ -30,12 +31,10 @@ class DevelopmentConfig:
     SESSION_COOKIE_SAMESITE = 'Lax'
     
     # Application settings
-    BOARD_SIZE = 9
-    WIN_PATTERNS = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-        [0, 4, 8], [2, 4, 6]              # diagonals
-    ]
+    BOARD_DIM = 3
+    WIN_LENGTH = 3
+    BOARD_SIZE = BOARD_DIM * BOARD_DIM
+    WIN_PATTERNS = get_win_patterns(BOARD_DIM, WIN_LENGTH)
     
     # Server settings
     PORT = int(os.environ.get('PORT', 5000))
\ No newline at end of file
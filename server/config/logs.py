@@ -0,0 +1,391 @@
+"""Logging setup.
+
+``sync`` mode (the default) writes every record to ``logs/app.log`` from the
+thread that logged it. ``queued`` mode only puts records on a bounded
+in-memory queue; a listener thread formats them and writes them to a rotating
+file, so disk I/O stays off the request path. Each process that logs (every
+gunicorn worker, search pool workers) gets its own listener and its own file,
+``app.<pid>.log``, so no two processes ever rotate the same file; a forked
+child starts its listener on its first record. Files of
+processes that have exited are folded into ``app.log`` by
+``collect_exited_logs`` (the gunicorn master runs it as workers exit).
+
+With ``LOG_FORMAT=json`` every record, from the stdlib ``logger`` or from
+structlog, is rendered as one JSON object per line, carrying the current
+request id (see request_log.py). Either mode can write to a stream such as
+stdout instead of a file.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Callable, Dict, List, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Imported on first use: text-format logging never needs structlog
+structlog = None
+
+# Whether configure_structlog set up JSON events; request_log falls back to stdlib otherwise
+structured = False
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Fields of the current request (request_log.begin); None outside a request
+request_context: ContextVar[Optional[Dict]] = ContextVar("request_context", default=None)
+
+# Request fields copied onto every log record made while the request runs
+CONTEXT_FIELDS = ("request_id", "game_id")
+
+# Message arguments that cannot change between the log call and formatting
+IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+class SampleFilter(logging.Filter):
+    """Pass ``rate`` of the records at or below ``level``; always pass the rest.
+
+    Sampling is deterministic (one record in ``1 / rate``) and only
+    approximate when several threads log at once.
+    """
+
+    def __init__(self, rate: float, level: int = logging.INFO):
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+        self.level = level
+        self.dropped = 0
+        self._credit = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level or self.rate >= 1.0:
+            return True
+        self._credit += self.rate
+        if self._credit >= 1.0 - 1e-9:
+            self._credit -= 1.0
+            return True
+        self.dropped += 1
+        return False
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the current request id and game id onto each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = request_context.get()
+        if context is not None:
+            for field in CONTEXT_FIELDS:
+                if field in context:
+                    setattr(record, field, context[field])
+        return True
+
+
+def render_json(obj, **kwargs) -> str:
+    """JSON serializer for structlog: orjson when installed, unknown types as str."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+def add_request_context(logger, method_name: str, event_dict: Dict) -> Dict:
+    """structlog processor adding the current request id and game id."""
+    context = request_context.get()
+    if context is not None:
+        for field in CONTEXT_FIELDS:
+            if field in context:
+                event_dict.setdefault(field, context[field])
+    return event_dict
+
+
+def add_record_timestamp(logger, method_name: str, event_dict: Dict) -> Dict:
+    """structlog processor stamping stdlib records with the time they were made, not formatted."""
+    created = event_dict["_record"].created
+    event_dict["timestamp"] = datetime.fromtimestamp(created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return event_dict
+
+
+def _import_structlog():
+    global structlog
+    if structlog is None:
+        try:
+            import structlog
+        except ImportError:
+            return None
+    return structlog
+
+
+def make_formatter(fmt: str = 'text') -> logging.Formatter:
+    """Return the record formatter for the ``text`` or ``json`` log format."""
+    if fmt != 'json' or _import_structlog() is None:
+        return logging.Formatter(LOG_FORMAT)
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.ExtraAdder(CONTEXT_FIELDS),
+            add_record_timestamp,
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=render_json),
+        ],
+    )
+
+
+def configure_structlog(fmt: str = 'text') -> bool:
+    """Send structlog events through stdlib logging, so they share its handlers.
+
+    Events are filtered by level and stamped in the calling thread; in json
+    format rendering is left to the handler's formatter, which in queued mode
+    runs on the listener thread. In text format events become key=value
+    messages. Returns whether structlog is installed.
+    """
+    global structured
+    if _import_structlog() is None:
+        return False
+    processors = [
+        structlog.stdlib.filter_by_level,
+        add_request_context,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+    ]
+    if fmt == 'json':
+        processors += [structlog.processors.TimeStamper(fmt="iso", utc=True),
+                       structlog.stdlib.ProcessorFormatter.wrap_for_formatter]
+    else:
+        processors += [structlog.processors.KeyValueRenderer(key_order=["event"], drop_missing=True)]
+    structlog.configure(
+        processors=processors,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+    structured = fmt == 'json'
+    return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """Queue handler that leaves %-formatting to the listener thread.
+
+    Records whose arguments are mutable (a board that is about to change) or
+    that carry exception info are formatted in the caller, as QueueHandler
+    does. A full queue drops the record instead of blocking the request.
+    ``before_enqueue``, when set, runs before a record is queued.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.before_enqueue: Optional[Callable[[], None]] = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if record.exc_info or not isinstance(args, tuple) or not all(isinstance(a, IMMUTABLE_ARGS) for a in args):
+            return super().prepare(record)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.before_enqueue is not None:
+            self.before_enqueue()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room in a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class QueuedLogging:
+    """A LazyQueueHandler and the listener thread that writes its records to disk."""
+
+    def __init__(self, path: str, level: int = logging.INFO, rotate_when: str = 'size',
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 queue_size: int = 10000, info_sample_rate: float = 1.0,
+                 formatter: Optional[logging.Formatter] = None, stream: Optional[TextIO] = None):
+        self.path = path
+        self.formatter = formatter or logging.Formatter(LOG_FORMAT)
+        self.stream = stream
+        self.level = level
+        self.rotate_when = rotate_when
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue_size = queue_size
+        self.handler = LazyQueueHandler(queue.Queue(queue_size))
+        self.handler.setLevel(level)
+        self.handler.addFilter(RequestContextFilter())
+        if info_sample_rate < 1.0:
+            self.handler.addFilter(SampleFilter(info_sample_rate))
+        self.file_handler: Optional[logging.Handler] = None
+        self.listener: Optional[DrainingQueueListener] = None
+        self._start_lock = threading.Lock()
+        # The handler keeps this alive while a logger uses it; _queued does not
+        self.handler.owner = self
+        self.start()
+        _queued.add(self)
+
+    def process_path(self) -> str:
+        """Return this process's log file, e.g. ``logs/app.1234.log``."""
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{os.getpid()}{ext}"
+
+    def _file_handler(self) -> logging.Handler:
+        if self.stream is not None:
+            handler = logging.StreamHandler(self.stream)
+        elif self.rotate_when == 'size':
+            handler = RotatingFileHandler(self.process_path(), maxBytes=self.max_bytes,
+                                          backupCount=self.backup_count, delay=True)
+        else:
+            handler = TimedRotatingFileHandler(self.process_path(), when=self.rotate_when,
+                                               backupCount=self.backup_count, delay=True)
+        handler.setFormatter(self.formatter)
+        handler.setLevel(self.level)
+        return handler
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        self.file_handler = self._file_handler()
+        self.listener = DrainingQueueListener(self.handler.queue, self.file_handler, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Write out queued records and stop the listener thread."""
+        self.handler.before_enqueue = None
+        if self.listener is not None:
+            self.listener.stop()
+            self.file_handler.close()
+            self.listener = None
+
+    def _after_fork(self) -> None:
+        # The listener thread does not survive fork and the queue's lock may
+        # have been held when it happened, so the child starts over with its
+        # own queue, thread and file, once it logs: search pool children
+        # mostly never do
+        if self.listener is None and self.handler.before_enqueue is None:
+            return
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.listener = None
+        self._start_lock = threading.Lock()
+        self.handler.before_enqueue = self._start_in_child
+
+    def _start_in_child(self) -> None:
+        with self._start_lock:
+            if self.handler.before_enqueue is not None:
+                self.start()
+                self.handler.before_enqueue = None
+
+
+# Live instances, restarted in forked children and stopped at exit by one hook each
+_queued: "weakref.WeakSet[QueuedLogging]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for queued in list(_queued):
+        queued._after_fork()
+
+
+def _stop_all() -> None:
+    for queued in list(_queued):
+        queued.stop()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_stop_all)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _oldest_first(suffix: Optional[str]):
+    # Size rotation numbers backups .1 (newest) upwards, time rotation dates
+    # them; the file without a suffix is the newest of all
+    if suffix is None:
+        return (2, 0, '')
+    if suffix.isdigit():
+        return (0, -int(suffix), '')
+    return (1, 0, suffix)
+
+
+def collect_exited_logs(path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5) -> List[int]:
+    """Append the per-process log files of exited processes to ``path`` and remove them.
+
+    Each process's files are appended oldest first, then ``path`` is rotated
+    like the per-process files once it exceeds ``max_bytes``. Returns the
+    pids whose files were collected.
+    """
+    directory, name = os.path.split(path)
+    root, ext = os.path.splitext(name)
+    pattern = re.compile(rf"^{re.escape(root)}\.(\d+){re.escape(ext)}(?:\.(.+))?$")
+    files: Dict[int, List] = {}
+    for entry in os.listdir(directory or '.'):
+        match = pattern.match(entry)
+        if match:
+            files.setdefault(int(match.group(1)), []).append((match.group(2), os.path.join(directory, entry)))
+    collected = []
+    for pid, entries in sorted(files.items()):
+        if _process_alive(pid):
+            continue
+        entries.sort(key=lambda entry: _oldest_first(entry[0]))
+        with open(path, 'ab') as out:
+            for _, file_path in entries:
+                with open(file_path, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+                os.remove(file_path)
+        collected.append(pid)
+    if collected and max_bytes > 0 and os.path.getsize(path) > max_bytes:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        handler.doRollover()
+        handler.close()
+    return collected
+
+
+def configure_logging(mode: str, path: str, level: str = 'INFO', rotate_when: str = 'size',
+                      max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                      queue_size: int = 10000, info_sample_rate: float = 1.0,
+                      fmt: str = 'text', stream: Optional[TextIO] = None,
+                      target: Optional[logging.Logger] = None) -> Optional[QueuedLogging]:
+    """Set up logging on the root logger (or ``target``) for ``sync`` or ``queued`` mode.
+
+    Records go to ``path``, or to ``stream`` when one is given, in the
+    ``text`` or ``json`` format. Like ``logging.basicConfig``, it does nothing
+    when the logger already has handlers. Returns the QueuedLogging instance
+    in queued mode.
+    """
+    target = target or logging.getLogger()
+    if target.handlers:
+        return None
+    level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    if mode != 'queued':
+        handler = logging.StreamHandler(stream) if stream is not None else logging.FileHandler(path, mode='a')
+        handler.setFormatter(make_formatter(fmt))
+        handler.addFilter(RequestContextFilter())
+        target.addHandler(handler)
+        target.setLevel(level)
+        return None
+    queued = QueuedLogging(path, level=level, rotate_when=rotate_when, max_bytes=max_bytes,
+                           backup_count=backup_count, queue_size=queue_size,
+                           info_sample_rate=info_sample_rate, formatter=make_formatter(fmt), stream=stream)
+    target.addHandler(queued.handler)
+    target.setLevel(level)
+    return queued
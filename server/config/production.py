@@ -1,5 +1,6 @@
 import os
 from datetime import timedelta
+from .board import get_win_patterns
 
 class ProductionConfig:
     # Security
@@ -17,10 +18,14 @@ class ProductionConfig:
     # Rate limiting
     RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL', 'redis://redis:6379')
     RATELIMIT_HEADERS_ENABLED = True
+
+    # Game sessions must be shared by all workers, so they default to the same Redis
+    SESSION_STORE_URL = os.environ.get('SESSION_STORE_URL') or os.environ.get('REDIS_URL', 'redis://redis:6379')
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_TO_STDOUT = True
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
     
     # CORS - be specific about origins in production
     ALLOWED_ORIGINS = [origin.strip() for origin in 
@@ -33,12 +38,10 @@ class ProductionConfig:
     PERMANENT_SESSION_LIFETIME = timedelta(hours=1)
     
     # Application settings
-    BOARD_SIZE = 9
-    WIN_PATTERNS = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-        [0, 4, 8], [2, 4, 6]              # diagonals
-    ]
+    BOARD_DIM = 3
+    WIN_LENGTH = 3
+    BOARD_SIZE = BOARD_DIM * BOARD_DIM
+    WIN_PATTERNS = get_win_patterns(BOARD_DIM, WIN_LENGTH)
     
     # Monitoring
     SENTRY_DSN = os.environ.get('SENTRY_DSN')
@@ -0,0 +1,157 @@
+"""Process-pool offload for expensive computer-move searches.
+
+Large-board searches are CPU-bound and would otherwise run in the request
+thread. ``SearchExecutor`` sends searches whose estimated cost exceeds a
+threshold to a bounded process pool and waits for them with a per-task
+deadline. When the pool is saturated or a task misses its deadline, the move
+is computed inline with a short fallback budget instead, so every request
+still gets an answer within a bounded time.
+"""
+import atexit
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from typing import Dict, List, Optional, Tuple
+
+from config.config import logger
+from game import TicTacToeGame
+
+# Games built inside pool workers, keyed by variant and search settings
+_worker_games: Dict[tuple, TicTacToeGame] = {}
+
+
+def _search_in_worker(dim: int, win_length: int, algorithm: str, time_budget: float,
+                      board: List[Optional[str]]) -> Tuple[Optional[int], int]:
+    """Pool task: run get_computer_move with a game cached in the worker process.
+
+    Returns the move and the positions searched for it.
+    """
+    key = (dim, win_length, algorithm, time_budget)
+    game = _worker_games.get(key)
+    if game is None:
+        game = _worker_games[key] = TicTacToeGame(
+            search_algorithm=algorithm, dim=dim, win_length=win_length, time_budget=time_budget
+        )
+    move = game.get_computer_move(board)
+    return move, game.nodes_searched
+
+
+class SearchExecutor:
+    """Bounded process pool for computer-move searches above a cost threshold."""
+
+    def __init__(self, max_workers: int, max_pending: int, task_timeout: float,
+                 cost_threshold: float, fallback_budget: float):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.task_timeout = task_timeout
+        self.cost_threshold = cost_threshold
+        self.fallback_budget = fallback_budget
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending > 0 else None
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.inline = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created on first use so each gunicorn worker forks its own pool
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                atexit.register(self.shutdown)
+            return self._pool
+
+    def _count(self, counter: str) -> None:
+        # Request threads of a gthread worker share the executor
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def get_computer_move(self, game: TicTacToeGame, board: List[Optional[str]]) -> Optional[int]:
+        """Return the computer's move, offloading the search when it is expensive."""
+        return self.search(game, board)[0]
+
+    def search(self, game: TicTacToeGame, board: List[Optional[str]]) -> Tuple[Optional[int], int]:
+        """Return the computer's move and the positions searched for it, in the pool when expensive."""
+        if game.estimated_search_cost(board) < self.cost_threshold:
+            self._count("inline")
+            return self._inline(game, board)
+
+        if self._slots is None or not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            logger.warning("Search pool saturated, searching inline with fallback budget")
+            return self._inline(game, board, self.fallback_budget)
+
+        with self._lock:
+            self.in_flight += 1
+            self.submitted += 1
+        started = time.monotonic()
+        try:
+            future = self._get_pool().submit(
+                _search_in_worker, game.dim, game.win_length, game.search_algorithm, game.time_budget, list(board)
+            )
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            result = future.result(timeout=self.task_timeout)
+        except TimeoutError:
+            self._count("timeouts")
+            logger.warning("Search task exceeded %ss deadline, searching inline", self.task_timeout)
+            return self._inline(game, board, self.fallback_budget)
+        except Exception as e:
+            # A crashed worker breaks the whole pool; rebuild it on the next request
+            logger.error("Search pool failed: %s", e)
+            self.shutdown()
+            return self._inline(game, board, self.fallback_budget)
+        finally:
+            waited = time.monotonic() - started
+            with self._lock:
+                self.last_wait = waited
+                self.total_wait += waited
+
+        self._count("completed")
+        return result
+
+    @staticmethod
+    def _inline(game: TicTacToeGame, board: List[Optional[str]],
+                time_budget: Optional[float] = None) -> Tuple[Optional[int], int]:
+        move = game.get_computer_move(board, time_budget=time_budget)
+        return move, game.nodes_searched
+
+    def stats(self) -> Dict[str, float]:
+        """Return pool depth, outcome counters and wait times for monitoring."""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "inline": self.inline,
+            "avg_wait_ms": round(self.total_wait / self.submitted * 1000, 3) if self.submitted else 0.0,
+            "last_wait_ms": round(self.last_wait * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for running searches."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
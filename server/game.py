@@ -1,27 +1,82 @@
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 from config.config import Config, logger
+from config.board import get_win_patterns
+from bitboard import BitboardEngine, SearchBoard, iter_bits
+from transposition import TranspositionTable, symmetry_permutations
+
+SEARCH_ALGORITHMS = ('minimax', 'alphabeta')
+
+# Transposition table bound flags for alpha-beta entries
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Symmetry canonicalization costs more than it saves on boards larger than 5x5
+SYMMETRY_MAX_CELLS = 25
+
+# Base score of a win in the depth-limited search, kept above any heuristic value
+WIN_SCORE = 10 ** 9
+
+class SearchTimeout(Exception):
+    """Raised inside a depth-limited search when its time budget runs out."""
 
 class TicTacToeGame:
-    def __init__(self):
-        self.board_size = Config.BOARD_SIZE
-        self.win_patterns = Config.WIN_PATTERNS
+    def __init__(self, search_algorithm: Optional[str] = None, dim: Optional[int] = None,
+                 win_length: Optional[int] = None, time_budget: Optional[float] = None):
+        self.dim = dim or Config.BOARD_DIM
+        self.win_length = win_length or Config.DEFAULT_WIN_LENGTHS.get(self.dim, self.dim)
+        self.board_size = self.dim * self.dim
+        self.win_patterns = get_win_patterns(self.dim, self.win_length)
+        self.cell_patterns = [[pattern for pattern in self.win_patterns if cell in pattern]
+                              for cell in range(self.board_size)]
         self.computer_symbol = 'O'
         self.human_symbol = 'X'
+        self.symmetries = symmetry_permutations(self.dim) if self.board_size <= SYMMETRY_MAX_CELLS else []
+        self.engine = BitboardEngine(self.board_size, self.win_patterns, self.symmetries, self.dim)
+        self.time_budget = time_budget if time_budget is not None else Config.SEARCH_TIME_BUDGET
+        self.search_depth = 0
+        self.transposition_table = TranspositionTable(Config.TRANSPOSITION_TABLE_SIZE)
+        self.alphabeta_table = TranspositionTable(Config.TRANSPOSITION_TABLE_SIZE)
+        self.solved_table = None
+        self.search_algorithm = search_algorithm or Config.SEARCH_ALGORITHM
+        if self.search_algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {self.search_algorithm}")
+        self.nodes_searched = 0
     
     def check_winner(self, board: List[Optional[str]], player: str) -> bool:
         """Check if a player has won the game."""
         try:
-            return any(all(board[i] == player for i in pattern) for pattern in self.win_patterns)
+            return self.engine.is_win(self.engine.player_bits(board, player))
         except Exception as e:
-            logger.error(f"Error checking winner: {str(e)}")
+            logger.error("Error checking winner: %s", e)
             return False
     
+    def is_winning_move(self, board: List[Optional[str]], index: int, player: str) -> bool:
+        """Check whether the piece at index completes a line for player.
+
+        Only the lines through index are examined, so this assumes the board
+        had no winner before the piece was placed.
+        """
+        try:
+            return any(all(board[i] == player for i in pattern) for pattern in self.cell_patterns[index])
+        except Exception as e:
+            logger.error("Error checking winning move: %s", e)
+            return False
+    
+    def is_full(self, board: List[Optional[str]]) -> bool:
+        """Check if no empty cells remain."""
+        return None not in board
+    
+    def is_won(self, board: List[Optional[str]]) -> bool:
+        """Check if either player already has a line on the board."""
+        bits = self.engine.from_board(board)
+        return bits is not None and bool(self.engine.winner(*bits))
+    
     def is_draw(self, board: List[Optional[str]]) -> bool:
         """Check if the game is a draw."""
         try:
             return all(cell is not None for cell in board) and not self.check_winner(board, self.computer_symbol) and not self.check_winner(board, self.human_symbol)
         except TypeError as e:
-            logger.error(f"Error checking draw: {str(e)}")
+            logger.error("Error checking draw: %s", e)
             return False
     
     def get_available_moves(self, board: List[Optional[str]]) -> List[int]:
@@ -33,7 +88,198 @@ class TicTacToeGame:
         new_board = board.copy()
         new_board[position] = player
         return new_board
+
+    def canonical_key(self, board: List[Optional[str]]) -> Optional[int]:
+        """Return the smallest encoding of the board over its 8 symmetries."""
+        bits = self.engine.from_board(board)
+        if bits is None:
+            return None
+        return self.engine.canonical(*bits)
+
     def minimax(self, board: List[Optional[str]], is_maximizing: bool) -> int:
+        """Score a position, reusing results for symmetric positions seen before."""
+        bits = self.engine.from_board(board)
+        if bits is None:
+            return self._minimax(board, is_maximizing)
+        return self._search(*bits, is_maximizing)
+
+    def _search(self, x_bits: int, o_bits: int, is_maximizing: bool, last_move: Optional[int] = None) -> int:
+        """Memoized minimax over bitboards."""
+        self.nodes_searched += 1
+        engine = self.engine
+        key = (engine.canonical(x_bits, o_bits), is_maximizing)
+        score = self.transposition_table.get(key)
+        if score is not None:
+            return score
+
+        winner = engine.winner(x_bits, o_bits, last_move)
+        if winner:
+            score = winner
+        elif engine.is_full(x_bits, o_bits):
+            score = 0
+        elif is_maximizing:
+            score = max(self._search(x_bits, o_bits | 1 << move, False, move)
+                        for move in iter_bits(engine.empty_cells(x_bits, o_bits)))
+        else:
+            score = min(self._search(x_bits | 1 << move, o_bits, True, move)
+                        for move in iter_bits(engine.empty_cells(x_bits, o_bits)))
+
+        self.transposition_table.put(key, score)
+        return score
+
+    def alphabeta(self, board: List[Optional[str]], is_maximizing: bool) -> Optional[int]:
+        """Depth-aware score of a position, or None if the board cannot be encoded.
+
+        Wins score ``1 + empty cells`` for the computer (negated for the human),
+        so faster wins and slower losses score higher; draws score 0.
+        """
+        bits = self.engine.from_board(board)
+        if bits is None:
+            return None
+        return self._alphabeta(*bits, is_maximizing, -float('inf'), float('inf'))
+
+    def _alphabeta(self, x_bits: int, o_bits: int, is_maximizing: bool, alpha: float, beta: float,
+                   last_move: Optional[int] = None) -> int:
+        """Alpha-beta search over bitboards with move ordering and a bounded table."""
+        self.nodes_searched += 1
+        engine = self.engine
+        empty = engine.empty_cells(x_bits, o_bits)
+        winner = engine.winner(x_bits, o_bits, last_move)
+        if winner:
+            return winner * (empty.bit_count() + 1)
+        if not empty:
+            return 0
+
+        key = (engine.canonical(x_bits, o_bits), is_maximizing)
+        entry = self.alphabeta_table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha, original_beta = alpha, beta
+        if is_maximizing:
+            best_score = -float('inf')
+            for move in engine.ordered_moves(empty):
+                score = self._alphabeta(x_bits, o_bits | 1 << move, False, alpha, beta, move)
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+                if alpha >= beta:
+                    break
+        else:
+            best_score = float('inf')
+            for move in engine.ordered_moves(empty):
+                score = self._alphabeta(x_bits | 1 << move, o_bits, True, alpha, beta, move)
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+                if alpha >= beta:
+                    break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= original_beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.alphabeta_table.put(key, (best_score, flag))
+        return best_score
+
+    def _budgeted_move(self, x_bits: int, o_bits: int, time_budget: Optional[float] = None) -> Optional[int]:
+        """Pick a move on a large board by iterative deepening within the time budget.
+
+        Each completed depth replaces the best move; the search stops when the
+        budget runs out or a forced result is found.
+        """
+        empty = self.engine.empty_cells(x_bits, o_bits)
+        if not empty:
+            return None
+
+        deadline = time.monotonic() + (self.time_budget if time_budget is None else time_budget)
+        best_move = self.engine.candidate_moves(x_bits, o_bits)[0]
+        self.search_depth = 0
+        for depth in range(1, empty.bit_count() + 1):
+            try:
+                # A timeout leaves the board mid-search, so each depth starts from a fresh one
+                board = SearchBoard(self.engine, x_bits, o_bits)
+                best_move, score = self._budgeted_root(board, depth, deadline, best_move)
+            except SearchTimeout:
+                break
+            self.search_depth = depth
+            if abs(score) >= WIN_SCORE:
+                break
+        return best_move
+
+    def _budgeted_root(self, board: SearchBoard, depth: int, deadline: float,
+                       previous_best: int) -> Tuple[int, float]:
+        """Search every candidate to a fixed depth, trying the previous best move first."""
+        moves = board.candidate_moves()
+        moves.remove(previous_best)
+        moves.insert(0, previous_best)
+
+        best_move, best_score = previous_best, -float('inf')
+        for move in moves:
+            board.play(move, True)
+            score = self._depth_limited(board, False, depth - 1, best_score, float('inf'), deadline, move)
+            board.undo()
+            if score > best_score:
+                best_score = score
+                best_move = move
+        return best_move, best_score
+
+    def _depth_limited(self, board: SearchBoard, is_maximizing: bool, depth: int,
+                       alpha: float, beta: float, deadline: float, last_move: Optional[int] = None) -> float:
+        """Alpha-beta to a fixed depth with a heuristic evaluation at the horizon.
+
+        Moves are played and taken back on ``board``; on SearchTimeout the
+        board is left mid-search and must be discarded.
+        """
+        self.nodes_searched += 1
+        if time.monotonic() > deadline:
+            raise SearchTimeout()
+
+        empty = board.empty_cells()
+        winner = self.engine.winner(board.x_bits, board.o_bits, last_move)
+        if winner:
+            return winner * (WIN_SCORE + empty.bit_count())
+        if not empty:
+            return 0
+        if depth == 0:
+            return board.score
+
+        if is_maximizing:
+            best_score = -float('inf')
+            for move in board.candidate_moves():
+                board.play(move, True)
+                score = self._depth_limited(board, False, depth - 1, alpha, beta, deadline, move)
+                board.undo()
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+                if alpha >= beta:
+                    break
+        else:
+            best_score = float('inf')
+            for move in board.candidate_moves():
+                board.play(move, False)
+                score = self._depth_limited(board, True, depth - 1, alpha, beta, deadline, move)
+                board.undo()
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+                if alpha >= beta:
+                    break
+        return best_score
+
+    def _minimax(self, board: List[Optional[str]], is_maximizing: bool) -> int:
+        """Reference minimax over list boards, used for boards the engine cannot encode.
+
+        Pieces are placed on and removed from ``board`` in place, so the board
+        is unchanged when the call returns.
+        """
         if self.check_winner(board, self.computer_symbol):
             return 1
         if self.check_winner(board, self.human_symbol):
@@ -44,24 +290,65 @@ class TicTacToeGame:
         if is_maximizing:
             best_score = -float('inf')
             for move in self.get_available_moves(board):
-                new_board = self.make_move(board, move, self.computer_symbol)
-                score = self.minimax(new_board, False)
-                best_score = max(score, best_score)
+                board[move] = self.computer_symbol
+                best_score = max(self._minimax(board, False), best_score)
+                board[move] = None
             return best_score
         else:
             best_score = float('inf')
             for move in self.get_available_moves(board):
-                new_board = self.make_move(board, move, self.human_symbol)
-                score = self.minimax(new_board, True)
-                best_score = min(score, best_score)
+                board[move] = self.human_symbol
+                best_score = min(self._minimax(board, True), best_score)
+                board[move] = None
             return best_score
     
-    def get_computer_move(self, board: List[Optional[str]]) -> Optional[int]:
+    def estimated_search_cost(self, board: List[Optional[str]]) -> float:
+        """Rough wall-clock cost in seconds of get_computer_move for a board.
+
+        Small boards are answered from the solved table or a memoized search;
+        larger boards search until the time budget runs out.
+        """
+        if self.board_size <= Config.EXHAUSTIVE_SEARCH_MAX_CELLS or None not in board:
+            return 0.0
+        return self.time_budget
+
+    def get_computer_move(self, board: List[Optional[str]], time_budget: Optional[float] = None) -> Optional[int]:
+        """Choose the computer's reply; time_budget overrides the large-board search budget."""
+        self.nodes_searched = 0
+        if self.solved_table is not None:
+            entry = self.solved_table.lookup(board)
+            if entry is not None:
+                return entry[0]
+
         best_score = -float('inf')
         best_move = None
+        bits = self.engine.from_board(board)
+        if bits is not None and self.board_size > Config.EXHAUSTIVE_SEARCH_MAX_CELLS:
+            return self._budgeted_move(*bits, time_budget)
+
+        if bits is not None and self.search_algorithm == 'alphabeta':
+            x_bits, o_bits = bits
+            for move in self.engine.ordered_moves(self.engine.empty_cells(x_bits, o_bits)):
+                score = self._alphabeta(x_bits, o_bits | 1 << move, False, best_score, float('inf'), move)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+            return best_move
+
+        if bits is not None:
+            x_bits, o_bits = bits
+            for move in iter_bits(self.engine.empty_cells(x_bits, o_bits)):
+                score = self._search(x_bits, o_bits | 1 << move, False, move)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+            return best_move
+
+        board = list(board)
         for move in self.get_available_moves(board):
-            new_board = self.make_move(board, move, self.computer_symbol)
-            score = self.minimax(new_board, False)
+            board[move] = self.computer_symbol
+            score = self._minimax(board, False)
+            board[move] = None
             if score > best_score:
                 best_score = score
                 best_move = move
@@ -80,5 +367,9 @@ class TicTacToeGame:
         
         if board[index] is not None:
             return False, f"Position {index} already occupied"
+
+        # Wins are detected from the last move only, so a board must not arrive finished
+        if self.is_won(board):
+            return False, "Game is already over"
         
         return True, None
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""Gunicorn settings for the Flask app: ``gunicorn -c gunicorn.conf.py main:app``.
+
+The app is preloaded: the master builds it once, warms it up (an engine for
+every board variant, the solved table) and freezes that heap, so workers
+share it copy-on-write instead of each building and warming their own. Workers
+are recycled after GUNICORN_MAX_REQUESTS requests; each replacement is forked
+from the warm master and is ready at once.
+
+Every setting can be overridden from the environment:
+
+    GUNICORN_WORKERS              worker processes (default: usable CPUs)
+    GUNICORN_WORKER_CLASS         sync, gthread or gevent (gevent must be installed)
+    GUNICORN_THREADS              threads per gthread worker (default 4)
+    GUNICORN_WORKER_CONNECTIONS   concurrent clients per gevent worker
+    GUNICORN_MAX_REQUESTS         requests before a worker is replaced (0 never)
+    GUNICORN_MAX_REQUESTS_JITTER  random extra requests, so workers do not restart together
+    GUNICORN_PRELOAD              'false' builds the app in every worker instead
+"""
+import gc
+import os
+import shutil
+
+
+def _cpu_count() -> int:
+    # CPUs this process may run on, which a container can limit below os.cpu_count()
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8080')
+# Searches are CPU-bound, so more sync workers than CPUs only adds memory
+workers = int(os.getenv('GUNICORN_WORKERS', 0)) or _cpu_count()
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.getenv('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+accesslog = '-'
+# Worker heartbeats on a tmpfs; a disk-backed /tmp can stall them and get workers killed
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def _health_monitor(app):
+    """The HealthMonitor of a Flask (``extensions``) or ASGI (attribute) app, if any."""
+    extensions = getattr(app, 'extensions', None)
+    if extensions is not None:
+        return extensions.get('health_monitor')
+    return getattr(app, 'health_monitor', None)
+
+
+def _check_session_store(app, workers: int, log) -> None:
+    """Warn when several workers would each keep their own game sessions."""
+    from sessions import MemorySessionStore
+    extensions = getattr(app, 'extensions', None) or {}
+    if workers > 1 and isinstance(extensions.get('game_sessions'), MemorySessionStore):
+        log.warning("Game sessions are kept in memory by each of %d workers, so /games/<id> requests "
+                    "reaching another worker return 404; set SESSION_STORE_URL or REDIS_URL", workers)
+
+
+def _collect_worker_logs(log) -> None:
+    """Fold the log files of exited workers into logs/app.log (queued LOG_MODE only)."""
+    from config.config import collect_worker_logs
+    try:
+        collect_worker_logs()
+    except OSError as e:
+        log.warning("Could not collect worker log files: %s", e)
+
+
+def on_starting(server):
+    """Empty the Prometheus multiprocess directory and collect log files left by a previous run."""
+    _collect_worker_logs(server.log)
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path and os.path.isdir(path):
+        for name in os.listdir(path):
+            entry = os.path.join(path, name)
+            if os.path.isdir(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                os.remove(entry)
+
+
+def when_ready(server):
+    """Warm the preloaded app in the master and freeze its heap before workers fork."""
+    if not server.cfg.preload_app:
+        return
+    app = server.app.wsgi()
+    _check_session_store(app, server.cfg.workers, server.log)
+    monitor = _health_monitor(app)
+    if monitor is not None:
+        # No self-test thread in the master; post_worker_init starts one per worker
+        monitor.stop(wait=True)
+        monitor.warm_up()
+    # Move everything allocated so far out of the collector's generations, so
+    # collections in the workers do not write to (and copy) the shared pages
+    gc.freeze()
+    server.log.info("Preloaded app warmed up, %d objects frozen", gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    """Start the worker's self-test thread (after gevent has patched threading)."""
+    if not worker.cfg.preload_app and worker.age == 1:
+        # Without preloading, the first worker checks the app the master never built
+        _check_session_store(worker.wsgi, worker.cfg.workers, worker.log)
+    monitor = _health_monitor(worker.wsgi)
+    if monitor is not None:
+        monitor.start()
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of an exited worker and fold its log files into logs/app.log."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+    _collect_worker_logs(server.log)
@@ -0,0 +1,155 @@
+"""Optional third-party integrations: Sentry, security headers and rate limiting.
+
+Each package is imported only when its integration is enabled, so a
+development or test app never pays for loading it. Sentry is set up while the
+app is created, or, with ``STARTUP_MODE=lazy``, by the first exception it has
+to report. Rate limits use the hybrid limiter of rate_limit.py unless
+``RATELIMIT_MODE=storage`` selects flask_limiter.
+
+The ASGI app (asgi.py) gets the same Sentry setup, the hybrid limiter and
+the headers Talisman adds, from ``init_asgi`` and ``asgi_security_headers``.
+"""
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from config.config import Config, logger
+
+# Limits of routes without their own
+DEFAULT_LIMITS = ("200 per day", "50 per hour")
+# Limit of each route that plays a move or starts a game
+MOVE_LIMIT = "30 per minute"
+
+CONTENT_SECURITY_POLICY = {
+    'default-src': "'self'",
+    'script-src': "'self'",
+    'style-src': "'self' 'unsafe-inline'",
+}
+# Talisman's default max-age for Strict-Transport-Security
+HSTS_MAX_AGE = 31556926
+
+# None until Sentry setup was attempted, then whether it is active
+_sentry_active: Optional[bool] = None
+
+
+def init_sentry() -> bool:
+    """Initialize Sentry once if SENTRY_DSN is set; return whether it is active."""
+    global _sentry_active
+    if _sentry_active is not None:
+        return _sentry_active
+    _sentry_active = False
+    dsn = os.getenv('SENTRY_DSN')
+    if not dsn:
+        return False
+    try:
+        import sentry_sdk
+        from sentry_sdk.integrations.flask import FlaskIntegration
+    except ImportError as e:
+        logger.warning("Sentry is configured but not installed: %s", e)
+        return False
+    sentry_sdk.init(
+        dsn=dsn,
+        integrations=[FlaskIntegration()],
+        traces_sample_rate=0.1,
+        environment=os.getenv('FLASK_ENV', 'development')
+    )
+    _sentry_active = True
+    return True
+
+
+def capture_exception(error: BaseException) -> None:
+    """Report an exception to Sentry when it is configured."""
+    if init_sentry():
+        sys.modules['sentry_sdk'].capture_exception(error)
+
+
+def init_talisman(app) -> None:
+    """Add security headers in production."""
+    if os.getenv('FLASK_ENV') != 'production':
+        return
+    try:
+        from flask_talisman import Talisman
+    except ImportError as e:
+        logger.warning("flask_talisman is not installed: %s", e)
+        return
+    Talisman(app,
+        force_https=False,  # Let reverse proxy handle HTTPS
+        strict_transport_security=True,
+        content_security_policy=CONTENT_SECURITY_POLICY,
+    )
+
+
+def asgi_security_headers(https: bool) -> List[Tuple[bytes, bytes]]:
+    """The headers Talisman adds in production, for the ASGI app; HSTS only over HTTPS."""
+    if os.getenv('FLASK_ENV') != 'production':
+        return []
+    headers = [
+        (b"x-frame-options", b"SAMEORIGIN"),
+        (b"x-content-type-options", b"nosniff"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        (b"content-security-policy",
+         "; ".join(f"{name} {value}" for name, value in CONTENT_SECURITY_POLICY.items()).encode()),
+        (b"permissions-policy", b"browsing-topics=()"),
+    ]
+    if https:
+        headers.append((b"strict-transport-security", f"max-age={HSTS_MAX_AGE}; includeSubDomains".encode()))
+    return headers
+
+
+def create_hybrid_limiter(config, app=None, key_func=None):
+    """Return a HybridLimiter with the default limits, synced through RATELIMIT_STORAGE_URL."""
+    from rate_limit import HybridLimiter, create_counter_store
+    return HybridLimiter(
+        app,
+        key_func=key_func,
+        default_limits=DEFAULT_LIMITS,
+        store=create_counter_store(getattr(config, 'RATELIMIT_STORAGE_URL', 'memory://')),
+        sync_interval=Config.RATELIMIT_SYNC_INTERVAL,
+        max_error=Config.RATELIMIT_SYNC_ERROR,
+    )
+
+
+def init_limiter(app, config):
+    """Return a rate limiter for the app in production, otherwise None."""
+    if os.getenv('FLASK_ENV') != 'production':
+        return None
+    if Config.RATELIMIT_MODE == 'hybrid':
+        from flask import request
+        return create_hybrid_limiter(config, app, key_func=lambda: request.remote_addr or '127.0.0.1')
+    storage_uri = getattr(config, 'RATELIMIT_STORAGE_URL', 'memory://')
+    try:
+        from flask_limiter import Limiter
+        try:
+            from flask_limiter.util import get_remote_address
+        except ImportError:
+            # flask-limiter < 1.0
+            from flask_limiter.util import get_remote_addr as get_remote_address
+    except ImportError as e:
+        logger.warning("flask_limiter is not installed: %s", e)
+        return None
+    return Limiter(
+        key_func=get_remote_address,
+        app=app,
+        default_limits=list(DEFAULT_LIMITS),
+        storage_uri=storage_uri
+    )
+
+
+def init_app(app, config):
+    """Set up the integrations of a Flask app and return its rate limiter (or None)."""
+    if Config.STARTUP_MODE != 'lazy':
+        init_sentry()
+    init_talisman(app)
+    return init_limiter(app, config)
+
+
+def init_asgi(config):
+    """Set up Sentry for the ASGI app and return its rate limiter in production (or None).
+
+    The ASGI app always uses the hybrid limiter, as flask_limiter needs Flask.
+    """
+    if Config.STARTUP_MODE != 'lazy':
+        init_sentry()
+    if os.getenv('FLASK_ENV') != 'production':
+        return None
+    return create_hybrid_limiter(config)
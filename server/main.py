@@ -1,10 +1,26 @@
 import os
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
+from serialization import dumps_json, loads_json
 
-def create_app(config_name=None):
-    """Application factory pattern."""
-    app = Flask(__name__)
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using serialization.py (orjson when it is installed)."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return loads_json(s)
+
+def create_app(config_name=None, search_workers=None):
+    """Application factory pattern.
+
+    search_workers overrides SEARCH_EXECUTOR_WORKERS; a positive value sends
+    expensive computer-move searches to a process pool.
+    """
+    from startup import StartupProfile
+    profile = StartupProfile()
     
     # Set testing environment early if needed
     if config_name == 'testing':
@@ -12,62 +28,74 @@ def create_app(config_name=None):
         os.environ['FLASK_ENV'] = 'testing'
     
     # Import after environment setup
-    from config.config import Config, logger
-    from game import TicTacToeGame
-    from schemas import validate_move_input
-    from datetime import datetime
+    with profile.step("imports"):
+        from config.config import Config, init_logging, logger
+        from schemas import (validate_move_input, validate_moves_input,
+                             validate_new_game_input, validate_session_move_input)
+        from sessions import create_session_store, new_game_id
+        from service import GameService
+        from probes import LIVE_PATH, PROBE_PATHS, READY_PATH, HealthMonitor
+        from response_cache import MoveResponseCache
+        import integrations
+        import metrics
+        import request_log
+        import serialization
+        from request_log import bind, phase
+        from serialization import negotiate
+        from datetime import datetime
     
     # Load configuration
-    config = Config.get_config()
-    app.config.from_object(config)
-    
-    # CORS
-    CORS(app, origins=config.ALLOWED_ORIGINS)
+    with profile.step("config"):
+        init_logging()
+        config = Config.get_config()
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        app.config.from_object(config)
+        app.extensions['startup'] = profile
+        CORS(app, origins=config.ALLOWED_ORIGINS)
     
-    # Initialize production dependencies only if available and not in testing
+    # Registered before the rate limiter, so rejected requests are logged and counted too
+    @app.before_request
+    def open_request_log():
+        """Start the structured log event for this request."""
+        if request.path in PROBE_PATHS:
+            return
+        g.request_log = request_log.begin(request.method, request.path, request.headers.get("X-Request-ID"))
+
+    @app.after_request
+    def close_request_log(response):
+        """Emit the request's log event and echo its id to the client."""
+        token = g.pop("request_log", None)
+        if token is not None:
+            bind(route=request.url_rule.rule if request.url_rule is not None else "unmatched")
+            response.headers["X-Request-ID"] = request_log.current_request_id()
+            request_log.finish(token, response.status_code)
+        return response
+
+    # Sentry, security headers and rate limiting; none of them while testing
     limiter = None
     if not getattr(config, 'TESTING', False):
-        try:
-            import sentry_sdk
-            from sentry_sdk.integrations.flask import FlaskIntegration
-            from flask_talisman import Talisman
-            from flask_limiter import Limiter
-            from flask_limiter.util import get_remote_addr
-            
-            # Initialize Sentry for error tracking
-            if os.getenv('SENTRY_DSN'):
-                sentry_sdk.init(
-                    dsn=os.getenv('SENTRY_DSN'),
-                    integrations=[FlaskIntegration()],
-                    traces_sample_rate=0.1,
-                    environment=os.getenv('FLASK_ENV', 'development')
-                )
-
-            # Security headers (only in production)
-            if os.getenv('FLASK_ENV') == 'production':
-                Talisman(app,
-                    force_https=False,  # Let reverse proxy handle HTTPS
-                    strict_transport_security=True,
-                    content_security_policy={
-                        'default-src': "'self'",
-                        'script-src': "'self'",
-                        'style-src': "'self' 'unsafe-inline'",
-                    }
-                )
-
-            # Rate limiting - Fixed syntax
-            limiter = Limiter(
-                key_func=get_remote_addr,
-                app=app,
-                default_limits=["200 per day", "50 per hour"],
-                storage_uri=getattr(config, 'RATELIMIT_STORAGE_URL', 'memory://')
-            )
-            
-        except ImportError as e:
-            # If production dependencies aren't installed, continue without them
-            logger.warning(f"Production dependencies not installed: {e}")
+        with profile.step("integrations"):
+            limiter = integrations.init_app(app, config)
     
-    game = TicTacToeGame()
+    with profile.step("service"):
+        service = GameService(search_workers)
+    search_executor = service.search_executor
+    resolve_move = service.resolve_move
+    app.extensions['game_service'] = service
+    app.extensions['search_executor'] = search_executor
+
+    with profile.step("sessions"):
+        sessions = create_session_store(getattr(config, 'SESSION_STORE_URL', Config.SESSION_STORE_URL),
+                                        Config.SESSION_MAX_GAMES, Config.SESSION_TTL)
+    app.extensions['game_sessions'] = sessions
+
+    move_cache = MoveResponseCache(Config.MOVE_CACHE_SIZE, Config.MOVE_CACHE_MAX_AGE)
+    app.extensions['move_cache'] = move_cache
+
+    with profile.step("health_monitor"):
+        health_monitor = HealthMonitor(service)
+    app.extensions['health_monitor'] = health_monitor
 
     @app.route("/health", methods=["GET"])
     def health():
@@ -84,10 +112,17 @@ def create_app(config_name=None):
         }
         
         try:
-            # Test game logic
-            test_game = TicTacToeGame()
-            test_board = [None] * 9
-            test_game.validate_move(test_board, 0)
+            # Game logic is checked by the health monitor's self-test
+            self_test = health_monitor.self_test
+            if self_test["status"] == "failed":
+                raise RuntimeError(self_test["error"])
+            health_status["checks"]["ready"] = health_monitor.is_ready()
+                
+            if search_executor is not None:
+                health_status["checks"]["search_executor"] = search_executor.stats()
+            health_status["checks"]["sessions"] = sessions.stats()
+            health_status["checks"]["move_cache"] = move_cache.stats()
+            health_status["checks"]["startup"] = profile.as_dict()
                 
         except Exception as e:
             health_status["status"] = "unhealthy"
@@ -96,87 +131,251 @@ def create_app(config_name=None):
         
         return jsonify(health_status)
 
+    @app.route(LIVE_PATH, methods=["GET"])
+    def liveness():
+        """Liveness probe: the process is answering."""
+        return app.response_class(health_monitor.live_body, mimetype="application/json")
+
+    @app.route(READY_PATH, methods=["GET"])
+    def readiness():
+        """Readiness probe: warmed up and the latest self-test passed."""
+        status, body = health_monitor.readiness()
+        return app.response_class(body, status=status, mimetype="application/json")
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        """Prometheus metrics for every worker process."""
+        scrape = metrics.render()
+        if scrape is None:
+            return jsonify({"error": "Metrics are disabled"}), 404
+        payload, content_type = scrape
+        return app.response_class(payload, content_type=content_type)
+
+    def read_body(silent=False):
+        """Parse a JSON or msgpack request body; None when there is none.
+
+        Malformed bodies raise, or return None when silent is set.
+        """
+        if request.mimetype in serialization.MSGPACK_TYPES:
+            try:
+                return serialization.loads(request.get_data(), request.mimetype) if request.content_length else None
+            except ValueError:
+                if silent:
+                    return None
+                raise
+        return request.get_json(silent=silent)
+
+    def invalid_body_error():
+        """Error message for a body that could not be parsed."""
+        return "Invalid msgpack data" if request.mimetype in serialization.MSGPACK_TYPES else "Invalid JSON data"
+
+    def respond(body, status=200):
+        """Encode a response body in the media type the client accepts."""
+        media_type = negotiate(request.headers.get("Accept"))
+        with phase("encode"):
+            payload = serialization.dumps(body, media_type)
+        response = app.response_class(payload, status=status, mimetype=media_type)
+        response.vary.add("Accept")
+        return response
+
+    def cached_move_response(payload, etag, cache_status, media_type):
+        """Build a /move response from serialized bytes with caching headers."""
+        response = app.response_class(payload, mimetype=media_type)
+        response.vary.add("Accept")
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = move_cache.cache_control
+        response.headers["X-Cache"] = cache_status
+        return response
+
     def move():
         """Handle player move and computer response with validation."""
         try:
             # Handle request parsing errors
             try:
-                json_data = request.get_json()
+                with phase("parse"):
+                    json_data = read_body()
             except Exception as e:
-                logger.warning(f"Invalid JSON data: {str(e)}")
-                return jsonify({"error": "Invalid JSON data"}), 400
+                logger.warning("Invalid request body: %s", e)
+                bind(error="invalid_body")
+                return respond({"error": invalid_body_error()}, 400)
             
             if json_data is None:
                 logger.warning("No JSON data received")
-                return jsonify({"error": "No JSON data provided"}), 400
+                bind(error="invalid_body")
+                return respond({"error": "No JSON data provided"}, 400)
+            
+            # Responses are a pure function of the request, so repeats are served as stored bytes
+            media_type = negotiate(request.headers.get("Accept"))
+            with phase("cache"):
+                cache_key = move_cache.key(json_data, media_type)
+                cached = move_cache.get(cache_key) if cache_key is not None else None
+            bind(cache="HIT" if cached is not None else "MISS")
+            if cached is not None:
+                payload, etag, result = cached
+                bind(result=result)
+                return cached_move_response(payload, etag, "HIT", media_type)
             
             # Validate input with marshmallow
-            data, errors = validate_move_input(json_data)
+            with phase("validate"):
+                data, errors = validate_move_input(json_data)
             if errors:
-                logger.warning(f"Input validation failed: {errors}")
-                return jsonify({"error": "Invalid input", "details": errors}), 400
-            
-            board = data["board"]
-            index = data["index"]
-            
-            # Additional game validation
-            is_valid, error_msg = game.validate_move(board, index)
-            if not is_valid:
-                logger.warning(error_msg)
-                return jsonify({"error": error_msg}), 400
-            
-            # Human move
-            board[index] = 'X'
-            logger.info(f"Human player moved to position {index}")
-            
-            if game.check_winner(board, 'X'):
-                logger.info("Human player wins")
-                return jsonify({"board": board, "status": "X_wins"})
-            
-            if game.is_draw(board):
-                logger.info("Game ended in draw after human move")
-                return jsonify({"board": board, "status": "draw"})
+                logger.warning("Input validation failed: %s", errors)
+                bind(error="invalid_input")
+                return respond({"error": "Invalid input", "details": errors}, 400)
             
-            # Computer move
-            comp_move = game.get_computer_move(board)
-            if comp_move is not None:
-                board[comp_move] = 'O'
-                logger.info(f"Computer moved to position {comp_move}")
-                
-                if game.check_winner(board, 'O'):
-                    logger.info("Computer wins")
-                    return jsonify({"board": board, "status": "O_wins"})
-                
-                if game.is_draw(board):
-                    logger.info("Game ended in draw after computer move")
-                    return jsonify({"board": board, "status": "draw"})
-            
-            logger.info("Game continues")
-            return jsonify({"board": board, "status": "in_progress"})
+            body, status_code = resolve_move(data)
+            if status_code != 200 or cache_key is None:
+                return respond(body, status_code)
+            with phase("encode"):
+                payload = serialization.dumps(body, media_type)
+            etag = move_cache.put(cache_key, payload, body["status"])
+            return cached_move_response(payload, etag, "MISS", media_type)
+        
+        except Exception as e:
+            logger.error("Error processing move: %s", e)
+            integrations.capture_exception(e)
+            return respond({"error": "Internal server error"}, 500)
+
+    def moves():
+        """Resolve a batch of moves, reporting results and errors per item."""
+        try:
+            json_data = read_body()
+        except Exception as e:
+            logger.warning("Invalid request body: %s", e)
+            bind(error="invalid_body")
+            return respond({"error": invalid_body_error()}, 400)
+        
+        if not isinstance(json_data, list) or not json_data:
+            logger.warning("Batch request without a list of moves")
+            bind(error="invalid_input")
+            return respond({"error": "Expected a non-empty array of moves"}, 400)
+        
+        if len(json_data) > Config.MAX_BATCH_MOVES:
+            logger.warning("Batch of %d moves exceeds limit", len(json_data))
+            bind(error="invalid_input")
+            return respond({"error": f"Too many moves: {len(json_data)} (max {Config.MAX_BATCH_MOVES})"}, 400)
+        
+        results = []
+        for data, errors in validate_moves_input(json_data):
+            if errors:
+                results.append({"error": "Invalid input", "details": errors})
+                continue
+            try:
+                body, _ = resolve_move(data)
+            except Exception as e:
+                logger.error("Error processing batch move: %s", e)
+                body = {"error": "Internal server error"}
+            results.append(body)
+        
+        logger.info("Resolved batch of %d moves", len(results))
+        return respond({"results": results})
+
+    def new_game():
+        """Start a server-side game and return its id and empty board."""
+        data, errors = validate_new_game_input(read_body(silent=True) or {})
+        if errors:
+            logger.warning("Input validation failed: %s", errors)
+            bind(error="invalid_input")
+            return respond({"error": "Invalid input", "details": errors}, 400)
+        
+        active_game = service.get_game(data["size"], data["win_length"])
+        game_id = new_game_id()
+        state = {
+            "board": [None] * active_game.board_size,
+            "size": data["size"],
+            "win_length": data["win_length"],
+            "status": "in_progress",
+        }
+        sessions.put(game_id, state)
+        bind(game_id=game_id)
+        logger.info("Started game %s", game_id)
+        return respond(dict(state, game_id=game_id), 201)
+
+    def get_session(game_id):
+        """Return the current state of a server-side game."""
+        bind(game_id=game_id)
+        state = sessions.get(game_id)
+        if state is None:
+            return respond({"error": "Game not found"}, 404)
+        return respond(dict(state, game_id=game_id))
+
+    def session_move(game_id):
+        """Apply a move to a server-side game; the request carries only the index."""
+        bind(game_id=game_id)
+        with phase("parse"):
+            json_data = read_body(silent=True)
+        if json_data is None:
+            logger.warning("No JSON data received")
+            bind(error="invalid_body")
+            return respond({"error": "No JSON data provided"}, 400)
+        
+        with phase("validate"):
+            data, errors = validate_session_move_input(json_data)
+        if errors:
+            logger.warning("Input validation failed: %s", errors)
+            bind(error="invalid_input")
+            return respond({"error": "Invalid input", "details": errors}, 400)
+        
+        with phase("session"):
+            state = sessions.get(game_id)
+        if state is None:
+            return respond({"error": "Game not found"}, 404)
+        if state["status"] != "in_progress":
+            return respond({"error": "Game is already over", "status": state["status"]}, 409)
+        
+        with phase("validate"):
+            data, errors = validate_move_input({"board": state["board"], "index": data["index"],
+                                                "size": state["size"], "win_length": state["win_length"]})
+        if errors:
+            logger.warning("Input validation failed: %s", errors)
+            bind(error="invalid_input")
+            return respond({"error": "Invalid input", "details": errors}, 400)
         
+        try:
+            body, status_code = resolve_move(data)
         except Exception as e:
-            logger.error(f"Error processing move: {str(e)}")
-            if 'sentry_sdk' in globals():
-                sentry_sdk.capture_exception(e)
-            return jsonify({"error": "Internal server error"}), 500
+            logger.error("Error processing move: %s", e)
+            return respond({"error": "Internal server error"}, 500)
+        
+        if status_code == 200:
+            with phase("session"):
+                saved = sessions.replace(game_id, state, dict(state, board=body["board"], status=body["status"]))
+            if not saved:
+                logger.warning("Game %s changed during the move", game_id)
+                bind(error="conflict")
+                return respond({"error": "Game was changed by another move"}, 409)
+        body["game_id"] = game_id
+        return respond(body, status_code)
+
+    def batch_cost():
+        """Charge a batch one rate-limit unit per move it carries, in JSON or msgpack."""
+        json_data = read_body(silent=True)
+        return max(len(json_data), 1) if isinstance(json_data, list) else 1
 
     # Apply rate limiting conditionally
     if limiter:
-        move = limiter.limit("30 per minute")(move)
+        move = limiter.limit(integrations.MOVE_LIMIT)(move)
+        moves = limiter.limit(Config.MOVES_RATE_LIMIT, cost=batch_cost)(moves)
+        new_game = limiter.limit(integrations.MOVE_LIMIT)(new_game)
+        session_move = limiter.limit(integrations.MOVE_LIMIT)(session_move)
     
-    # Register the route
+    # Register the routes
     app.add_url_rule('/move', 'move', move, methods=['POST'])
+    app.add_url_rule('/moves', 'moves', moves, methods=['POST'])
+    app.add_url_rule('/games', 'new_game', new_game, methods=['POST'])
+    app.add_url_rule('/games/<game_id>', 'get_session', get_session, methods=['GET'])
+    app.add_url_rule('/games/<game_id>/move', 'session_move', session_move, methods=['POST'])
 
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors."""
-        logger.warning(f"404 error: {request.url}")
+        logger.warning("404 error: %s", request.url)
         return jsonify({"error": "Endpoint not found"}), 404
 
     @app.errorhandler(429)
     def rate_limit_handler(e):
         """Handle rate limit errors."""
-        logger.warning(f"Rate limit exceeded for {request.remote_addr}")
+        logger.warning("Rate limit exceeded for %s", request.remote_addr)
         return jsonify({
             "error": "Rate limit exceeded", 
             "retry_after": str(getattr(e, 'retry_after', 60))
@@ -185,25 +384,36 @@ def create_app(config_name=None):
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors."""
-        logger.error(f"500 error: {str(error)}")
-        try:
-            import sentry_sdk
-            sentry_sdk.capture_exception(error)
-        except ImportError:
-            pass
+        logger.error("500 error: %s", error)
+        integrations.capture_exception(error)
         return jsonify({"error": "Internal server error"}), 500
 
+    if limiter:
+        limiter.exempt(prometheus_metrics)
+        limiter.exempt(liveness)
+        limiter.exempt(readiness)
+
     return app
 
-# Create app instance
-app = create_app()
+def __getattr__(name):
+    """Create the module-level ``app`` on first access (``from main import app``, gunicorn ``main:app``).
+
+    Importing main only for create_app(), as tests and startup.py do, then
+    builds no app.
+    """
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     from config.config import Config, logger
     
-    logger.info(f"Starting Flask app on port {Config.PORT}")
-    logger.info(f"Debug mode: {Config.DEBUG_MODE}")
-    logger.info(f"Allowed origins: {Config.ALLOWED_ORIGINS}")
+    app = create_app()
+    logger.info("Starting Flask app on port %d", Config.PORT)
+    logger.info("Debug mode: %s", Config.DEBUG_MODE)
+    logger.info("Allowed origins: %s", Config.ALLOWED_ORIGINS)
     
     app.run(
         host="0.0.0.0", 
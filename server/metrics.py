@@ -0,0 +1,111 @@
+"""Prometheus metrics.
+
+Metrics are recorded from the per-request events of request_log.py, so every
+phase timed there (parse, validate, human_move, search, encode, ...) gets a
+latency histogram without extra timing code in the handlers.
+
+With several worker processes (gunicorn), set ``PROMETHEUS_MULTIPROC_DIR`` to
+an empty local directory before the app starts. Each worker then writes its
+samples to files there and ``/metrics`` aggregates all of them, whichever
+worker serves the scrape. The directory must be emptied when the server
+restarts, and ``multiprocess.mark_process_dead(pid)`` called when a worker
+exits; gunicorn.conf.py does both.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from config.config import Config, logger
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+except ImportError:
+    prometheus_client = None
+
+# Phase latencies range from a few microseconds (cache lookups) to the search budget
+PHASE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+ENABLED = Config.METRICS_ENABLED and prometheus_client is not None
+if Config.METRICS_ENABLED and prometheus_client is None:
+    logger.warning("prometheus_client is not installed, /metrics is disabled")
+if ENABLED and os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+if ENABLED:
+    REQUEST_SECONDS = Histogram("tictactoe_request_seconds", "Request latency by route",
+                                ["route"], buckets=PHASE_BUCKETS)
+    PHASE_SECONDS = Histogram("tictactoe_phase_seconds", "Time spent per request phase",
+                              ["phase"], buckets=PHASE_BUCKETS)
+    RESPONSES = Counter("tictactoe_responses_total", "Responses by route and HTTP status code",
+                        ["route", "code"])
+    MOVE_RESULTS = Counter("tictactoe_move_results_total", "Resolved moves by resulting game status",
+                           ["result"])
+    VALIDATION_FAILURES = Counter("tictactoe_validation_failures_total",
+                                  "Rejected requests by route and reason", ["route", "reason"])
+    RATE_LIMITED = Counter("tictactoe_rate_limited_total", "Requests rejected with 429", ["route"])
+    SEARCH_NODES = Gauge("tictactoe_last_search_nodes", "Positions visited by the most recent search",
+                         multiprocess_mode="mostrecent")
+    SEARCH_NODES_TOTAL = Counter("tictactoe_search_nodes_total", "Positions visited by searches")
+    MOVE_CACHE = Counter("tictactoe_move_cache_total", "/move response cache lookups", ["result"])
+    MOVE_CACHE_HIT_RATIO = Gauge("tictactoe_move_cache_hit_ratio",
+                                 "Hit ratio of each worker's /move response cache",
+                                 multiprocess_mode="liveall")
+
+# This process's cache lookups, for the hit ratio gauge
+_cache_lookups = {"HIT": 0, "MISS": 0}
+_cache_lock = threading.Lock()
+
+# Labelled children by (metric, label values); labels() takes a lock and builds keys on every call
+_children: Dict[tuple, object] = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+def observe_request(event: Dict) -> None:
+    """Record the metrics for one finished request event."""
+    if not ENABLED:
+        return
+    route = event.get("route", "unmatched")
+    status = event["status"]
+    _child(REQUEST_SECONDS, route).observe(event["duration_ms"] / 1000)
+    _child(RESPONSES, route, str(status)).inc()
+    for phase, ms in event["phases_ms"].items():
+        _child(PHASE_SECONDS, phase).observe(ms / 1000)
+    if status == 429:
+        _child(RATE_LIMITED, route).inc()
+    if "error" in event:
+        _child(VALIDATION_FAILURES, route, event["error"]).inc()
+    if "result" in event:
+        _child(MOVE_RESULTS, event["result"]).inc()
+    nodes = event.get("nodes")
+    if nodes:
+        SEARCH_NODES.set(nodes)
+        SEARCH_NODES_TOTAL.inc(nodes)
+    cache = event.get("cache")
+    if cache in _cache_lookups:
+        _child(MOVE_CACHE, cache.lower()).inc()
+        with _cache_lock:
+            _cache_lookups[cache] += 1
+            MOVE_CACHE_HIT_RATIO.set(_cache_lookups["HIT"] / (_cache_lookups["HIT"] + _cache_lookups["MISS"]))
+
+
+def render() -> Optional[Tuple[bytes, str]]:
+    """Return ``(payload, content_type)`` for a scrape, or None when metrics are disabled."""
+    if not ENABLED:
+        return None
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
@@ -0,0 +1,125 @@
+"""Liveness and readiness probes.
+
+Liveness only says the process is answering. Readiness says the worker has
+warmed up (an engine built for every board variant) and that the latest
+self-test passed. The self-test plays a known position through the default
+engine; it runs once at startup and then every HEALTH_SELF_TEST_INTERVAL
+seconds on a background thread. Probe bodies are encoded when that state
+changes, so answering a probe is a lookup rather than building a game.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from config.config import Config, logger
+from serialization import dumps_json
+
+# Probe paths; they are answered without per-request logging or metrics
+LIVE_PATH = "/health/live"
+READY_PATH = "/health/ready"
+PROBE_PATHS = frozenset((LIVE_PATH, READY_PATH))
+
+# O to move with a win at 2 (X also threatens 5, so blocking is the wrong answer)
+SELF_TEST_BOARD = ['O', 'O', None, 'X', 'X', None, 'X', None, None]
+SELF_TEST_MOVE = 2
+
+# Readiness fails when the self-test has not run for this many intervals
+STALE_INTERVALS = 3
+
+
+class HealthMonitor:
+    """Warm-up state and cached self-test result of one worker process."""
+
+    def __init__(self, service, interval: Optional[float] = None, background: bool = True):
+        self.service = service
+        self.interval = interval if interval is not None else Config.HEALTH_SELF_TEST_INTERVAL
+        self.warmed_up = threading.Event()
+        self.self_test: Dict = {"status": "pending"}
+        self.live_body = dumps_json({"status": "alive"})
+        self._ready_response: Tuple[int, bytes] = (503, b"")
+        self._stale_body = b""
+        self._last_run = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.run_self_test()
+        # Forked workers get their thread from gunicorn's post_worker_init, not
+        # from a fork hook that would also start one in search pool children
+        if background:
+            self.start()
+
+    def run_self_test(self) -> bool:
+        """Play the self-test position and cache the probe responses."""
+        started = time.perf_counter()
+        try:
+            game = self.service.game
+            is_valid, error_msg = game.validate_move([None] * 9, 0)
+            if not is_valid:
+                raise AssertionError(error_msg)
+            move = game.get_computer_move(list(SELF_TEST_BOARD))
+            if move != SELF_TEST_MOVE:
+                raise AssertionError(f"expected move {SELF_TEST_MOVE}, got {move}")
+            result = {"status": "ok"}
+        except Exception as e:
+            logger.error("Health self-test failed: %s", e)
+            result = {"status": "failed", "error": str(e)}
+        result["checked_at"] = datetime.utcnow().isoformat()
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self.self_test = result
+        self._last_run = time.monotonic()
+        self._encode()
+        return result["status"] == "ok"
+
+    def warm_up(self) -> None:
+        """Build the engine of every board variant so no request pays for it."""
+        for dim, win_length in Config.BOARD_VARIANTS:
+            game = self.service.get_game(dim, win_length)
+            game.validate_move([None] * game.board_size, 0)
+        self.warmed_up.set()
+        self._encode()
+        logger.info("Warm-up finished")
+
+    def is_ready(self) -> bool:
+        """Whether this worker should receive traffic."""
+        return self._ready_response[0] == 200 and not self._stale()
+
+    def readiness(self) -> Tuple[int, bytes]:
+        """Return the cached ``(status_code, body)`` of the readiness probe."""
+        if self._stale():
+            return 503, self._stale_body
+        return self._ready_response
+
+    def _stale(self) -> bool:
+        return time.monotonic() - self._last_run > STALE_INTERVALS * self.interval
+
+    def _encode(self) -> None:
+        ready = self.warmed_up.is_set() and self.self_test["status"] == "ok"
+        body = {"status": "ready" if ready else "not_ready",
+                "warmed_up": self.warmed_up.is_set(), "self_test": self.self_test}
+        self._ready_response = (200 if ready else 503, dumps_json(body))
+        self._stale_body = dumps_json(dict(body, status="not_ready", stale=True))
+
+    def start(self) -> None:
+        """Warm up, run the self-test and rerun it periodically on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = False) -> None:
+        """Stop the background thread, waiting for it to exit if ``wait``."""
+        self._stop.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        if not self.warmed_up.is_set():
+            try:
+                self.warm_up()
+            except Exception as e:
+                logger.error("Warm-up failed: %s", e)
+        # A forked worker inherits the master's last run, which may be stale by now
+        self.run_self_test()
+        while not self._stop.wait(self.interval):
+            self.run_self_test()
@@ -0,0 +1,325 @@
+"""Hybrid rate limiting: local token buckets reconciled with Redis in the background.
+
+Each worker admits requests from its own token buckets (one per route limit
+and client address), so a request never waits on Redis. A background thread
+adds the tokens each bucket spent since the last sync to a sliding-window
+counter in Redis and reads back what all workers together have used, which
+then becomes the bucket's level.
+
+Between syncs a worker may spend at most ``max_error`` of a limit on one
+bucket (at least one request); past that it syncs inline before admitting
+more. With N workers a limit is therefore exceeded by at most
+N * max_error * limit requests. Without a Redis URL, or while Redis is
+unreachable, each worker enforces its limits on its own.
+"""
+import math
+import os
+import re
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.config import logger
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+LIMIT_PATTERN = re.compile(r'^\s*(\d+)\s*(?:per|/)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$')
+
+# Live limiters, reset in forked children by one fork hook that keeps none of them alive
+_limiters: "weakref.WeakSet[HybridLimiter]" = weakref.WeakSet()
+
+
+class RateLimit:
+    """``amount`` requests per ``period`` seconds, parsed from e.g. ``"30 per minute"``."""
+
+    def __init__(self, text: str):
+        match = LIMIT_PATTERN.match(text)
+        if match is None:
+            raise ValueError(f"Invalid rate limit: {text!r}")
+        amount, multiple, unit = match.groups()
+        self.text = text
+        self.amount = int(amount)
+        self.period = int(multiple or 1) * PERIODS[unit]
+        self.rate = self.amount / self.period
+        self.id = f"{self.amount}/{self.period}"
+
+    def __repr__(self):
+        return f"RateLimit({self.text!r})"
+
+
+class TokenBucket:
+    """Local token bucket of one limit and client, with the tokens spent since its last sync."""
+
+    __slots__ = ('name', 'limit', 'tokens', 'updated', 'unsynced', 'max_unsynced', 'syncing')
+
+    def __init__(self, name: str, limit: RateLimit, now: float, max_unsynced: int):
+        self.name = name
+        self.limit = limit
+        self.max_unsynced = max_unsynced
+        self.tokens = float(limit.amount)
+        self.updated = now
+        self.unsynced = 0
+        self.syncing = False
+
+    def refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(float(self.limit.amount), self.tokens + elapsed * self.limit.rate)
+            self.updated = now
+
+
+class RedisCounterStore:
+    """Sliding-window counts of admitted requests, shared by all workers through Redis."""
+
+    def __init__(self, client, prefix: str = 'ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+
+    def add(self, spent: List[Tuple[str, int, int]], now: float) -> List[float]:
+        """Add ``(name, period, tokens)`` spends and return each name's count over the last period.
+
+        The count weights the previous fixed window by how much of it still
+        lies within one period of ``now``. One pipelined round trip serves all names.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for name, period, tokens in spent:
+            window = int(now // period)
+            current = f"{self.prefix}{name}:{window}"
+            pipe.incrby(current, tokens)
+            pipe.expire(current, 2 * period)
+            pipe.get(f"{self.prefix}{name}:{window - 1}")
+        results = pipe.execute()
+        counts = []
+        for i, (name, period, _) in enumerate(spent):
+            current, previous = results[3 * i], results[3 * i + 2]
+            overlap = 1.0 - (now % period) / period
+            counts.append(int(current) + int(previous or 0) * overlap)
+        return counts
+
+
+def create_counter_store(url: Optional[str]) -> Optional[RedisCounterStore]:
+    """Return a Redis counter store for a redis:// URL, or None to limit per worker."""
+    if not url or not url.startswith(('redis://', 'rediss://', 'unix://')):
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("redis is not installed, rate limits are enforced per worker")
+        return None
+    return RedisCounterStore(redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0))
+
+
+class HybridLimiter:
+    """Flask rate limiter with flask_limiter's ``limit``/``exempt`` decorators, backed by TokenBuckets.
+
+    Routes without a ``limit()`` get ``default_limits``. A rejected request
+    raises werkzeug's TooManyRequests with ``retry_after`` in seconds.
+    """
+
+    def __init__(self, app=None, key_func: Optional[Callable[[], str]] = None,
+                 default_limits: Tuple[str, ...] = (), store: Optional[RedisCounterStore] = None,
+                 sync_interval: float = 1.0, max_error: float = 0.1,
+                 clock: Callable[[], float] = time.time):
+        self.key_func = key_func
+        self.default_limits = [RateLimit(text) for text in default_limits]
+        self.store = store
+        self.sync_interval = sync_interval
+        self.max_error = max_error
+        self.clock = clock
+        self.headers_enabled = False
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.inline_syncs = 0
+        self.sync_failures = 0
+        self._route_limits: Dict[Callable, Tuple[List[RateLimit], object]] = {}
+        self._exempt = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._store_down_until = 0.0
+        _limiters.add(self)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Check limits before each request and add X-RateLimit headers to responses."""
+        self.headers_enabled = app.config.get('RATELIMIT_HEADERS_ENABLED', False)
+        app.before_request(self._check_request)
+        app.after_request(self._add_headers)
+
+    def limit(self, limit_value: str, cost=None):
+        """Decorator replacing the default limits of a view.
+
+        ``cost`` is the number of tokens a request takes, or a function returning it.
+        """
+        def decorator(view):
+            self._route_limits[view] = ([RateLimit(limit_value)], cost)
+            return view
+        return decorator
+
+    def exempt(self, view):
+        """Decorator excluding a view from all limits."""
+        self._exempt.add(view)
+        return view
+
+    def max_unsynced(self, limit: RateLimit) -> int:
+        """Tokens one bucket may spend between syncs."""
+        return max(1, int(limit.amount * self.max_error))
+
+    def hit(self, scope: str, key: str, limits: List[RateLimit],
+            cost: int = 1) -> Tuple[bool, Optional[TokenBucket]]:
+        """Take ``cost`` tokens from every limit's bucket, or from none.
+
+        Returns whether the request is admitted and the bucket with the fewest
+        tokens left (the one that rejected it, if it was rejected).
+        """
+        now = self.clock()
+        with self._lock:
+            buckets = [self._bucket(f"{scope}:{limit.id}:{key}", limit, now) for limit in limits]
+            if self.store is None or now < self._store_down_until or \
+                    all(bucket.unsynced + cost <= bucket.max_unsynced for bucket in buckets):
+                return self._take(buckets, cost, now)
+            due = [bucket for bucket in buckets if bucket.unsynced + cost > bucket.max_unsynced]
+        self.inline_syncs += 1
+        self._sync(due)
+        with self._lock:
+            return self._take(buckets, cost, now)
+
+    def _take(self, buckets: List[TokenBucket], cost: int, now: float) -> Tuple[bool, TokenBucket]:
+        tightest = None
+        for bucket in buckets:
+            bucket.refill(now)
+            if tightest is None or bucket.tokens * tightest.limit.amount < tightest.tokens * bucket.limit.amount:
+                tightest = bucket
+            if bucket.tokens < cost:
+                return False, bucket
+        for bucket in buckets:
+            bucket.tokens -= cost
+        if self.store is not None:
+            for bucket in buckets:
+                bucket.unsynced += cost
+            if self._thread is None:
+                self._start_locked()
+        return True, tightest
+
+    def _bucket(self, name: str, limit: RateLimit, now: float) -> TokenBucket:
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            bucket = self.buckets[name] = TokenBucket(name, limit, now, self.max_unsynced(limit))
+        return bucket
+
+    def _check_request(self):
+        from flask import current_app, g, request
+        from werkzeug.exceptions import TooManyRequests
+
+        view = current_app.view_functions.get(request.endpoint) if request.endpoint else None
+        if view is None or view in self._exempt:
+            return None
+        limits, cost_func = self._route_limits.get(view, (self.default_limits, None))
+        if not limits:
+            return None
+        cost = cost_func() if callable(cost_func) else cost_func or 1
+        admitted, bucket = self.hit(request.endpoint, self.key_func(), limits, cost)
+        g.rate_limit_bucket = bucket
+        if not admitted:
+            raise TooManyRequests(retry_after=self.retry_after(bucket, cost))
+        return None
+
+    def _add_headers(self, response):
+        if not self.headers_enabled:
+            return response
+        from flask import g
+        bucket = g.pop('rate_limit_bucket', None)
+        if bucket is not None:
+            response.headers.update(self.headers(bucket, rejected=response.status_code == 429))
+        return response
+
+    def retry_after(self, bucket: TokenBucket, cost: int = 1) -> int:
+        """Whole seconds until a bucket holds ``cost`` tokens again."""
+        return max(1, math.ceil((cost - bucket.tokens) / bucket.limit.rate))
+
+    def headers(self, bucket: TokenBucket, rejected: bool = False) -> Dict[str, str]:
+        """X-RateLimit headers for a request checked against ``bucket``, and Retry-After if it was rejected."""
+        limit = bucket.limit
+        tokens = max(0.0, bucket.tokens)
+        headers = {
+            'X-RateLimit-Limit': str(limit.amount),
+            'X-RateLimit-Remaining': str(int(tokens)),
+            'X-RateLimit-Reset': str(math.ceil(self.clock() + (limit.amount - tokens) / limit.rate)),
+        }
+        if rejected:
+            headers['Retry-After'] = str(max(1, math.ceil((1 - tokens) / limit.rate)))
+        return headers
+
+    def sync(self) -> None:
+        """Reconcile every bucket with spends since its last sync, and drop idle buckets."""
+        now = self.clock()
+        with self._lock:
+            due = [bucket for bucket in self.buckets.values() if bucket.unsynced and not bucket.syncing]
+            idle = [name for name, bucket in self.buckets.items()
+                    if not bucket.unsynced and not bucket.syncing and now - bucket.updated > bucket.limit.period]
+            for name in idle:
+                del self.buckets[name]
+        if due and self.store is not None and now >= self._store_down_until:
+            self._sync(due)
+
+    def _sync(self, due: List[TokenBucket]) -> None:
+        with self._lock:
+            due = [bucket for bucket in due if not bucket.syncing]
+            spent = []
+            for bucket in due:
+                spent.append((bucket.name, bucket.limit.period, bucket.unsynced))
+                bucket.unsynced = 0
+                bucket.syncing = True
+        if not due:
+            return
+        now = self.clock()
+        try:
+            counts = self.store.add(spent, now)
+        except Exception as e:
+            # Keep the spends for the next sync; meanwhile each worker limits on its own
+            self.sync_failures += 1
+            self._store_down_until = now + self.sync_interval
+            logger.warning("Rate limit sync failed, enforcing limits per worker: %s", e)
+            with self._lock:
+                for bucket, (_, _, tokens) in zip(due, spent):
+                    bucket.unsynced += tokens
+                    bucket.syncing = False
+            return
+        with self._lock:
+            for bucket, count in zip(due, counts):
+                # Tokens spent here while the sync was in flight are not in count yet
+                bucket.tokens = max(0.0, bucket.limit.amount - count) - bucket.unsynced
+                bucket.updated = now
+                bucket.syncing = False
+
+    def _start_locked(self) -> None:
+        # Called with the lock held, on the first spend that needs syncing
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rate-limit-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background sync thread."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error("Rate limit sync error: %s", e)
+
+    def _after_fork(self) -> None:
+        # Buckets and the sync thread belong to one worker process
+        self._lock = threading.Lock()
+        self._thread = None
+        self.buckets = {}
+
+
+def _after_fork_in_child() -> None:
+    for limiter in list(_limiters):
+        limiter._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
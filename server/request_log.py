@@ -0,0 +1,94 @@
+"""Per-request structured log events.
+
+``begin()`` opens a request context with a request id. While it is open,
+handlers and the move service add fields with ``bind()`` (game id, move
+index, search node count) and time the work they do with ``phase()``.
+``finish()`` then emits one ``request`` event with all of it::
+
+    {"event": "request", "request_id": "...", "method": "POST", "path": "/move",
+     "status": 200, "duration_ms": 1.9, "index": 4, "nodes": 311,
+     "phases_ms": {"parse": 0.02, "validate": 0.01, "search": 1.6, "encode": 0.01}}
+
+so latency can be aggregated per phase straight from the JSON logs, and the
+same event feeds the Prometheus metrics (metrics.py). Every other record
+logged during the request carries the same request id.
+"""
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import metrics
+from config import logs
+from config.logs import request_context
+
+# Text-format events; JSON events go through structlog (see config/logs.py)
+request_logger = logging.getLogger("request")
+
+# Kept so structlog can cache the bound logger after the first event; created
+# on first use, so structlog is only imported when JSON logging is configured
+events = None
+
+# Longest client-supplied X-Request-ID that is kept; longer ones are replaced
+MAX_REQUEST_ID_LENGTH = 128
+
+
+def begin(method: str, path: str, request_id: Optional[str] = None):
+    """Open a request context and return the token finish() needs."""
+    if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+        request_id = uuid.uuid4().hex
+    context = {"request_id": request_id, "method": method, "path": path,
+               "phases_ms": {}, "_started": time.perf_counter()}
+    return request_context.set(context)
+
+
+def current_request_id() -> Optional[str]:
+    """Return the id of the request being handled, if any."""
+    context = request_context.get()
+    return context["request_id"] if context is not None else None
+
+
+def bind(**fields) -> None:
+    """Add fields to the current request's event; a no-op outside a request."""
+    context = request_context.get()
+    if context is not None:
+        context.update(fields)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's ``phases_ms``."""
+    context = request_context.get()
+    if context is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases = context["phases_ms"]
+        phases[name] = phases.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def _emit(event: Dict) -> None:
+    global events
+    if logs.structured:
+        if events is None:
+            events = logs.structlog.get_logger("request")
+        events.info("request", **event)
+    elif request_logger.isEnabledFor(logging.INFO):
+        request_logger.info("request %s", " ".join(f"{key}={value!r}" for key, value in event.items()))
+
+
+def finish(token, status: int) -> Dict:
+    """Emit the request event and its metrics, close the context and return the event fields."""
+    context = request_context.get()
+    request_context.reset(token)
+    event = {key: value for key, value in context.items() if not key.startswith("_")}
+    event["status"] = status
+    event["duration_ms"] = round((time.perf_counter() - context["_started"]) * 1000, 3)
+    event["phases_ms"] = {name: round(ms, 3) for name, ms in event["phases_ms"].items()}
+    _emit(event)
+    metrics.observe_request(event)
+    return event
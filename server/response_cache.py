@@ -0,0 +1,60 @@
+"""Cache of serialized /move responses.
+
+A /move response depends only on the board, index and board variant in the
+request, so successful responses are stored as the exact bytes sent to the
+client. A hit skips validation, the winner checks, the computer-move search
+and JSON encoding. Each entry keeps the game status of its response, so hits
+are counted in the move result metrics like misses, and carries an ETag so
+reverse proxies can cache and revalidate the same responses.
+"""
+import hashlib
+from typing import Dict, Hashable, Optional, Tuple
+
+from serialization import JSON
+from transposition import TranspositionTable
+
+# Request fields that determine a /move response; requests with others are not cached
+KEY_FIELDS = frozenset(("board", "index", "size", "win_length"))
+
+
+class MoveResponseCache:
+    """Bounded LRU of /move response bytes keyed on the raw request."""
+
+    def __init__(self, max_size: int = 4096, max_age: int = 3600):
+        self.max_age = max_age
+        self.cache_control = f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+        self._table = TranspositionTable(max_size)
+
+    @staticmethod
+    def key(json_data, media_type: str = JSON) -> Optional[Hashable]:
+        """Return the cache key for a request body and response type, or None if it is uncacheable."""
+        if not isinstance(json_data, dict) or not KEY_FIELDS.issuperset(json_data):
+            return None
+        board = json_data.get("board")
+        if not isinstance(board, list):
+            return None
+        numbers = (json_data.get("index"), json_data.get("size"), json_data.get("win_length"))
+        # True == 1 with the same hash, yet validation rejects it, so only exact types are cached
+        if any(value is not None and type(value) is not int for value in numbers):
+            return None
+        if any(cell is not None and type(cell) is not str for cell in board):
+            return None
+        return (tuple(board), *numbers, media_type)
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, str, str]]:
+        """Return ``(payload, etag, status)`` for a key, or None on a miss."""
+        return self._table.get(key)
+
+    def put(self, key: Hashable, payload: bytes, status: str) -> str:
+        """Store response bytes with their game status and return their ETag."""
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        self._table.put(key, (payload, etag, status))
+        return etag
+
+    def clear(self) -> None:
+        """Drop all stored responses."""
+        self._table.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return size and hit/miss counters for monitoring."""
+        return self._table.stats()
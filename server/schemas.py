@@ -1,21 +1,138 @@
-from marshmallow import Schema, fields, ValidationError
+from marshmallow import Schema, fields, validate, validates_schema, post_load, ValidationError
+from config.config import Config
 
-class MoveSchema(Schema):
+class VariantSchema(Schema):
+    """Schema for the optional board size and win length of a game."""
+    size = fields.Integer(
+        load_default=Config.BOARD_DIM,
+        validate=validate.OneOf(sorted(Config.DEFAULT_WIN_LENGTHS))
+    )
+    win_length = fields.Integer(load_default=None)
+
+    @validates_schema
+    def validate_variant(self, data, **kwargs):
+        """Reject win lengths that are not supported for the board size."""
+        size, win_length = data.get("size"), data.get("win_length")
+        if size is not None and win_length is not None and (size, win_length) not in Config.BOARD_VARIANTS:
+            raise ValidationError(f"Unsupported win length {win_length} for size {size}", "win_length")
+
+    @post_load
+    def fill_win_length(self, data, **kwargs):
+        """Default the win length from the board size."""
+        if data.get("win_length") is None:
+            data["win_length"] = Config.DEFAULT_WIN_LENGTHS[data["size"]]
+        return data
+
+# Values a board cell may hold; fields.Raw lets anything through
+CELL_VALUES = (None, 'X', 'O')
+CELL_ERROR = "Must be one of: X, O, null."
+
+def move_errors(board, index, size):
+    """Return marshmallow-style errors for a board and index of a ``size`` x ``size`` game.
+
+    Cells must be X, O or null, the board must have ``size * size`` cells and
+    the index must point at an empty one.
+    """
+    errors = {}
+    for i, cell in enumerate(board):
+        if cell is not None and cell != 'X' and cell != 'O':
+            errors[i] = [CELL_ERROR]
+    if errors:
+        return {"board": errors}
+    cells = size * size
+    if len(board) != cells:
+        return {"board": [f"Invalid board size: {len(board)}"]}
+    if index < 0 or index >= cells:
+        return {"index": [f"Invalid move index: {index}"]}
+    if board[index] is not None:
+        return {"index": [f"Position {index} already occupied"]}
+    return {}
+
+class MoveSchema(VariantSchema):
     """Schema for validating move requests."""
     board = fields.List(
-        fields.Raw(allow_none=True), 
-        required=True, 
-        validate=lambda x: len(x) == 9
-    )
-    index = fields.Integer(
-        required=True, 
-        validate=lambda x: 0 <= x <= 8
+        fields.Raw(allow_none=True),
+        required=True
     )
+    index = fields.Integer(required=True)
+
+    @validates_schema
+    def validate_move(self, data, **kwargs):
+        """Reject invalid cells, a board of the wrong length and an index off the board or taken."""
+        errors = move_errors(data["board"], data["index"], data["size"])
+        if errors:
+            raise ValidationError(errors)
+
+class SessionMoveSchema(Schema):
+    """Schema for a move in a server-side game, which carries only the index."""
+    index = fields.Integer(required=True)
+
+class MoveValidator:
+    """Single-pass validator for move requests, compiled once from ``MoveSchema``.
+
+    Well-formed requests (a dict with a list board and int index, size and
+    win length) are checked directly, cells, board length and index
+    included, in one pass. Anything else goes through the marshmallow schema,
+    so error messages keep marshmallow's shape.
+    """
+
+    def __init__(self, schema=None):
+        self.schema = schema or MoveSchema()
+        fields_ = self.schema.fields
+        self.field_names = frozenset(fields_)
+        size_field = fields_["size"]
+        self.default_size = size_field.load_default
+        self.sizes = frozenset(next(v.choices for v in size_field.validators if isinstance(v, validate.OneOf)))
+        self.variants = frozenset(Config.BOARD_VARIANTS)
+        self.default_win_lengths = dict(Config.DEFAULT_WIN_LENGTHS)
+
+    def __call__(self, data):
+        """Return ``(data, None)`` for a valid request or ``(None, errors)``."""
+        if type(data) is dict and data.keys() <= self.field_names:
+            board = data.get("board")
+            index = data.get("index")
+            size = data.get("size", self.default_size)
+            win_length = data.get("win_length")
+            if (type(board) is list and type(index) is int and type(size) is int and size in self.sizes
+                    and (win_length is None or type(win_length) is int)):
+                if win_length is None:
+                    win_length = self.default_win_lengths[size]
+                if (size, win_length) in self.variants:
+                    errors = move_errors(board, index, size)
+                    if errors:
+                        return None, errors
+                    return {"board": list(board), "index": index, "size": size, "win_length": win_length}, None
+
+        try:
+            return self.schema.load(data), None
+        except ValidationError as err:
+            return None, err.messages
+
+move_validator = MoveValidator()
+variant_schema = VariantSchema()
+session_move_schema = SessionMoveSchema()
 
 def validate_move_input(data):
     """Validate move input data."""
-    schema = MoveSchema()
+    return move_validator(data)
+
+def validate_moves_input(items):
+    """Validate a batch of move items.
+
+    Returns a list of ``(data, errors)`` pairs, one per item.
+    """
+    return [move_validator(item) for item in items]
+
+def validate_new_game_input(data):
+    """Validate the variant of a new server-side game."""
+    try:
+        return variant_schema.load(data), None
+    except ValidationError as err:
+        return None, err.messages
+
+def validate_session_move_input(data):
+    """Validate a move in a server-side game."""
     try:
-        return schema.load(data), None
+        return session_move_schema.load(data), None
     except ValidationError as err:
-        return None, err.messages
\ No newline at end of file
+        return None, err.messages
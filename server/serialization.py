@@ -0,0 +1,96 @@
+"""Request and response encodings for the API.
+
+JSON uses orjson when it is installed and the standard library otherwise.
+msgpack is offered as a compact binary alternative when the msgpack package
+is installed. Clients choose it with ``Accept: application/msgpack`` and may
+send msgpack bodies with the matching ``Content-Type``.
+"""
+import json
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Media types accepted as msgpack; application/x-msgpack is the older, still common name
+MSGPACK_TYPES = frozenset((MSGPACK, "application/x-msgpack"))
+
+# Response media types in order of preference when the client rates them equally
+SUPPORTED_TYPES: Tuple[str, ...] = (JSON, MSGPACK) if msgpack is not None else (JSON,)
+
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Encode an object as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads_json(data) -> Any:
+    """Decode JSON from bytes or str; raises ValueError on malformed input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, media_type: str = JSON) -> bytes:
+    """Encode an object in a supported media type."""
+    if media_type in MSGPACK_TYPES and msgpack is not None:
+        return msgpack.packb(obj)
+    return dumps_json(obj)
+
+
+def loads(data: bytes, media_type: Optional[str] = JSON) -> Any:
+    """Decode a request body; raises ValueError if it is malformed or the type is unsupported."""
+    if media_type in MSGPACK_TYPES:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        try:
+            return msgpack.unpackb(data, strict_map_key=False)
+        except Exception as e:
+            raise ValueError(f"Invalid msgpack data: {e}") from e
+    return loads_json(data)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response media type for an Accept header, defaulting to JSON.
+
+    Supported types are ranked by q-value, then by whether they were named
+    explicitly rather than matched by a wildcard; wildcards mean JSON.
+    """
+    if not accept:
+        return JSON
+    best, best_rank = JSON, (0.0, 0)
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_TYPES and MSGPACK in SUPPORTED_TYPES:
+            candidate, rank = MSGPACK, (q, 1)
+        elif media_type == JSON:
+            candidate, rank = JSON, (q, 1)
+        elif media_type in ("application/*", "*/*"):
+            candidate, rank = JSON, (q, 0)
+        else:
+            continue
+        if q > 0 and rank > best_rank:
+            best, best_rank = candidate, rank
+    return best
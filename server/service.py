@@ -0,0 +1,130 @@
+"""Move resolution shared by the WSGI (Flask) and ASGI apps."""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config.config import Config, logger
+from game import TicTacToeGame
+from request_log import bind, phase
+from solved_table import load_solved_table
+
+
+class GameService:
+    """Engines per board variant, the optional search pool and the /move logic."""
+
+    def __init__(self, search_workers: Optional[int] = None):
+        self.game = TicTacToeGame()
+        solved_table = load_solved_table(Config.SOLVED_TABLE_PATH)
+        if solved_table is not None and solved_table.algorithm != self.game.search_algorithm:
+            logger.warning("Ignoring solved table built with %s, engine uses %s",
+                           solved_table.algorithm, self.game.search_algorithm)
+            solved_table = None
+        self.game.solved_table = solved_table
+        self.games = {(self.game.dim, self.game.win_length): self.game}
+        self._games_lock = threading.Lock()
+
+        self.search_executor = None
+        if search_workers is None:
+            search_workers = Config.SEARCH_EXECUTOR_WORKERS
+        if search_workers > 0:
+            from executor import SearchExecutor
+            self.search_executor = SearchExecutor(
+                max_workers=search_workers,
+                max_pending=Config.SEARCH_EXECUTOR_MAX_PENDING,
+                task_timeout=Config.SEARCH_EXECUTOR_TASK_TIMEOUT,
+                cost_threshold=Config.SEARCH_EXECUTOR_COST_THRESHOLD,
+                fallback_budget=Config.SEARCH_EXECUTOR_FALLBACK_BUDGET,
+            )
+
+    def get_game(self, size: int, win_length: int) -> TicTacToeGame:
+        """Return the engine for a board variant, creating it on first use."""
+        key = (size, win_length)
+        game = self.games.get(key)
+        if game is None:
+            # Concurrent first requests for a variant must share one engine and its tables
+            with self._games_lock:
+                game = self.games.get(key)
+                if game is None:
+                    game = self.games[key] = TicTacToeGame(dim=size, win_length=win_length)
+        return game
+
+    def search_cost(self, data: Dict) -> float:
+        """Estimated seconds of search a validated move request will need."""
+        return self.get_game(data["size"], data["win_length"]).estimated_search_cost(data["board"])
+
+    def computer_move(self, game: TicTacToeGame, board: List[Optional[str]]) -> Optional[int]:
+        """Pick the computer's reply, through the search pool when one is configured."""
+        with phase("search"):
+            if self.search_executor is not None:
+                move, nodes = self.search_executor.search(game, board)
+            else:
+                move = game.get_computer_move(board)
+                nodes = game.nodes_searched
+        bind(nodes=nodes)
+        return move
+
+    def resolve_move(self, data: Dict) -> Tuple[Dict, int]:
+        """Apply a validated human move and the computer reply.
+
+        Returns the response body and HTTP status code.
+        """
+        board = data["board"]
+        index = data["index"]
+        active_game = self.get_game(data["size"], data["win_length"])
+        bind(index=index, size=data["size"])
+
+        with phase("human_move"):
+            body, status_code = self._human_move(active_game, board, index)
+        if body is None:
+            body = self._computer_reply(active_game, board)
+        if status_code == 200:
+            bind(result=body["status"])
+        return body, status_code
+
+    def _human_move(self, game: TicTacToeGame, board: List[Optional[str]],
+                    index: int) -> Tuple[Optional[Dict], int]:
+        """Play the human move; returns a body only when the request ends here.
+
+        Board length, cells and the index were checked with the request
+        (schemas.py); the board must still not be won already.
+        """
+        # Wins are detected from the last move only, so a board must not arrive finished
+        if game.is_won(board):
+            logger.warning("Game is already over")
+            bind(error="invalid_move")
+            return {"error": "Game is already over"}, 400
+
+        # Human move
+        board[index] = 'X'
+        logger.info("Human player moved to position %d", index)
+
+        if game.is_winning_move(board, index, 'X'):
+            logger.info("Human player wins")
+            return {"board": board, "status": "X_wins"}, 200
+
+        if game.is_full(board):
+            logger.info("Game ended in draw after human move")
+            return {"board": board, "status": "draw"}, 200
+        return None, 200
+
+    def _computer_reply(self, game: TicTacToeGame, board: List[Optional[str]]) -> Dict:
+        """Play the computer's reply and return the response body."""
+        comp_move = self.computer_move(game, board)
+        if comp_move is not None:
+            board[comp_move] = 'O'
+            logger.info("Computer moved to position %d", comp_move)
+
+            if game.is_winning_move(board, comp_move, 'O'):
+                logger.info("Computer wins")
+                return {"board": board, "status": "O_wins"}
+
+            if game.is_full(board):
+                logger.info("Game ended in draw after computer move")
+                return {"board": board, "status": "draw"}
+
+        logger.info("Game continues")
+        return {"board": board, "status": "in_progress"}
+
+    def shutdown(self) -> None:
+        """Stop the search pool, if any."""
+        if self.search_executor is not None:
+            self.search_executor.shutdown()
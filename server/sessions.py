@@ -0,0 +1,156 @@
+"""Server-side game sessions.
+
+A session holds the authoritative board of one game under a random
+``game_id``, so clients only send move indexes. Sessions are plain dicts
+(``board``, ``size``, ``win_length``, ``status``) kept either in process
+memory or in Redis, both with a TTL that is refreshed on every access.
+A move is saved with ``replace``, which only succeeds if the session still
+holds the state the move was computed from, so of two concurrent moves on
+one game the second is refused rather than overwriting the first.
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config.config import logger
+from serialization import dumps_json, loads_json
+
+
+def new_game_id() -> str:
+    """Return an unguessable game id."""
+    return secrets.token_urlsafe(16)
+
+
+class MemorySessionStore:
+    """In-process session store with a TTL and LRU eviction."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, game_id: str) -> Optional[Dict]:
+        """Return a copy of the session, or None if it is unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is None:
+                return None
+            expires_at, state = entry
+            if expires_at <= now:
+                del self._entries[game_id]
+                self.expirations += 1
+                return None
+            self._entries[game_id] = (now + self.ttl, state)
+            self._entries.move_to_end(game_id)
+        return dict(state, board=list(state["board"]))
+
+    def put(self, game_id: str, state: Dict) -> None:
+        """Store a session, evicting the least recently used one when full."""
+        if self.max_size <= 0:
+            return
+        state = dict(state, board=list(state["board"]))
+        with self._lock:
+            self._entries[game_id] = (time.monotonic() + self.ttl, state)
+            self._entries.move_to_end(game_id)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def replace(self, game_id: str, expected: Dict, state: Dict) -> bool:
+        """Store ``state`` only if the session still equals ``expected``; return whether it did."""
+        state = dict(state, board=list(state["board"]))
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is None or entry[0] <= time.monotonic() or entry[1] != expected:
+                return False
+            self._entries[game_id] = (time.monotonic() + self.ttl, state)
+            self._entries.move_to_end(game_id)
+        return True
+
+    def delete(self, game_id: str) -> None:
+        """Drop a session if it exists."""
+        with self._lock:
+            self._entries.pop(game_id, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Return size and eviction counters for monitoring."""
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class RedisSessionStore:
+    """Redis session store shared by every worker.
+
+    Keys expire after ``ttl`` seconds without access; LRU eviction under
+    memory pressure comes from the server's ``maxmemory-policy allkeys-lru``.
+    """
+
+    def __init__(self, client, ttl: float = 3600, prefix: str = "game:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, game_id: str) -> Optional[Dict]:
+        """Return the session and refresh its TTL, or None if it is unknown or expired."""
+        payload = self.client.getex(self.prefix + game_id, ex=self.ttl)
+        if payload is None:
+            return None
+        return loads_json(payload)
+
+    def put(self, game_id: str, state: Dict) -> None:
+        """Store a session with a fresh TTL."""
+        self.client.set(self.prefix + game_id, dumps_json(state), ex=self.ttl)
+
+    def replace(self, game_id: str, expected: Dict, state: Dict) -> bool:
+        """Store ``state`` only if the session still equals ``expected``; return whether it did.
+
+        The key is WATCHed while it is compared, so a write by another worker
+        in between makes the MULTI/EXEC fail instead of being overwritten.
+        """
+        from redis.exceptions import WatchError
+        key = self.prefix + game_id
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                payload = pipe.get(key)
+                if payload is None or loads_json(payload) != expected:
+                    return False
+                pipe.multi()
+                pipe.set(key, dumps_json(state), ex=self.ttl)
+                pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    def delete(self, game_id: str) -> None:
+        """Drop a session if it exists."""
+        self.client.delete(self.prefix + game_id)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the store settings for monitoring."""
+        return {"backend": "redis", "ttl": self.ttl}
+
+
+def create_session_store(url: Optional[str] = None, max_size: int = 10000, ttl: float = 3600):
+    """Return a Redis store for a redis:// URL, or an in-process store otherwise."""
+    if url:
+        # Imported here so in-memory deployments never load the client
+        try:
+            import redis
+        except ImportError:
+            logger.warning("redis is not installed, keeping game sessions in memory")
+        else:
+            return RedisSessionStore(redis.Redis.from_url(url), ttl=ttl)
+    return MemorySessionStore(max_size=max_size, ttl=ttl)
@@ -0,0 +1,196 @@
+"""Precomputed perfect-play table for the 3x3 game.
+
+Every position the computer can face in a real game (human moves first, no
+winner yet, board not full) is enumerated once and stored with the reply
+``TicTacToeGame.get_computer_move`` would choose and its search score.
+
+Artifact layout (little-endian):
+
+    magic     4 bytes   b"TTTS"
+    version   1 byte
+    algorithm 1 byte    search algorithm the table was built with (0=minimax, 1=alphabeta)
+    cells     1 byte    cells per board (9)
+    reserved  1 byte
+    slots     4 bytes   3 ** cells records
+    count     4 bytes   records holding a position
+    sha256   32 bytes   digest of the records
+    records   slots * 2 bytes: move (int8, -1 if the slot is empty), score (int8)
+
+The record of a board is at the board's base-3 key (empty=0, X=1, O=2), a
+perfect hash, so a lookup reads two bytes at a computed offset. The file is
+memory-mapped read-only: every worker process on a host shares the same page
+cache copy instead of holding a private one, and nothing is deserialized.
+
+Rebuild with ``python solved_table.py``; the file is replaced atomically, so
+running workers keep reading the table they mapped.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+from typing import List, Optional, Tuple
+
+from config.config import Config, logger
+
+MAGIC = b"TTTS"
+VERSION = 3
+ALGORITHMS = ('minimax', 'alphabeta')
+HEADER = struct.Struct("<4sBBBxII32s")
+RECORD = struct.Struct("<bb")
+CELLS = 9
+SLOTS = 3 ** CELLS
+EMPTY_MOVE = -1
+CELL_CODES = {None: 0, 'X': 1, 'O': 2}
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'solved_table.bin')
+
+
+def encode_board(board: List[Optional[str]]) -> Optional[int]:
+    """Encode a 9-cell board as a base-3 integer, or None if it is not encodable."""
+    if len(board) != 9:
+        return None
+    key = 0
+    try:
+        for cell in reversed(board):
+            key = key * 3 + CELL_CODES[cell]
+    except (KeyError, TypeError):
+        return None
+    return key
+
+
+class SolvedTable:
+    """Read-only view of the solved-game records, usually over a memory-mapped file."""
+
+    def __init__(self, records: memoryview, count: int, checksum: str, algorithm: str = 'minimax'):
+        # Signed bytes: records[2 * key] is the move, records[2 * key + 1] the score
+        self.records = records
+        self.count = count
+        self.checksum = checksum
+        self.algorithm = algorithm
+
+    def lookup(self, board: List[Optional[str]]) -> Optional[Tuple[int, int]]:
+        """Return ``(best_move, score)`` for a board, or None if it is not in the table."""
+        key = encode_board(board)
+        if key is None:
+            return None
+        offset = key * RECORD.size
+        move = self.records[offset]
+        if move == EMPTY_MOVE:
+            return None
+        return move, self.records[offset + 1]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def enumerate_positions() -> List[List[Optional[str]]]:
+    """Return every reachable, unfinished position with the computer to move."""
+    from game import TicTacToeGame
+
+    game = TicTacToeGame()
+    positions = []
+    seen = set()
+    stack = [[None] * 9]
+
+    while stack:
+        board = stack.pop()
+        key = encode_board(board)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if game.check_winner(board, 'X') or game.check_winner(board, 'O'):
+            continue
+        moves = game.get_available_moves(board)
+        if not moves:
+            continue
+
+        human_to_move = board.count('X') == board.count('O')
+        if not human_to_move:
+            positions.append(board)
+        symbol = 'X' if human_to_move else 'O'
+        for move in moves:
+            stack.append(game.make_move(board, move, symbol))
+
+    positions.sort(key=encode_board)
+    return positions
+
+
+def build_table(algorithm: str = 'minimax') -> bytes:
+    """Solve every position with the given search algorithm and return the serialized artifact."""
+    from game import TicTacToeGame
+
+    game = TicTacToeGame(search_algorithm=algorithm)
+    score_position = game.alphabeta if algorithm == 'alphabeta' else game.minimax
+    records = bytearray(RECORD.pack(EMPTY_MOVE, 0) * SLOTS)
+    positions = enumerate_positions()
+    for board in positions:
+        move = game.get_computer_move(board)
+        score = score_position(game.make_move(board, move, 'O'), False)
+        RECORD.pack_into(records, encode_board(board) * RECORD.size, move, score)
+
+    digest = hashlib.sha256(records).digest()
+    header = HEADER.pack(MAGIC, VERSION, ALGORITHMS.index(algorithm), CELLS, SLOTS, len(positions), digest)
+    return header + bytes(records)
+
+
+def parse_table(data) -> SolvedTable:
+    """Verify a serialized artifact (bytes or a mmap) and return a view over its records."""
+    if len(data) < HEADER.size:
+        raise ValueError("Solved table truncated")
+
+    magic, version, algorithm, cells, slots, count, digest = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a solved table file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported solved table version: {version}")
+    if algorithm >= len(ALGORITHMS):
+        raise ValueError(f"Unknown solved table algorithm: {algorithm}")
+    if cells != CELLS or slots != SLOTS:
+        raise ValueError(f"Solved table for {cells} cells, expected {CELLS}")
+
+    records = memoryview(data)[HEADER.size:]
+    if len(records) != slots * RECORD.size:
+        raise ValueError("Solved table size mismatch")
+    if hashlib.sha256(records).digest() != digest:
+        raise ValueError("Solved table checksum mismatch")
+
+    return SolvedTable(records.cast('b'), count, digest.hex(), ALGORITHMS[algorithm])
+
+
+def load_solved_table(path: str = DEFAULT_PATH) -> Optional[SolvedTable]:
+    """Memory-map and verify the artifact, returning None if it is missing or corrupt."""
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        table = parse_table(data)
+    except (OSError, ValueError) as e:
+        logger.warning("Solved table unavailable, falling back to search: %s", e)
+        return None
+
+    logger.info("Mapped solved table with %d positions from %s", len(table), path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the solved-game move table.")
+    parser.add_argument('--output', default=DEFAULT_PATH, help="Artifact path")
+    parser.add_argument('--algorithm', default=Config.SEARCH_ALGORITHM, choices=ALGORITHMS,
+                        help="Search algorithm whose replies are recorded")
+    args = parser.parse_args()
+
+    data = build_table(args.algorithm)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    # Write a new file and rename it over the old one: workers that mapped the
+    # old file keep a consistent view instead of seeing it rewritten in place
+    tmp_path = args.output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, args.output)
+    table = parse_table(data)
+    print(f"Wrote {len(table)} {table.algorithm} positions ({len(data)} bytes) to {args.output}")
+    print(f"sha256: {table.checksum}")
+
+
+if __name__ == "__main__":
+    main()
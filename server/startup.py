@@ -0,0 +1,93 @@
+"""Startup timing.
+
+The app factories time each step of building an app (imports, config,
+integrations, game service, ...) in a ``StartupProfile``; the result is part
+of the ``/health`` checks as ``startup``. Run this module to profile a cold
+start from the command line::
+
+    python startup.py                 # time each create_app() step
+    python startup.py --imports 15    # also list the 15 slowest imports
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+
+class StartupProfile:
+    """Wall-clock milliseconds of the named steps of one app startup."""
+
+    def __init__(self):
+        self.steps_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to step ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.steps_ms[name] = round(self.steps_ms.get(name, 0.0) + elapsed, 3)
+
+    def as_dict(self) -> Dict:
+        """Return the total and per-step times."""
+        return {"total_ms": round(sum(self.steps_ms.values()), 3), "steps_ms": dict(self.steps_ms)}
+
+
+def slowest_imports(statement: str = "import main; main.app", limit: int = 15) -> List[Tuple[str, int]]:
+    """Run ``statement`` under ``-X importtime`` in a fresh interpreter.
+
+    Returns ``(package, cumulative_us)`` for the ``limit`` slowest third-party
+    and standard library packages, i.e. the imports worth deferring. Modules
+    of this app are left out since they include the packages they import.
+    """
+    server_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=server_dir, capture_output=True, text=True, check=True)
+    lines = result.stderr.splitlines()
+    # Interpreter startup (site and whatever .pth files load) comes before the statement
+    site = [i for i, line in enumerate(lines) if line.endswith("| site")]
+    packages: Dict[str, int] = {}
+    for line in lines[site[-1] + 1 if site else 0:]:
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        package = fields[2].strip().split(".")[0]
+        if os.path.exists(os.path.join(server_dir, package + ".py")) or \
+                os.path.isdir(os.path.join(server_dir, package)):
+            continue
+        # The outermost import of a package has the largest cumulative time
+        packages[package] = max(packages.get(package, 0), int(fields[1]))
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the startup of the Flask app")
+    parser.add_argument("--config", default=None, help="config name passed to create_app (default: FLASK_ENV)")
+    parser.add_argument("--imports", type=int, default=0, metavar="N",
+                        help="also list the N slowest imports of a cold 'import main; main.app'")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    from main import create_app
+    imported = (time.perf_counter() - started) * 1000
+    app = create_app(args.config, search_workers=0)
+    profile = app.extensions['startup'].as_dict()
+    app.extensions['health_monitor'].stop()
+
+    print(f"import main       {imported:9.1f} ms")
+    for name, ms in profile["steps_ms"].items():
+        print(f"  {name:<15} {ms:9.1f} ms")
+    print(f"create_app        {profile['total_ms']:9.1f} ms")
+    if args.imports:
+        print(f"\nSlowest imports (cumulative, mode {os.getenv('STARTUP_MODE', 'eager')}):")
+        for name, us in slowest_imports(limit=args.imports):
+            print(f"  {name:<30} {us / 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
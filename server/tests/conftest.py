@@ -1,6 +1,7 @@
 import pytest
 import logging
 import tempfile
+import time
 import os
 
 # Configure logging for tests
@@ -31,6 +32,105 @@ def client():
     with app.test_client() as client:
         yield client
 
+class LocalRedis:
+    """Local stand-in for the Redis commands the session store and rate limiter use."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.versions = {}
+        self.round_trips = 0
+        self.down = False
+
+    def _live(self, name):
+        if name in self.expiry and self.expiry[name] <= time.monotonic():
+            self.delete(name)
+        return self.data.get(name)
+
+    def _write(self, name, value):
+        self.data[name] = value
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def set(self, name, value, ex=None):
+        self._write(name, value.encode() if isinstance(value, str) else value)
+        self.expire(name, ex)
+
+    def get(self, name):
+        value = self._live(name)
+        return value if value is None or isinstance(value, bytes) else str(value).encode()
+
+    def getex(self, name, ex=None):
+        value = self.get(name)
+        if value is not None:
+            self.expire(name, ex)
+        return value
+
+    def incrby(self, name, amount):
+        self._write(name, (self._live(name) or 0) + amount)
+        return self.data[name]
+
+    def expire(self, name, seconds):
+        if seconds is not None and name in self.data:
+            self.expiry[name] = time.monotonic() + seconds
+        return name in self.data
+
+    def delete(self, name):
+        self.data.pop(name, None)
+        self.expiry.pop(name, None)
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def pipeline(self, transaction=True):
+        return LocalPipeline(self)
+
+class LocalPipeline:
+    """Queues commands and runs them against LocalRedis on execute().
+
+    Like redis-py, commands after watch() run immediately until multi(), and
+    execute() raises WatchError if a watched key was written since.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+        self.watched = {}
+        self.immediate = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, command):
+        method = getattr(self.redis, command)
+
+        def run_or_queue(*args, **kwargs):
+            if self.immediate:
+                return method(*args, **kwargs)
+            self.commands.append((method, args, kwargs))
+        return run_or_queue
+
+    def watch(self, name):
+        self.watched[name] = self.redis.versions.get(name, 0)
+        self.immediate = True
+
+    def multi(self):
+        self.immediate = False
+
+    def execute(self):
+        from redis.exceptions import WatchError
+        if self.redis.down:
+            raise ConnectionError("redis is down")
+        self.redis.round_trips += 1
+        if any(self.redis.versions.get(name, 0) != version for name, version in self.watched.items()):
+            raise WatchError(", ".join(self.watched))
+        return [method(*args, **kwargs) for method, args, kwargs in self.commands]
+
+@pytest.fixture
+def local_redis():
+    """Provide an empty local Redis stand-in."""
+    return LocalRedis()
+
 @pytest.fixture
 def game():
     """Create a game instance for testing."""
@@ -44,6 +144,20 @@ def setup_test_environment():
     os.environ['TESTING'] = 'true'
     yield
 
+@pytest.fixture
+def production_env(monkeypatch):
+    """Production settings for apps created in a test, limiting and keeping sessions per process."""
+    import importlib
+    monkeypatch.setenv('FLASK_ENV', 'production')
+    monkeypatch.setenv('SECRET_KEY', 'test-secret')
+    monkeypatch.delenv('TESTING', raising=False)
+    monkeypatch.delenv('_', raising=False)
+    import config.production
+    production = importlib.reload(config.production)
+    monkeypatch.setattr(production.ProductionConfig, 'RATELIMIT_STORAGE_URL', 'memory://')
+    monkeypatch.setattr(production.ProductionConfig, 'SESSION_STORE_URL', '')
+    yield
+
 @pytest.fixture
 def empty_board():
     """Provide an empty 3x3 game board."""
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import pytest
+from asgi import MAX_BODY_BYTES, create_asgi_app
+
+@pytest.fixture(scope="module")
+def asgi_app():
+    """Create one ASGI app for the module."""
+    return create_asgi_app('testing', search_workers=0, max_threads=2)
+
+def call(app, method, path, body=None, headers=()):
+    """Run one HTTP request through an ASGI app and return (status, headers, json body)."""
+    payload = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b""
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    status = sent[0]["status"]
+    response_headers = dict(sent[0]["headers"])
+    content = b"".join(message.get("body", b"") for message in sent[1:])
+    return status, response_headers, json.loads(content) if content else None
+
+class TestASGIApp:
+    """Test cases for the ASGI app's /health and /move contract."""
+
+    def test_health(self, asgi_app):
+        """Test that the health check reports healthy."""
+        status, _, data = call(asgi_app, "GET", "/health")
+        assert status == 200
+        assert data["status"] == "healthy"
+        assert data["checks"]["game_logic"] == "ok"
+
+    def test_move_matches_flask(self, asgi_app, client):
+        """Test that both apps return the same body for the same move."""
+        request = {"board": ['X', None, None, None, 'O', None, None, None, None], "index": 8}
+        status, headers, data = call(asgi_app, "POST", "/move", request)
+        flask_response = client.post("/move", json=request)
+        assert status == flask_response.status_code == 200
+        assert headers[b"content-type"] == b"application/json"
+        assert data == flask_response.get_json()
+
+    def test_repeat_move_served_from_cache(self, asgi_app):
+        """Test that repeated moves get the cached bytes and headers."""
+        request = {"board": [None, 'X', None, None, 'O', None, None, None, None], "index": 0}
+        _, first, body = call(asgi_app, "POST", "/move", request)
+        _, second, cached = call(asgi_app, "POST", "/move", request)
+        assert second[b"x-cache"] == b"HIT"
+        assert second[b"etag"] == first[b"etag"]
+        assert cached == body
+
+    def test_msgpack_move(self, asgi_app):
+        """Test msgpack request and response bodies."""
+        import msgpack
+        request = msgpack.packb({"board": [None] * 9, "index": 0})
+        headers = [(b"content-type", b"application/msgpack"), (b"accept", b"application/msgpack")]
+        scope = {"type": "http", "method": "POST", "path": "/move", "headers": headers}
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": request, "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(asgi_app(scope, receive, send))
+        assert dict(sent[0]["headers"])[b"content-type"] == b"application/msgpack"
+        assert msgpack.unpackb(sent[1]["body"])["board"][0] == 'X'
+
+    def test_large_board_move_runs_in_thread(self, asgi_app):
+        """Test that a 4x4 move is answered through the search thread pool."""
+        request = {"board": [None] * 16, "index": 0, "size": 4}
+        status, _, data = call(asgi_app, "POST", "/move", request)
+        assert status == 200
+        assert data["board"][0] == 'X'
+        assert data["board"].count('O') == 1
+
+    def test_validation_errors(self, asgi_app):
+        """Test that invalid requests get the same errors as the Flask app."""
+        assert call(asgi_app, "POST", "/move", {"board": [None] * 9})[0] == 400
+        status, _, data = call(asgi_app, "POST", "/move", b"{not json")
+        assert status == 400
+        assert data["error"] == "Invalid JSON data"
+        status, _, data = call(asgi_app, "POST", "/move", {"board": ['X'] + [None] * 8, "index": 0})
+        assert status == 400
+        assert data["details"] == {"index": ["Position 0 already occupied"]}
+
+    def test_body_size_limit(self, asgi_app):
+        """Test that oversized bodies are rejected."""
+        assert call(asgi_app, "POST", "/move", b" " * (MAX_BODY_BYTES + 1))[0] == 413
+
+    def test_unknown_route_and_method(self, asgi_app):
+        """Test 404 and 405 responses."""
+        assert call(asgi_app, "GET", "/nope")[0] == 404
+        status, headers, _ = call(asgi_app, "GET", "/move")
+        assert status == 405
+        assert headers[b"allow"] == b"POST"
+
+    def test_cors_for_allowed_origin(self, asgi_app):
+        """Test that allowed origins get CORS headers and others do not."""
+        from config.config import Config
+        origin = Config.get_config().ALLOWED_ORIGINS[0].encode()
+        _, headers, _ = call(asgi_app, "GET", "/health", headers=[(b"origin", origin)])
+        assert headers[b"access-control-allow-origin"] == origin
+        _, headers, _ = call(asgi_app, "GET", "/health", headers=[(b"origin", b"https://evil.example")])
+        assert b"access-control-allow-origin" not in headers
+        status, headers, _ = call(asgi_app, "OPTIONS", "/move", headers=[(b"origin", origin)])
+        assert status == 204
+        assert b"POST" in headers[b"access-control-allow-methods"]
+
+def websocket_session(app, messages, headers=(), path="/ws"):
+    """Run a scripted WebSocket connection and return what the app sent."""
+    scope = {"type": "websocket", "path": path, "headers": list(headers)}
+    incoming = [{"type": "websocket.connect"}]
+    incoming += [{"type": "websocket.receive", "text": m if isinstance(m, str) else json.dumps(m)} for m in messages]
+    incoming.append({"type": "websocket.disconnect", "code": 1000})
+    sent = []
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+def replies(sent):
+    """Decode the JSON messages a WebSocket session sent."""
+    return [json.loads(m["text"]) for m in sent if m["type"] == "websocket.send"]
+
+class TestGameChannel:
+    """Test cases for the /ws game channel."""
+
+    def test_initial_state(self, asgi_app):
+        """Test that a connection starts with an empty 3x3 game."""
+        sent = websocket_session(asgi_app, [])
+        assert sent[0]["type"] == "websocket.accept"
+        assert replies(sent) == [{"board": [None] * 9, "size": 3, "win_length": 3, "status": "in_progress"}]
+
+    def test_moves_keep_state(self, asgi_app, client):
+        """Test that each move is applied to the board held for the connection."""
+        indexes = [0, 1, 2, 3, 5, 6, 7, 8]
+        results = replies(websocket_session(asgi_app, [{"index": i} for i in indexes]))[1:]
+
+        board, status = [None] * 9, "in_progress"
+        for index, result in zip(indexes, results):
+            if status != "in_progress":
+                assert result == {"error": "Game is already over", "status": status}
+                continue
+            expected = client.post("/move", json={"board": board, "index": index}).get_json()
+            assert result == expected
+            if "error" not in expected:
+                board, status = expected["board"], expected["status"]
+        assert status != "in_progress"
+
+    def test_replies_match_move_endpoint(self, asgi_app, client):
+        """Test that replies carry the same status values as /move."""
+        reply = replies(websocket_session(asgi_app, [{"index": 4}]))[1]
+        single = client.post("/move", json={"board": [None] * 9, "index": 4}).get_json()
+        assert reply == single
+
+    def test_new_game(self, asgi_app):
+        """Test that a new game can be started on another board size."""
+        results = replies(websocket_session(asgi_app, [{"index": 4}, {"action": "new", "size": 4},
+                                                       {"action": "new", "size": 7}]))
+        assert results[2] == {"board": [None] * 16, "size": 4, "win_length": 4, "status": "in_progress"}
+        assert results[3]["error"] == "Invalid input"
+
+    def test_errors_keep_connection_open(self, asgi_app):
+        """Test that bad messages get error replies without closing the channel."""
+        results = replies(websocket_session(asgi_app, ["{bad", {"index": 99}, {"foo": 1}, {"index": 4}]))
+        assert results[1] == {"error": "Invalid JSON data"}
+        assert results[2]["details"] == {"index": ["Invalid move index: 99"]}
+        assert results[3]["error"] == "Invalid input"
+        assert results[4]["status"] == "in_progress"
+
+    def test_disallowed_origin_rejected(self, asgi_app):
+        """Test that connections from other origins are closed before accept."""
+        sent = websocket_session(asgi_app, [], headers=[(b"origin", b"https://evil.example")])
+        assert sent == [{"type": "websocket.close", "code": 1008}]
+
+    def test_unknown_websocket_path(self, asgi_app):
+        """Test that other WebSocket paths are refused."""
+        assert websocket_session(asgi_app, [], path="/other")[0]["type"] == "websocket.close"
+
+@pytest.fixture
+def production_app(production_env):
+    """An ASGI app configured for production, limiting each worker on its own."""
+    app = create_asgi_app(search_workers=0, max_threads=1)
+    yield app
+    app.health_monitor.stop()
+
+class TestProductionIntegrations:
+    """Test cases for the rate limits and security headers of a production ASGI app."""
+
+    def test_move_rate_limit(self, production_app):
+        """Test that /move allows 30 requests a minute per client, with rate limit headers."""
+        request = {"board": [None] * 9, "index": 4}
+        statuses = [call(production_app, "POST", "/move", request)[0] for _ in range(30)]
+        assert statuses == [200] * 30
+        status, headers, body = call(production_app, "POST", "/move", request)
+        assert status == 429 and body["error"] == "Rate limit exceeded"
+        assert headers[b"x-ratelimit-limit"] == b"30"
+        assert int(headers[b"retry-after"]) >= 1
+        # Other routes have their own (default) limits
+        assert call(production_app, "GET", "/health")[0] == 200
+
+    def test_websocket_moves_share_the_move_limit(self, production_app):
+        """Test that WebSocket moves take tokens from the /move bucket of the same client."""
+        for _ in range(30):
+            call(production_app, "POST", "/move", {"board": [None] * 9, "index": 4})
+        result = replies(websocket_session(production_app, [{"index": 4}]))[1]
+        assert result["error"] == "Rate limit exceeded"
+
+    def test_security_headers(self, production_app):
+        """Test the headers Talisman adds to the Flask app, with HSTS only over HTTPS."""
+        _, headers, _ = call(production_app, "GET", "/health")
+        assert headers[b"x-frame-options"] == b"SAMEORIGIN"
+        assert headers[b"x-content-type-options"] == b"nosniff"
+        assert b"default-src 'self'" in headers[b"content-security-policy"]
+        assert b"strict-transport-security" not in headers
+        _, headers, _ = call(production_app, "GET", "/health", headers=[(b"x-forwarded-proto", b"https")])
+        assert b"max-age=" in headers[b"strict-transport-security"]
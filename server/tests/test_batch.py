@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from batch import BatchEvaluator, NO_MOVE, encode_boards
+from game import TicTacToeGame
+from solved_table import enumerate_positions
+
+@pytest.fixture(scope="module")
+def evaluator():
+    """Create one evaluator so the move table is built once."""
+    return BatchEvaluator()
+
+class TestEncoding:
+    """Test cases for converting list boards to arrays."""
+
+    def test_encode_boards(self):
+        """Test that symbols map to cell codes."""
+        encoded = encode_boards([['X', 'O', None] + [None] * 6])
+        assert encoded.dtype == np.int8
+        assert encoded.tolist() == [[1, 2, 0, 0, 0, 0, 0, 0, 0]]
+
+    def test_wrong_shape_rejected(self, evaluator):
+        """Test that arrays of the wrong width are rejected."""
+        with pytest.raises(ValueError, match="Expected an"):
+            evaluator.winners(np.zeros((2, 8), dtype=np.int8))
+
+    def test_unknown_cell_codes_rejected(self, evaluator):
+        """Test that codes other than empty, X and O are rejected rather than indexing past the table."""
+        for code in (3, -1):
+            with pytest.raises(ValueError, match="Cell codes"):
+                evaluator.best_moves(np.full((1, 9), code, dtype=np.int8))
+
+class TestBatchEvaluation:
+    """Test cases comparing batch results to the per-board engine."""
+
+    def test_winners_and_draws_match_game(self, evaluator, game, sample_boards):
+        """Test win and draw flags against check_winner and is_draw."""
+        boards = list(sample_boards.values())
+        result = evaluator.evaluate(encode_boards(boards))
+        for i, board in enumerate(boards):
+            assert result["x_wins"][i] == game.check_winner(board, 'X')
+            assert result["o_wins"][i] == game.check_winner(board, 'O')
+            assert result["draw"][i] == game.is_draw(board)
+            assert np.flatnonzero(result["legal_moves"][i]).tolist() == game.get_available_moves(board)
+
+    def test_best_moves_match_game(self, evaluator, game):
+        """Test best moves for every reachable position against get_computer_move."""
+        positions = enumerate_positions()
+        moves = evaluator.best_moves(encode_boards(positions))
+        for board, move in zip(positions, moves):
+            assert move == game.get_computer_move(board)
+
+    def test_move_table_read_from_solved_table(self, monkeypatch):
+        """Test that the move table is copied from the solved table without searching."""
+        evaluator = BatchEvaluator()
+        monkeypatch.setattr(evaluator.game, "get_computer_move", lambda board: pytest.fail("searched"))
+        table = evaluator.move_table()
+        assert (table != NO_MOVE).sum() == len(enumerate_positions())
+
+    def test_move_table_without_solved_table(self, evaluator, monkeypatch):
+        """Test that the reachable positions are searched when no solved table matches the game."""
+        import batch
+        monkeypatch.setattr(batch, "load_solved_table", lambda path: None)
+        assert np.array_equal(BatchEvaluator().move_table(), evaluator.move_table())
+
+    def test_finished_boards_have_no_move(self, evaluator, sample_boards):
+        """Test that won and full boards report NO_MOVE."""
+        boards = [sample_boards['top_row_win'], sample_boards['full_draw_board']]
+        assert evaluator.best_moves(encode_boards(boards)).tolist() == [NO_MOVE, NO_MOVE]
+
+    def test_large_batch(self, evaluator):
+        """Test that a large random batch is evaluated in one call."""
+        rng = np.random.default_rng(7)
+        boards = rng.integers(0, 3, size=(100_000, 9)).astype(np.int8)
+        result = evaluator.evaluate(boards)
+        assert result["best_moves"].shape == (100_000,)
+        assert not (result["draw"] & (result["x_wins"] | result["o_wins"])).any()
+
+    def test_larger_board_falls_back_to_search(self):
+        """Test that 4x4 boards are evaluated with per-board search."""
+        evaluator = BatchEvaluator(TicTacToeGame(dim=4, time_budget=0.05))
+        board = ['X', 'X', 'X', None] + [None] * 12
+        result = evaluator.evaluate(encode_boards([board]))
+        assert result["best_moves"].tolist() == [3]
+        with pytest.raises(ValueError):
+            evaluator.move_table()
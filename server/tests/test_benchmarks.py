@@ -0,0 +1,44 @@
+import json
+
+from benchmarks import suite
+
+
+class TestCompare:
+    """Test cases for checking results against a baseline."""
+
+    def test_statuses(self):
+        """Test that only slowdowns past the threshold count as regressions."""
+        results = {"a": 130.0, "b": 110.0, "c": 70.0, "d": 5.0}
+        baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+        statuses = {name: status for name, _, _, status in suite.compare(results, baseline, 0.25)}
+        assert statuses == {"a": "regressed", "b": "ok", "c": "improved", "d": "new"}
+        assert suite.compare({"a": 130.0}, baseline, 0.5)[0][3] == "ok"
+
+
+class TestSuite:
+    """Test cases for running the suite."""
+
+    def test_cases(self):
+        """Test that every engine call is timed from every position, and /move through the app."""
+        names = set(suite.cases())
+        for func in ("check_winner", "is_draw", "minimax", "get_computer_move"):
+            for position in suite.POSITIONS:
+                assert f"{func}[{position}]" in names
+        assert "/move[cached]" in names
+        # Every benchmark runs without error
+        for func in suite.cases().values():
+            func()
+
+    def test_save_and_fail_on_regression(self, tmp_path, capsys):
+        """Test that a saved baseline passes and a much faster one fails the run."""
+        path = tmp_path / "baseline.json"
+        args = ["check_winner[late]", "--baseline", str(path), "--repeat", "1", "--min-time", "0.001"]
+        assert suite.main(args + ["--save"]) == 0
+        saved = json.loads(path.read_text())
+        assert list(saved["results"]) == ["check_winner[late]"]
+        assert suite.main(args + ["--threshold", "100"]) == 0
+        saved["results"]["check_winner[late]"] /= 1000
+        path.write_text(json.dumps(saved))
+        assert suite.main(args + ["--retries", "1"]) == 1
+        assert "regressed" in capsys.readouterr().err
+        assert suite.main(["no such benchmark", "--baseline", str(path)]) == 2
@@ -0,0 +1,111 @@
+import pytest
+import random
+from bitboard import BitboardEngine, SearchBoard, iter_bits
+from config.config import Config
+from config.board import get_win_patterns
+from transposition import symmetry_permutations
+
+@pytest.fixture
+def engine():
+    """Create a 3x3 bitboard engine."""
+    return BitboardEngine(Config.BOARD_SIZE, Config.WIN_PATTERNS, symmetry_permutations(3))
+
+class TestBitHelpers:
+    """Test cases for bit iteration helpers."""
+
+    def test_iter_bits_ascending(self):
+        """Test that set bits are yielded lowest first."""
+        assert list(iter_bits(0b100101001)) == [0, 3, 5, 8]
+        assert list(iter_bits(0)) == []
+
+class TestConversion:
+    """Test cases for converting between list boards and bitboards."""
+
+    def test_round_trip(self, engine, sample_boards):
+        """Test that conversion to bits and back is lossless."""
+        for board in sample_boards.values():
+            bits = engine.from_board(board)
+            assert bits is not None
+            assert engine.to_board(*bits) == board
+
+    def test_rejects_invalid_boards(self, engine):
+        """Test that unknown symbols and wrong sizes are rejected."""
+        assert engine.from_board([None] * 8) is None
+        assert engine.from_board(['Z'] + [None] * 8) is None
+        assert engine.from_board([1] + [None] * 8) is None
+
+class TestBitboardRules:
+    """Test cases for win, draw and move generation on bitboards."""
+
+    def test_every_pattern_wins(self, engine):
+        """Test that each configured pattern is detected as a win."""
+        for pattern in Config.WIN_PATTERNS:
+            bits = sum(1 << i for i in pattern)
+            assert engine.is_win(bits)
+            assert not engine.is_win(bits & (bits - 1))
+
+    def test_full_and_empty_cells(self, engine, sample_boards):
+        """Test full-board detection and the empty-cell mask."""
+        x_bits, o_bits = engine.from_board(sample_boards['full_draw_board'])
+        assert engine.is_full(x_bits, o_bits)
+        assert engine.empty_cells(x_bits, o_bits) == 0
+
+        x_bits, o_bits = engine.from_board(sample_boards['game_in_progress'])
+        assert list(iter_bits(engine.empty_cells(x_bits, o_bits))) == [1, 2, 3, 5, 6, 7, 8]
+
+    def test_minimax_matches_list_engine(self, engine, game, sample_boards):
+        """Test that the bitboard search scores positions like the list search."""
+        for name in ['game_in_progress', 'many_moves_board', 'computer_about_to_win',
+                     'human_about_to_win_row', 'draw_position']:
+            board = sample_boards[name]
+            bits = engine.from_board(board)
+            for is_maximizing in (True, False):
+                assert engine.minimax(*bits, is_maximizing) == game._minimax(board, is_maximizing)
+
+    def test_canonical_is_symmetry_invariant(self, engine):
+        """Test that all symmetric variants share one canonical key."""
+        board = ['X', 'O', None, None, 'X', None, None, None, None]
+        keys = set()
+        for perm in symmetry_permutations(3):
+            variant = [board[i] for i in perm]
+            keys.add(engine.canonical(*engine.from_board(variant)))
+        assert len(keys) == 1
+
+    def test_canonical_without_symmetries(self):
+        """Test that an engine without symmetries uses the raw encoding."""
+        plain = BitboardEngine(Config.BOARD_SIZE, Config.WIN_PATTERNS)
+        assert plain.canonical(0b1, 0b10) == (0b1 << 9) | 0b10
+
+class TestSearchBoard:
+    """Test cases for the make/unmake search board."""
+
+    @pytest.fixture
+    def gomoku(self):
+        """Create a 15x15 five-in-a-row engine."""
+        return BitboardEngine(225, get_win_patterns(15, 5), dim=15)
+
+    def test_play_tracks_score_and_candidates(self, gomoku):
+        """Test that incremental state matches a full recomputation after every play."""
+        rng = random.Random(7)
+        board = SearchBoard(gomoku)
+        for turn in range(40):
+            cell = rng.choice(list(iter_bits(board.empty_cells())))
+            board.play(cell, turn % 2 == 1)
+            assert board.score == gomoku.evaluate(board.x_bits, board.o_bits)
+            assert board.candidate_moves() == gomoku.candidate_moves(board.x_bits, board.o_bits)
+
+    def test_undo_restores_position(self, gomoku):
+        """Test that undo takes plays back in reverse order."""
+        board = SearchBoard(gomoku, x_bits=1 << 112, o_bits=1 << 113)
+        before = (board.x_bits, board.o_bits, board.score, board.near, list(board.near_counts))
+        for cell, is_o in ((97, False), (127, True), (98, False)):
+            board.play(cell, is_o)
+        for _ in range(3):
+            board.undo()
+        assert (board.x_bits, board.o_bits, board.score, board.near, board.near_counts) == before
+
+    def test_initial_position(self, engine):
+        """Test that a board built from bitboards scores like evaluate."""
+        board = SearchBoard(engine, x_bits=0b000000011, o_bits=0b000010000)
+        assert board.score == engine.evaluate(0b000000011, 0b000010000)
+        assert board.candidate_moves() == engine.candidate_moves(0b000000011, 0b000010000)
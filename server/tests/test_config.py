@@ -124,6 +124,18 @@ class TestConfigurationSelection:
         """Test that production config is returned in production environment."""
         pass
     
+    def test_production_logs_json_to_stdout(self, production_env, monkeypatch):
+        """Test that production logs JSON to stdout without any LOG_* variables set."""
+        monkeypatch.delenv('LOG_FORMAT', raising=False)
+        monkeypatch.delenv('LOG_TO_STDOUT', raising=False)
+        import config.production
+        importlib.reload(config.production)
+        from config.config import Config, log_settings
+        settings = log_settings()
+        assert settings['LOG_TO_STDOUT'] is True
+        assert settings['LOG_FORMAT'] == 'json'
+        assert settings['LOG_MODE'] == Config.LOG_MODE
+
     @patch.dict(os.environ, {'FLASK_ENV': 'development'})
     def test_get_development_config(self):
         """Test that development config is returned in development environment."""
@@ -138,4 +150,47 @@ class TestConfigurationSelection:
         from config.config import Config
         config = Config.get_config()
         assert config.DEBUG is True
-        assert config.TESTING is False
\ No newline at end of file
+        assert config.TESTING is False
+
+
+class TestBoardVariants:
+    """Test cases for generated win patterns and board variants."""
+
+    def test_generated_patterns_match_classic_board(self):
+        """Test that generation reproduces the classic 3x3 patterns in order."""
+        from config.board import generate_win_patterns
+        assert generate_win_patterns(3, 3) == [
+            [0, 1, 2], [3, 4, 5], [6, 7, 8],
+            [0, 3, 6], [1, 4, 7], [2, 5, 8],
+            [0, 4, 8], [2, 4, 6]
+        ]
+
+    @pytest.mark.parametrize("dim,win_length,expected", [
+        (4, 4, 10), (5, 4, 28), (4, 3, 24), (15, 5, 572),
+    ])
+    def test_generated_pattern_counts(self, dim, win_length, expected):
+        """Test the number of lines for larger variants."""
+        from config.board import generate_win_patterns
+        patterns = generate_win_patterns(dim, win_length)
+        assert len(patterns) == expected
+        assert all(len(set(p)) == win_length for p in patterns)
+        assert all(0 <= cell < dim * dim for p in patterns for cell in p)
+
+    def test_invalid_variant_rejected(self):
+        """Test that a win length longer than the board is rejected."""
+        from config.board import generate_win_patterns
+        with pytest.raises(ValueError):
+            generate_win_patterns(3, 4)
+
+    def test_supported_variants_are_indexed(self):
+        """Test that supported variants are generated once at load time."""
+        from config.board import BOARD_VARIANTS, WIN_PATTERN_INDEX, get_win_patterns
+        for variant in BOARD_VARIANTS:
+            assert variant in WIN_PATTERN_INDEX
+            assert get_win_patterns(*variant) is WIN_PATTERN_INDEX[variant]
+
+    def test_default_win_lengths(self):
+        """Test that each supported size has a default win length."""
+        from config.config import Config
+        assert Config.DEFAULT_WIN_LENGTHS == {3: 3, 4: 4, 5: 4, 15: 5}
+        assert Config.BOARD_SIZE == Config.BOARD_DIM ** 2
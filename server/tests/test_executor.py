@@ -0,0 +1,122 @@
+import pytest
+from executor import SearchExecutor
+from game import TicTacToeGame
+
+def make_executor(**overrides):
+    """Build an executor with small test-friendly limits."""
+    settings = dict(max_workers=1, max_pending=2, task_timeout=30.0, cost_threshold=0.05, fallback_budget=0.05)
+    settings.update(overrides)
+    return SearchExecutor(**settings)
+
+@pytest.fixture
+def large_game():
+    """Create a 4x4 game with a short search budget."""
+    return TicTacToeGame(dim=4, win_length=4, time_budget=0.1)
+
+class TestSearchExecutor:
+    """Test cases for offloading computer-move searches."""
+
+    def test_small_boards_search_inline(self, game, sample_boards):
+        """Test that 3x3 searches never reach the pool."""
+        executor = make_executor()
+        board = sample_boards['human_about_to_win_row']
+        assert executor.get_computer_move(game, board) == game.get_computer_move(board)
+        stats = executor.stats()
+        assert stats["inline"] == 1
+        assert stats["submitted"] == 0
+
+    def test_large_board_uses_pool(self, large_game):
+        """Test that an expensive search runs in the pool and returns a legal move."""
+        executor = make_executor()
+        try:
+            board = ['X'] + [None] * 15
+            move = executor.get_computer_move(large_game, board)
+            assert move in large_game.get_available_moves(board)
+            stats = executor.stats()
+            assert stats["submitted"] == 1
+            assert stats["completed"] == 1
+            assert stats["in_flight"] == 0
+            assert stats["avg_wait_ms"] > 0
+        finally:
+            executor.shutdown()
+
+    def test_pool_search_reports_nodes(self, large_game):
+        """Test that a pool search returns the positions searched in the worker."""
+        executor = make_executor()
+        try:
+            move, nodes = executor.search(large_game, ['X'] + [None] * 15)
+            assert move in large_game.get_available_moves(['X'] + [None] * 15)
+            assert nodes > 0
+            assert executor.stats()["submitted"] == 1
+        finally:
+            executor.shutdown()
+
+    def test_pool_takes_winning_move(self, large_game):
+        """Test that the worker result matches the immediate win."""
+        executor = make_executor()
+        try:
+            board = ['O', 'O', 'O', None, 'X', 'X', 'X', None] + [None] * 8
+            assert executor.get_computer_move(large_game, board) == 3
+        finally:
+            executor.shutdown()
+
+    def test_saturated_pool_falls_back_inline(self, large_game):
+        """Test that searches are answered inline when no slot is free."""
+        executor = make_executor(max_pending=0)
+        board = [None] * 16
+        move = executor.get_computer_move(large_game, board)
+        assert move in large_game.get_available_moves(board)
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["submitted"] == 0
+
+    def test_timeout_falls_back_inline(self, large_game):
+        """Test that a search missing its deadline is answered inline."""
+        executor = make_executor(task_timeout=0.001)
+        try:
+            board = [None] * 16
+            move = executor.get_computer_move(large_game, board)
+            assert move in large_game.get_available_moves(board)
+            assert executor.stats()["timeouts"] == 1
+        finally:
+            executor.shutdown()
+
+    def test_counters_from_threads(self, game, sample_boards):
+        """Test that searches from concurrent request threads are all counted."""
+        import threading
+        executor = make_executor()
+        board = sample_boards['human_about_to_win_row']
+
+        def search():
+            for _ in range(200):
+                executor.get_computer_move(game, board)
+
+        threads = [threading.Thread(target=search) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert executor.stats()["inline"] == 800
+
+    def test_estimated_cost(self, game, large_game):
+        """Test that only boards beyond exhaustive search have a cost."""
+        assert game.estimated_search_cost([None] * 9) == 0.0
+        assert large_game.estimated_search_cost([None] * 16) == 0.1
+        assert large_game.estimated_search_cost(['X', 'O'] * 8) == 0.0
+
+class TestSearchExecutorAPI:
+    """Test cases for the executor wired into the app."""
+
+    def test_move_through_executor(self):
+        """Test that /move answers large boards via the pool and /health reports it."""
+        from main import create_app
+        app = create_app('testing', search_workers=1)
+        executor = app.extensions['search_executor']
+        try:
+            with app.test_client() as client:
+                response = client.post('/move', json={'board': [None] * 16, 'index': 0, 'size': 4})
+                assert response.status_code == 200
+                health = client.get('/health').get_json()
+                assert health["checks"]["search_executor"]["submitted"] == 1
+        finally:
+            executor.shutdown()
@@ -777,6 +777,12 @@ class TestTicTacToeGame:
         assert is_valid == False
         assert "already occupied" in error
 
+    def test_validate_move_finished_board(self, game):
+        board = ['X', 'X', 'X', 'O', 'O', None, None, None, None]
+        is_valid, error = game.validate_move(board, 5)
+        assert is_valid == False
+        assert "already over" in error
+
     def test_validate_move_wrong_size(self, game):
         board = [None] * 8
         is_valid, error = game.validate_move(board, 0)
@@ -808,4 +814,241 @@ class TestTicTacToeGame:
     def test_minimax_human_win(self, game):
         board = ['X', 'X', None, 'O', 'O', None, None, None, None]
         score = game.minimax(board, False)
-        assert score == -1
\ No newline at end of file
+        assert score == -1
+
+
+class TestTranspositionCache:
+    """Test cases for memoized minimax search."""
+
+    def test_canonical_key_matches_symmetric_boards(self, game):
+        """Test that rotated and mirrored boards share a canonical key."""
+        corner_boards = [
+            ['X', None, None, None, None, None, None, None, None],
+            [None, None, 'X', None, None, None, None, None, None],
+            [None, None, None, None, None, None, 'X', None, None],
+            [None, None, None, None, None, None, None, None, 'X'],
+        ]
+        keys = {game.canonical_key(board) for board in corner_boards}
+        assert len(keys) == 1
+        assert game.canonical_key([None, 'X'] + [None] * 7) not in keys
+
+    def test_repeated_search_hits_cache(self, game):
+        """Test that a second search is served from the table."""
+        board = ['X', None, None, None, None, None, None, None, None]
+        first = game.get_computer_move(board)
+        misses = game.transposition_table.misses
+
+        second = game.get_computer_move(board)
+        assert first == second
+        assert game.transposition_table.misses == misses
+        assert game.transposition_table.hits > 0
+
+    def test_symmetric_position_hits_cache(self, game):
+        """Test that a mirrored opening reuses the cached subtree."""
+        game.get_computer_move(['X'] + [None] * 8)
+        misses = game.transposition_table.misses
+
+        move = game.get_computer_move([None, None, 'X'] + [None] * 6)
+        assert move == 4
+        assert game.transposition_table.misses == misses
+
+    def test_cached_scores_match_uncached(self, game, sample_boards):
+        """Test that memoization does not change minimax results."""
+        for name in ['empty', 'game_in_progress', 'many_moves_board', 'computer_about_to_win']:
+            board = sample_boards[name]
+            for is_maximizing in (True, False):
+                assert game.minimax(board, is_maximizing) == game._minimax(board, is_maximizing)
+
+class TestAlphaBetaSearch:
+    """Test cases for alpha-beta search with depth-aware scoring."""
+
+    @pytest.fixture
+    def ab_game(self):
+        """Create a game configured for alpha-beta search."""
+        return TicTacToeGame(search_algorithm='alphabeta')
+
+    def test_default_algorithm_from_config(self, game):
+        """Test that the default engine follows configuration."""
+        assert game.search_algorithm == Config.SEARCH_ALGORITHM
+
+    def test_unknown_algorithm_rejected(self):
+        """Test that an unknown algorithm name fails fast."""
+        with pytest.raises(ValueError, match="Unknown search algorithm"):
+            TicTacToeGame(search_algorithm='random')
+
+    def test_move_order_center_corners_edges(self, game):
+        """Test that moves are ordered center, corners, then edges."""
+        assert game.engine.move_order == (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+    def test_prefers_immediate_win(self, game, ab_game):
+        """Test that alpha-beta takes a win now where minimax settles for a slower one."""
+        board = ['O', 'X', None, 'X', 'O', 'X', None, None, None]
+        assert game.get_computer_move(board) == 2
+        assert ab_game.get_computer_move(board) == 8
+
+    def test_prefers_slowest_loss(self, ab_game):
+        """Test that a lost position still blocks the immediate threat."""
+        board = ['X', 'O', None, None, 'X', None, None, None, None]
+        assert ab_game.get_computer_move(board) == 8
+
+    def test_depth_aware_scores(self, ab_game):
+        """Test that scores grow with the number of empty cells left."""
+        assert ab_game.alphabeta(['O', 'O', 'O', 'X', 'X', None, None, None, None], False) == 5
+        assert ab_game.alphabeta(['X', 'X', 'X', 'O', 'O', None, None, None, None], True) == -5
+        assert ab_game.alphabeta(['X', 'O', 'X', 'X', 'O', 'O', 'O', 'X', 'X'], True) == 0
+        assert ab_game.alphabeta([None] * 8, True) is None
+
+    def test_agrees_with_minimax_outcome(self, game, ab_game, sample_boards):
+        """Test that both engines agree on win, draw or loss."""
+        for name in ['empty', 'game_in_progress', 'many_moves_board',
+                     'computer_about_to_win', 'human_about_to_win_row']:
+            board = sample_boards[name]
+            for is_maximizing in (True, False):
+                expected = game.minimax(board, is_maximizing)
+                score = ab_game.alphabeta(board, is_maximizing)
+                assert (score > 0) - (score < 0) == expected
+
+    def test_searches_fewer_nodes(self, game, ab_game):
+        """Test that alpha-beta visits fewer nodes than minimax from the opening."""
+        for board in ([None] * 9, ['X'] + [None] * 8):
+            game.transposition_table.clear()
+            game.get_computer_move(board)
+            ab_game.alphabeta_table.clear()
+            ab_game.get_computer_move(board)
+            assert 0 < ab_game.nodes_searched < game.nodes_searched
+
+    def test_never_loses(self, ab_game):
+        """Test that alpha-beta never loses against any human reply sequence."""
+        def play(board):
+            move = ab_game.get_computer_move(board)
+            if move is None:
+                return
+            board = ab_game.make_move(board, move, 'O')
+            if ab_game.check_winner(board, 'O'):
+                return
+            for reply in ab_game.get_available_moves(board):
+                next_board = ab_game.make_move(board, reply, 'X')
+                assert not ab_game.check_winner(next_board, 'X')
+                play(next_board)
+
+        for first in range(9):
+            play(ab_game.make_move([None] * 9, first, 'X'))
+
+class TestLargeBoards:
+    """Test cases for N x N boards with k-in-a-row and a time budget."""
+
+    def test_variant_parameters(self):
+        """Test that dimension and win length configure the engine."""
+        game = TicTacToeGame(dim=5, win_length=4)
+        assert game.board_size == 25
+        assert len(game.win_patterns) == 28
+        assert game.validate_move([None] * 25, 24) == (True, None)
+        assert game.validate_move([None] * 9, 0)[0] == False
+
+    def test_default_win_length_for_size(self):
+        """Test that the win length defaults from the board size."""
+        assert TicTacToeGame(dim=4).win_length == 4
+        assert TicTacToeGame(dim=15).win_length == 5
+
+    def test_four_in_a_row_detection(self):
+        """Test win detection on a 4x4 board."""
+        game = TicTacToeGame(dim=4)
+        board = [None] * 16
+        for cell in (3, 6, 9, 12):
+            board[cell] = 'O'
+        assert game.check_winner(board, 'O')
+        board[12] = None
+        assert not game.check_winner(board, 'O')
+
+    def test_takes_win_on_4x4(self):
+        """Test that the budgeted search completes a line."""
+        game = TicTacToeGame(dim=4, time_budget=0.2)
+        board = ['X', 'X', None, None,
+                 'O', 'O', 'O', None,
+                 'X', None, None, None,
+                 None, None, None, None]
+        assert game.get_computer_move(board) == 7
+
+    def test_blocks_on_4x4(self):
+        """Test that the budgeted search blocks an immediate threat."""
+        game = TicTacToeGame(dim=4, time_budget=0.2)
+        board = ['X', 'X', 'X', None,
+                 'O', 'O', None, None,
+                 None, None, None, None,
+                 None, None, None, None]
+        assert game.get_computer_move(board) == 3
+
+    def test_gomoku_opening_near_center(self):
+        """Test that the first reply on an empty gomoku board is the center."""
+        game = TicTacToeGame(dim=15, time_budget=0.2)
+        assert game.get_computer_move([None] * 225) == 112
+
+    def test_search_respects_time_budget(self):
+        """Test that the search returns within its budget on a large board."""
+        import time
+        game = TicTacToeGame(dim=5, time_budget=0.1)
+        board = [None] * 25
+        board[12] = 'X'
+        start = time.monotonic()
+        move = game.get_computer_move(board)
+        assert time.monotonic() - start < 0.5
+        assert move is not None and board[move] is None
+        assert game.search_depth >= 1
+
+    def test_list_fallback_restores_board(self, game):
+        """Test that the list search for unencodable boards leaves the board unchanged."""
+        board = ['Z', 'X', None, 'X', 'O', None, None, None, None]
+        snapshot = list(board)
+        assert game.minimax(board, True) in (-1, 0, 1)
+        assert game.get_computer_move(board) == 2
+        assert board == snapshot
+
+class TestWinningMove:
+    """Test cases for last-move win detection."""
+
+    def test_cell_patterns_index(self, game):
+        """Test that each cell maps to the lines through it."""
+        assert len(game.cell_patterns[4]) == 4
+        assert len(game.cell_patterns[0]) == 3
+        assert len(game.cell_patterns[1]) == 2
+        assert all(4 in pattern for pattern in game.cell_patterns[4])
+
+    def test_winning_move_detected(self, game, sample_boards):
+        """Test that the completing piece of each win is detected."""
+        for pattern in Config.WIN_PATTERNS:
+            board = sample_boards['empty'].copy()
+            for cell in pattern:
+                board[cell] = 'X'
+            for cell in pattern:
+                assert game.is_winning_move(board, cell, 'X')
+                assert not game.is_winning_move(board, cell, 'O')
+
+    def test_non_winning_move(self, game, sample_boards):
+        """Test that a move off the completed lines is not a win."""
+        board = sample_boards['game_in_progress']
+        assert not game.is_winning_move(board, 0, 'X')
+        assert not game.is_winning_move(sample_boards['top_row_win'], 3, 'O')
+
+    def test_winning_move_invalid_input(self, game):
+        """Test that bad input is handled gracefully."""
+        assert game.is_winning_move([None] * 2, 8, 'X') == False
+        assert game.is_winning_move(None, 0, 'X') == False
+
+    def test_agrees_with_full_scan(self, game):
+        """Test that last-move detection agrees with check_winner on a larger board."""
+        big = TicTacToeGame(dim=5, win_length=4)
+        board = [None] * 25
+        for cell in (6, 12, 18):
+            board[cell] = 'O'
+        assert not big.check_winner(board, 'O')
+        board[24] = 'O'
+        assert big.is_winning_move(board, 24, 'O') == big.check_winner(board, 'O') == True
+
+    def test_engine_winner_last_move(self, game):
+        """Test the engine's incremental winner check."""
+        engine = game.engine
+        x_bits, o_bits = engine.from_board(['X', 'X', 'X', 'O', 'O', None, None, None, None])
+        assert engine.winner(x_bits, o_bits) == -1
+        assert engine.winner(x_bits, o_bits, 2) == -1
+        assert engine.winner(x_bits, o_bits, 4) == 0
+        assert len(engine.cell_lines[4]) == 4
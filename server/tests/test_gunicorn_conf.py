@@ -0,0 +1,136 @@
+import gc
+import json
+import logging
+import os
+import runpy
+import socket
+import subprocess
+import sys
+import time
+import types
+import urllib.request
+
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONF_PATH = os.path.join(SERVER_DIR, "gunicorn.conf.py")
+
+
+def load_conf():
+    """Execute gunicorn.conf.py as gunicorn does and return its settings and hooks."""
+    return runpy.run_path(CONF_PATH)
+
+
+@pytest.fixture
+def flask_app():
+    """A testing app whose health monitor the hooks act on."""
+    from main import create_app
+    app = create_app('testing', search_workers=0)
+    yield app
+    app.extensions['health_monitor'].stop()
+
+
+class TestSettings:
+    """Test cases for the gunicorn settings."""
+
+    def test_defaults(self, monkeypatch):
+        """Test that workers follow the CPU count and the app is preloaded and recycled."""
+        for name in ("GUNICORN_WORKERS", "GUNICORN_WORKER_CLASS", "GUNICORN_PRELOAD", "GUNICORN_MAX_REQUESTS"):
+            monkeypatch.delenv(name, raising=False)
+        conf = load_conf()
+        assert conf["workers"] == len(os.sched_getaffinity(0))
+        assert conf["worker_class"] == "sync" and conf["threads"] == 1
+        assert conf["preload_app"] is True
+        assert conf["max_requests"] > 0 and conf["max_requests_jitter"] > 0
+
+    def test_environment_overrides(self, monkeypatch):
+        """Test choosing the worker class and count from the environment."""
+        monkeypatch.setenv("GUNICORN_WORKERS", "3")
+        monkeypatch.setenv("GUNICORN_WORKER_CLASS", "gthread")
+        monkeypatch.setenv("GUNICORN_PRELOAD", "false")
+        conf = load_conf()
+        assert conf["workers"] == 3
+        assert conf["worker_class"] == "gthread" and conf["threads"] == 4
+        assert conf["preload_app"] is False
+
+
+class TestHooks:
+    """Test cases for the preload, worker and metrics hooks."""
+
+    def test_master_warms_up_and_workers_start_self_tests(self, flask_app):
+        """Test that when_ready warms the app without a thread and post_worker_init starts one."""
+        conf = load_conf()
+        monitor = flask_app.extensions['health_monitor']
+        server = types.SimpleNamespace(cfg=types.SimpleNamespace(preload_app=True, workers=2),
+                                       app=types.SimpleNamespace(wsgi=lambda: flask_app),
+                                       log=logging.getLogger("test_gunicorn_conf"))
+        try:
+            conf["when_ready"](server)
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
+        assert monitor.warmed_up.is_set()
+        assert not monitor._thread.is_alive()
+        conf["post_worker_init"](types.SimpleNamespace(wsgi=flask_app, cfg=server.cfg, age=1))
+        assert monitor._thread.is_alive()
+
+    def test_memory_sessions_with_several_workers(self, flask_app, caplog):
+        """Test that workers which cannot share game sessions are warned about."""
+        conf = load_conf()
+        log = logging.getLogger("test_gunicorn_conf")
+        worker = types.SimpleNamespace(wsgi=flask_app, age=1, log=log,
+                                       cfg=types.SimpleNamespace(preload_app=False, workers=4))
+        conf["post_worker_init"](worker)
+        assert "SESSION_STORE_URL" in caplog.text
+        caplog.clear()
+        worker.cfg.workers = 1
+        conf["post_worker_init"](worker)
+        assert "SESSION_STORE_URL" not in caplog.text
+
+    def test_multiprocess_directory(self, tmp_path, monkeypatch):
+        """Test that old metric files are removed at start and dead workers' live gauges on exit."""
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        conf = load_conf()
+        (tmp_path / "counter_1.db").write_bytes(b"")
+        server = types.SimpleNamespace(log=logging.getLogger("test_gunicorn_conf"))
+        conf["on_starting"](server)
+        assert list(tmp_path.iterdir()) == []
+        (tmp_path / "gauge_liveall_42.db").write_bytes(b"")
+        (tmp_path / "counter_42.db").write_bytes(b"")
+        conf["child_exit"](server, types.SimpleNamespace(pid=42))
+        assert [path.name for path in tmp_path.iterdir()] == ["counter_42.db"]
+
+
+class TestServer:
+    """Test cases for a real gunicorn server using the configuration."""
+
+    def test_recycled_workers_are_ready(self, tmp_path):
+        """Test that workers forked from the preloaded master serve and report ready after recycling."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        env = dict(os.environ, GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_WORKERS="2",
+                   GUNICORN_MAX_REQUESTS="3", GUNICORN_MAX_REQUESTS_JITTER="0",
+                   PROMETHEUS_MULTIPROC_DIR=str(tmp_path), LOG_TO_STDOUT="true", LOG_LEVEL="ERROR")
+        server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", CONF_PATH, "main:app"],
+                                  cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        url = f"http://127.0.0.1:{port}/health/ready"
+        try:
+            deadline = time.monotonic() + 15
+            while True:
+                try:
+                    urllib.request.urlopen(url, timeout=1).close()
+                    break
+                except OSError:
+                    assert time.monotonic() < deadline, "gunicorn did not start"
+                    time.sleep(0.1)
+            # Enough requests to recycle both workers at least once
+            for _ in range(10):
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    assert response.status == 200
+                    assert json.loads(response.read())["warmed_up"] is True
+        finally:
+            server.terminate()
+            log = server.communicate(timeout=15)[1].decode()
+        assert "Preloaded app warmed up" in log
+        assert log.count("Booting worker") > 2
@@ -0,0 +1,140 @@
+import logging
+import os
+import queue
+
+import pytest
+from config.logs import LazyQueueHandler, SampleFilter, collect_exited_logs, configure_logging
+
+
+@pytest.fixture
+def queued_logger(tmp_path):
+    """A private logger set up in queued mode, writing under tmp_path."""
+    target = logging.getLogger(f"test_logs.{tmp_path.name}")
+    target.propagate = False
+    queued = configure_logging('queued', str(tmp_path / 'app.log'), target=target)
+    yield target, queued
+    queued.stop()
+    target.handlers.clear()
+
+
+def make_record(msg, args, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+class TestQueuedLogging:
+    """Test cases for the queued logging mode."""
+
+    def test_records_written_by_listener(self, queued_logger):
+        """Test that records reach this process's own log file."""
+        target, queued = queued_logger
+        target.info("Human player moved to position %d", 4)
+        target.warning("Input validation failed: %s", {"index": ["bad"]})
+        queued.stop()
+        path = queued.process_path()
+        assert path.endswith(f"app.{os.getpid()}.log")
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert lines[0].endswith("INFO - Human player moved to position 4")
+        assert lines[1].endswith("WARNING - Input validation failed: {'index': ['bad']}")
+
+    def test_formatting_is_deferred(self):
+        """Test that immutable arguments are formatted by the listener, mutable ones immediately."""
+        handler = LazyQueueHandler(queue.Queue())
+        lazy = handler.prepare(make_record("Computer moved to position %d", (5,)))
+        assert lazy.msg == "Computer moved to position %d" and lazy.args == (5,)
+        board = ['X', None]
+        eager = handler.prepare(make_record("Board %s", (board,)))
+        board[1] = 'O'
+        assert eager.getMessage() == "Board ['X', None]"
+
+    def test_full_queue_drops_records(self):
+        """Test that a full queue drops records instead of blocking."""
+        handler = LazyQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(make_record("first", ()))
+        handler.handle(make_record("second", ()))
+        assert handler.dropped == 1
+        assert handler.queue.get_nowait().getMessage() == "first"
+
+    def test_sampling_keeps_warnings(self):
+        """Test that only a fraction of INFO records pass while warnings always do."""
+        sample = SampleFilter(0.25)
+        kept = sum(sample.filter(make_record("info", ())) for _ in range(100))
+        assert kept == 25
+        assert sample.dropped == 75
+        assert all(sample.filter(make_record("warn", (), logging.WARNING)) for _ in range(10))
+
+    def test_forked_child_uses_own_file(self, queued_logger):
+        """Test that a forked worker restarts the listener and writes its own file."""
+        target, queued = queued_logger
+        pid = os.fork()
+        if pid == 0:
+            target.info("from child")
+            queued.stop()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        root, ext = os.path.splitext(queued.path)
+        with open(f"{root}.{pid}{ext}") as f:
+            assert f.read().rstrip().endswith("from child")
+
+    def test_forked_child_starts_listener_on_first_record(self, queued_logger):
+        """Test that a forked child that never logs runs no listener and opens no file."""
+        import threading
+        target, queued = queued_logger
+        pid = os.fork()
+        if pid == 0:
+            listeners = [thread for thread in threading.enumerate() if thread is not threading.current_thread()]
+            os._exit(0 if queued.listener is None and not listeners else 1)
+        assert os.waitpid(pid, 0)[1] == 0
+        root, ext = os.path.splitext(queued.path)
+        assert not os.path.exists(f"{root}.{pid}{ext}")
+
+    def test_stopped_logging_is_freed(self, tmp_path):
+        """Test that nothing but its logger keeps a QueuedLogging alive."""
+        import gc
+        import weakref
+        target = logging.getLogger("test_logs.freed")
+        target.propagate = False
+        queued = configure_logging('queued', str(tmp_path / 'app.log'), target=target)
+        queued.stop()
+        target.handlers.clear()
+        ref = weakref.ref(queued)
+        del queued
+        gc.collect()
+        assert ref() is None
+
+    def test_exited_process_logs_collected(self, tmp_path):
+        """Test that files of exited processes are appended to app.log, oldest first, and removed."""
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+        (tmp_path / f"app.{pid}.log.2").write_text("oldest\n")
+        (tmp_path / f"app.{pid}.log.1").write_text("older\n")
+        (tmp_path / f"app.{pid}.log").write_text("newest\n")
+        live = tmp_path / f"app.{os.getpid()}.log"
+        live.write_text("still writing\n")
+        assert collect_exited_logs(str(tmp_path / "app.log")) == [pid]
+        assert (tmp_path / "app.log").read_text() == "oldest\nolder\nnewest\n"
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["app.log", live.name])
+
+    def test_collected_log_rotated(self, tmp_path):
+        """Test that app.log is rotated once collected files make it exceed max_bytes."""
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+        (tmp_path / "app.log").write_text("x" * 80)
+        (tmp_path / f"app.{pid}.log").write_text("y" * 40)
+        collect_exited_logs(str(tmp_path / "app.log"), max_bytes=100, backup_count=2)
+        assert (tmp_path / "app.log.1").read_text() == "x" * 80 + "y" * 40
+        assert not (tmp_path / "app.log").exists()
+
+    def test_existing_handlers_kept(self, tmp_path):
+        """Test that configure_logging leaves an already configured logger alone."""
+        target = logging.getLogger("test_logs.configured")
+        target.addHandler(logging.NullHandler())
+        try:
+            assert configure_logging('queued', str(tmp_path / 'app.log'), target=target) is None
+            assert len(target.handlers) == 1
+        finally:
+            target.handlers.clear()
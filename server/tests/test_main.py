@@ -1,3 +1,4 @@
+import json
 import pytest
 
 class TestMoveEndpointHTTP:
@@ -64,8 +65,8 @@ class TestInputValidation:
         response = client.post("/move", json={"board": board, "index": 0})
         assert response.status_code == 400
         data = response.get_json()
-        # This passes marshmallow but fails game validation
-        assert "Invalid board size: 2" in data["error"]
+        assert data["error"] == "Invalid input"
+        assert data["details"] == {"board": ["Invalid board size: 2"]}
 
     def test_move_invalid_index_none(self, client):
         """Test move endpoint with None index."""
@@ -83,8 +84,8 @@ class TestInputValidation:
         response = client.post("/move", json={"board": board, "index": -1})
         assert response.status_code == 400
         data = response.get_json()
-        # This passes marshmallow but fails game validation
-        assert "Invalid move index: -1" in data["error"]
+        assert data["error"] == "Invalid input"
+        assert data["details"] == {"index": ["Invalid move index: -1"]}
 
     def test_move_invalid_index_too_large(self, client):
         """Test move endpoint with index too large."""
@@ -92,8 +93,8 @@ class TestInputValidation:
         response = client.post("/move", json={"board": board, "index": 9})
         assert response.status_code == 400
         data = response.get_json()
-        # This passes marshmallow but fails game validation
-        assert "Invalid move index: 9" in data["error"]
+        assert data["error"] == "Invalid input"
+        assert data["details"] == {"index": ["Invalid move index: 9"]}
 
     def test_move_position_occupied(self, client):
         """Test move endpoint with already occupied position."""
@@ -103,8 +104,17 @@ class TestInputValidation:
         response = client.post("/move", json={"board": board, "index": 0})
         assert response.status_code == 400
         data = response.get_json()
-        # This should pass marshmallow validation but fail game validation
-        assert "Position 0 already occupied" in data["error"]
+        assert data["error"] == "Invalid input"
+        assert data["details"] == {"index": ["Position 0 already occupied"]}
+
+    def test_move_finished_board_rejected(self, client):
+        """Test that a board which already has a completed line is rejected."""
+        board = ['O', 'O', 'O',
+                'X', 'X', None,
+                'X', None, None]
+        response = client.post("/move", json={"board": board, "index": 8})
+        assert response.status_code == 400
+        assert "Game is already over" in response.get_json()["error"]
 
     def test_move_invalid_json(self, client):
         """Test move endpoint with invalid JSON."""
@@ -136,6 +146,15 @@ class TestInputValidation:
         assert "index" in data["details"]
 
 
+    def test_move_invalid_cell_value(self, client):
+        """Test that boards with unknown cell values are rejected."""
+        response = client.post("/move", json={"board": ['X', 'Z'] + [None] * 7, "index": 4})
+        data = response.get_json()
+
+        assert response.status_code == 400
+        assert data["error"] == "Invalid input"
+        assert "1" in data["details"]["board"]
+
 class TestErrorHandling:
     """Test cases for HTTP error handling."""
     
@@ -228,4 +247,322 @@ class TestGameIntegration:
         assert response.status_code == 200
         assert data["status"] == "in_progress"
         assert data["board"][1] == 'X'
-        assert data["board"].count('O') == 1  # Computer responded
\ No newline at end of file
+        assert data["board"].count('O') == 1  # Computer responded
+
+class TestBoardVariantsAPI:
+    """Test cases for non-default board sizes through the API."""
+
+    def test_move_on_4x4_board(self, client):
+        """Test that a 4x4 game is played when size is given."""
+        board = [None] * 16
+        response = client.post("/move", json={"board": board, "index": 5, "size": 4})
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert len(data["board"]) == 16
+        assert data["board"][5] == 'X'
+        assert data["board"].count('O') == 1
+        assert data["status"] == "in_progress"
+
+    def test_board_length_must_match_size(self, client):
+        """Test that a 3x3 board is rejected for a 4x4 game."""
+        response = client.post("/move", json={"board": [None] * 9, "index": 0, "size": 4})
+        assert response.status_code == 400
+        assert response.get_json()["details"] == {"board": ["Invalid board size: 9"]}
+
+    def test_index_checked_against_size(self, client):
+        """Test that indices beyond 3x3 are allowed on larger boards only."""
+        response = client.post("/move", json={"board": [None] * 25, "index": 24, "size": 5})
+        assert response.status_code == 200
+
+        response = client.post("/move", json={"board": [None] * 9, "index": 12})
+        assert response.get_json()["details"] == {"index": ["Invalid move index: 12"]}
+
+    def test_unsupported_size(self, client):
+        """Test that unsupported board sizes fail schema validation."""
+        response = client.post("/move", json={"board": [None] * 36, "index": 0, "size": 6})
+        data = response.get_json()
+        assert response.status_code == 400
+        assert data["error"] == "Invalid input"
+        assert "size" in data["details"]
+
+    def test_unsupported_win_length(self, client):
+        """Test that a win length not offered for the size is rejected."""
+        response = client.post("/move", json={"board": [None] * 16, "index": 0, "size": 4, "win_length": 2})
+        data = response.get_json()
+        assert response.status_code == 400
+        assert "win_length" in data["details"]
+
+
+class TestBatchMovesEndpoint:
+    """Test cases for the batch /moves endpoint."""
+
+    def test_resolves_each_item(self, client):
+        """Test that every item gets the same result /move would return."""
+        items = [
+            {"board": [None] * 9, "index": 0},
+            {"board": ['X', 'X', None, 'O', 'O', None, None, None, None], "index": 2},
+            {"board": ['X', 'O', 'X', 'X', 'O', 'O', 'O', 'X', None], "index": 8},
+        ]
+        response = client.post("/moves", json=items)
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert [r["status"] for r in data["results"]] == ["in_progress", "X_wins", "draw"]
+        single = client.post("/move", json={"board": [None] * 9, "index": 0}).get_json()
+        assert data["results"][0] == single
+
+    def test_errors_reported_per_item(self, client):
+        """Test that a bad item does not fail the rest of the batch."""
+        items = [
+            {"board": [None] * 9},
+            {"board": ['X'] + [None] * 8, "index": 0},
+            "not a move",
+            {"board": [None] * 9, "index": 4},
+        ]
+        response = client.post("/moves", json=items)
+        results = response.get_json()["results"]
+
+        assert response.status_code == 200
+        assert len(results) == 4
+        assert results[0]["error"] == "Invalid input"
+        assert "index" in results[0]["details"]
+        assert results[1]["details"] == {"index": ["Position 0 already occupied"]}
+        assert results[2]["error"] == "Invalid input"
+        assert results[3]["status"] == "in_progress"
+
+    def test_mixed_board_sizes(self, client):
+        """Test that items can target different board variants."""
+        items = [
+            {"board": [None] * 9, "index": 4},
+            {"board": [None] * 16, "index": 5, "size": 4},
+        ]
+        results = client.post("/moves", json=items).get_json()["results"]
+        assert len(results[0]["board"]) == 9
+        assert len(results[1]["board"]) == 16
+
+    def test_requires_non_empty_array(self, client):
+        """Test that the body must be a non-empty JSON array."""
+        for body in ({"board": [None] * 9, "index": 0}, []):
+            response = client.post("/moves", json=body)
+            assert response.status_code == 400
+            assert "non-empty array" in response.get_json()["error"]
+
+    def test_invalid_json(self, client):
+        """Test that malformed JSON is rejected."""
+        response = client.post("/moves", data="[", content_type='application/json')
+        assert response.status_code == 400
+        assert "Invalid JSON data" in response.get_json()["error"]
+
+    def test_batch_size_limit(self, client):
+        """Test that oversized batches are rejected."""
+        from config.config import Config
+        items = [{"board": [None] * 9, "index": 0}] * (Config.MAX_BATCH_MOVES + 1)
+        response = client.post("/moves", json=items)
+        assert response.status_code == 400
+        assert "Too many moves" in response.get_json()["error"]
+
+class TestBatchRateLimit:
+    """Test cases for the per-move rate limit of /moves in production."""
+
+    @pytest.fixture
+    def production_client(self, production_env):
+        """A client of a production app with its rate limiter."""
+        from main import create_app
+        app = create_app(search_workers=0)
+        with app.test_client() as client:
+            yield client
+        app.extensions['health_monitor'].stop()
+
+    @pytest.mark.parametrize("content_type", ["application/json", "application/msgpack"])
+    def test_batches_charged_per_move(self, production_client, content_type):
+        """Test that a batch takes one token per move whether it is sent as JSON or msgpack."""
+        import msgpack
+        items = [{"board": [None] * 9, "index": i % 9} for i in range(50)]
+        data = msgpack.packb(items) if content_type == "application/msgpack" else json.dumps(items)
+        statuses = [production_client.post("/moves", data=data, content_type=content_type).status_code
+                    for _ in range(7)]
+        # 300 moves per minute: six batches of 50 fit, the seventh does not
+        assert statuses == [200] * 6 + [429]
+
+
+class TestGameSessions:
+    """Test cases for server-side game sessions."""
+
+    def test_new_game(self, client):
+        """Test that a new game starts with an empty board and an id."""
+        response = client.post("/games")
+        data = response.get_json()
+
+        assert response.status_code == 201
+        assert data["board"] == [None] * 9
+        assert data["status"] == "in_progress"
+        assert data["game_id"]
+
+    def test_move_with_index_only(self, client):
+        """Test that the server applies both moves to the stored board."""
+        game_id = client.post("/games").get_json()["game_id"]
+        response = client.post(f"/games/{game_id}/move", json={"index": 0})
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["board"][0] == 'X'
+        assert data["board"].count('O') == 1
+        assert client.get(f"/games/{game_id}").get_json()["board"] == data["board"]
+
+    def test_concurrent_move_conflicts(self, monkeypatch):
+        """Test that a move computed from a board another move has replaced gets 409 and is not saved."""
+        from main import create_app
+        app = create_app('testing', search_workers=0)
+        sessions = app.extensions['game_sessions']
+        with app.test_client() as client:
+            game_id = client.post("/games").get_json()["game_id"]
+            stale = sessions.get(game_id)
+            board = client.post(f"/games/{game_id}/move", json={"index": 0}).get_json()["board"]
+            # The second move read the game before the first one was saved
+            monkeypatch.setattr(sessions, "get", lambda game_id: dict(stale, board=list(stale["board"])))
+            response = client.post(f"/games/{game_id}/move", json={"index": 8})
+            monkeypatch.undo()
+
+            assert response.status_code == 409
+            assert response.get_json()["error"] == "Game was changed by another move"
+            assert client.get(f"/games/{game_id}").get_json()["board"] == board
+
+    def test_occupied_cell_rejected(self, client):
+        """Test that the stored board is used to validate the index."""
+        game_id = client.post("/games").get_json()["game_id"]
+        board = client.post(f"/games/{game_id}/move", json={"index": 0}).get_json()["board"]
+        computer_cell = board.index('O')
+        response = client.post(f"/games/{game_id}/move", json={"index": computer_cell})
+
+        assert response.status_code == 400
+        assert response.get_json()["details"] == {"index": [f"Position {computer_cell} already occupied"]}
+        assert client.get(f"/games/{game_id}").get_json()["board"] == board
+
+    def test_client_board_is_ignored(self, client):
+        """Test that a board sent with a session move cannot replace the stored one."""
+        game_id = client.post("/games").get_json()["game_id"]
+        forged = ['O'] * 8 + [None]
+        response = client.post(f"/games/{game_id}/move", json={"index": 8, "board": forged})
+
+        assert response.status_code == 400
+        assert client.get(f"/games/{game_id}").get_json()["board"] == [None] * 9
+
+    def test_finished_game_rejects_moves(self, client):
+        """Test that moves after the game ends are refused."""
+        game_id = client.post("/games").get_json()["game_id"]
+        data = {"status": "in_progress"}
+        while data["status"] == "in_progress":
+            board = client.get(f"/games/{game_id}").get_json()["board"]
+            data = client.post(f"/games/{game_id}/move", json={"index": board.index(None)}).get_json()
+        assert data["status"] in ("O_wins", "draw")
+
+        board = client.get(f"/games/{game_id}").get_json()["board"]
+        if None in board:
+            response = client.post(f"/games/{game_id}/move", json={"index": board.index(None)})
+            assert response.status_code == 409
+
+    def test_unknown_game(self, client):
+        """Test that unknown game ids return 404."""
+        assert client.get("/games/nope").status_code == 404
+        assert client.post("/games/nope/move", json={"index": 0}).status_code == 404
+
+    def test_new_game_variant(self, client):
+        """Test that a game can be started on a larger board."""
+        data = client.post("/games", json={"size": 4}).get_json()
+        assert data["board"] == [None] * 16
+        assert data["win_length"] == 4
+        assert client.post("/games", json={"size": 7}).status_code == 400
+
+    def test_session_move_requires_index(self, client):
+        """Test that a session move without an index is rejected."""
+        game_id = client.post("/games").get_json()["game_id"]
+        response = client.post(f"/games/{game_id}/move", json={})
+        assert response.status_code == 400
+
+class TestMoveResponseCache:
+    """Test cases for cached /move responses."""
+
+    @pytest.fixture
+    def fresh_client(self):
+        """Create a client for a new app with an empty response cache."""
+        from main import create_app
+        app = create_app('testing')
+        with app.test_client() as client:
+            yield client
+
+    def test_repeat_is_served_from_cache(self, fresh_client):
+        """Test that a repeated move returns identical bytes with caching headers."""
+        request = {"board": [None] * 9, "index": 0}
+        first = fresh_client.post("/move", json=request)
+        second = fresh_client.post("/move", json=request)
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.get_data() == first.get_data()
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert "max-age" in second.headers["Cache-Control"]
+
+    def test_errors_are_not_cached(self, fresh_client):
+        """Test that rejected moves are validated every time."""
+        request = {"board": ['X'] + [None] * 8, "index": 0}
+        for _ in range(2):
+            response = fresh_client.post("/move", json=request)
+            assert response.status_code == 400
+            assert "X-Cache" not in response.headers
+
+    def test_boolean_index_not_served_from_cache(self, fresh_client):
+        """Test that {"index": true} is rejected even after {"index": 1} was cached."""
+        board = [None] * 9
+        assert fresh_client.post("/move", json={"board": board, "index": 1}).status_code == 200
+        response = fresh_client.post("/move", json={"board": board, "index": True})
+        assert response.status_code == 400
+        assert "Not a valid integer." in str(response.get_json()["details"])
+
+    def test_hit_rate_in_health(self, fresh_client):
+        """Test that cache counters are reported by the health check."""
+        request = {"board": [None] * 9, "index": 4}
+        for _ in range(3):
+            fresh_client.post("/move", json=request)
+        stats = fresh_client.get("/health").get_json()["checks"]["move_cache"]
+        assert stats["hits"] == 2
+        assert stats["size"] == 1
+
+class TestContentNegotiation:
+    """Test cases for msgpack requests and responses."""
+
+    def test_msgpack_response(self, client):
+        """Test that Accept: application/msgpack returns a msgpack body."""
+        import msgpack
+        response = client.post("/move", json={"board": [None] * 9, "index": 2},
+                               headers={"Accept": "application/msgpack"})
+        assert response.status_code == 200
+        assert response.mimetype == "application/msgpack"
+        assert "Accept" in response.headers["Vary"]
+        json_body = client.post("/move", json={"board": [None] * 9, "index": 2}).get_json()
+        assert msgpack.unpackb(response.get_data()) == json_body
+
+    def test_msgpack_request(self, client):
+        """Test that msgpack request bodies are accepted."""
+        import msgpack
+        response = client.post("/move", data=msgpack.packb({"board": [None] * 9, "index": 6}),
+                               content_type="application/msgpack")
+        assert response.status_code == 200
+        assert response.get_json()["board"][6] == 'X'
+
+    def test_invalid_msgpack(self, client):
+        """Test that malformed msgpack bodies are rejected."""
+        response = client.post("/move", data=b"\xc1", content_type="application/msgpack")
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Invalid msgpack data"
+
+    def test_msgpack_errors_and_sessions(self, client):
+        """Test that errors and session endpoints follow the Accept header."""
+        import msgpack
+        headers = {"Accept": "application/msgpack"}
+        response = client.post("/move", json={"board": [None] * 9}, headers=headers)
+        assert response.status_code == 400
+        assert msgpack.unpackb(response.get_data(), strict_map_key=False)["error"] == "Invalid input"
+        created = client.post("/games", headers=headers)
+        assert created.status_code == 201
+        assert msgpack.unpackb(created.get_data())["board"] == [None] * 9
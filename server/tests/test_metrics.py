@@ -0,0 +1,100 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import metrics
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    """Current value of a metric sample in this process (0 when absent)."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics:
+    """Test cases for the Prometheus metrics."""
+
+    def test_move_phases_recorded(self, client):
+        """Test that a move records the parse, validate, human_move, search and encode phases."""
+        before = {phase: sample("tictactoe_phase_seconds_count", phase=phase)
+                  for phase in ("parse", "validate", "human_move", "search", "encode")}
+        board = ['X', 'O', None, None, None, None, None, None, None]
+        response = client.post("/move", json={"board": board, "index": 4})
+        assert response.status_code == 200
+        for phase, count in before.items():
+            assert sample("tictactoe_phase_seconds_count", phase=phase) == count + 1
+        assert sample("tictactoe_responses_total", route="/move", code="200") >= 1
+
+    def test_results_and_failures_counted(self, client):
+        """Test the game result and validation failure counters."""
+        wins = sample("tictactoe_move_results_total", result="X_wins")
+        invalid = sample("tictactoe_validation_failures_total", route="/move", reason="invalid_input")
+        illegal = sample("tictactoe_validation_failures_total", route="/move", reason="invalid_move")
+        client.post("/move", json={"board": ['X', None, 'X', None, 'O', None, None, 'O', None], "index": 1})
+        client.post("/move", json={"board": [None] * 9})
+        client.post("/move", json={"board": ['X', 'X', 'X', 'O', 'O', None, None, None, None], "index": 5})
+        assert sample("tictactoe_move_results_total", result="X_wins") == wins + 1
+        assert sample("tictactoe_validation_failures_total", route="/move", reason="invalid_input") == invalid + 1
+        assert sample("tictactoe_validation_failures_total", route="/move", reason="invalid_move") == illegal + 1
+
+    def test_cached_results_counted(self):
+        """Test that moves answered from the response cache count toward the result counter."""
+        from asgi import create_asgi_app
+        from main import create_app
+        from tests.test_asgi import call
+        request = {"board": ['X', None, 'X', None, 'O', None, None, 'O', None], "index": 1}
+        client = create_app('testing', search_workers=0).test_client()
+        asgi_app = create_asgi_app('testing', search_workers=0, max_threads=1)
+        wins = sample("tictactoe_move_results_total", result="X_wins")
+        caches = [client.post("/move", json=request).headers["X-Cache"] for _ in range(3)]
+        caches += [call(asgi_app, "POST", "/move", request)[1][b"x-cache"].decode() for _ in range(3)]
+        assert caches == ["MISS", "HIT", "HIT"] * 2
+        assert sample("tictactoe_move_results_total", result="X_wins") == wins + 6
+
+    def test_rate_limits_nodes_and_cache(self):
+        """Test the 429 counter, search node gauge and cache hit ratio."""
+        limited = sample("tictactoe_rate_limited_total", route="/move")
+        metrics.observe_request({"route": "/move", "status": 429, "duration_ms": 0.1, "phases_ms": {}})
+        assert sample("tictactoe_rate_limited_total", route="/move") == limited + 1
+
+        metrics.observe_request({"route": "/move", "status": 200, "duration_ms": 2.0,
+                                 "phases_ms": {"search": 1.5}, "nodes": 1234, "cache": "MISS"})
+        assert sample("tictactoe_last_search_nodes") == 1234
+        metrics.observe_request({"route": "/move", "status": 200, "duration_ms": 0.1,
+                                 "phases_ms": {}, "cache": "HIT"})
+        hits, misses = metrics._cache_lookups["HIT"], metrics._cache_lookups["MISS"]
+        assert sample("tictactoe_move_cache_hit_ratio") == hits / (hits + misses)
+
+    def test_metrics_endpoints(self, client):
+        """Test that Flask and ASGI both serve the Prometheus text format."""
+        from asgi import create_asgi_app
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert b"tictactoe_phase_seconds_bucket" in response.data
+        asgi_app = create_asgi_app('testing', search_workers=0, max_threads=1)
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(asgi_app({"type": "http", "method": "GET", "path": "/metrics", "headers": []}, receive, send))
+        assert sent[0]["status"] == 200
+        assert b"tictactoe_responses_total" in sent[1]["body"]
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        """Test that samples written by separate worker processes are aggregated in one scrape."""
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), TESTING="true")
+        record = ("import metrics; metrics.observe_request({'route': '/move', 'status': 200, "
+                  "'duration_ms': 1.0, 'phases_ms': {'search': 0.5}, 'result': 'draw'})")
+        server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", record], cwd=server_dir, env=env, check=True)
+        scrape = subprocess.run([sys.executable, "-c", "import metrics; print(metrics.render()[0].decode())"],
+                                cwd=server_dir, env=env, check=True, capture_output=True, text=True).stdout
+        assert 'tictactoe_move_results_total{result="draw"} 2.0' in scrape
+        assert 'tictactoe_phase_seconds_count{phase="search"} 2.0' in scrape
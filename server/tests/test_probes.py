@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+
+import pytest
+import request_log
+from probes import HealthMonitor
+from service import GameService
+
+
+@pytest.fixture(scope="module")
+def service():
+    """One game service shared by the monitors in this module."""
+    return GameService(search_workers=0)
+
+
+def asgi_get(app, path):
+    """Run a GET through an ASGI app and return (status, json body)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+class TestHealthMonitor:
+    """Test cases for warm-up, self-test and cached probe responses."""
+
+    def test_not_ready_until_warmed_up(self, service):
+        """Test that readiness waits for warm-up even when the self-test passed."""
+        monitor = HealthMonitor(service, background=False)
+        assert monitor.self_test["status"] == "ok"
+        status, body = monitor.readiness()
+        assert status == 503
+        assert json.loads(body)["warmed_up"] is False
+        monitor.warm_up()
+        status, body = monitor.readiness()
+        assert status == 200
+        assert json.loads(body)["status"] == "ready"
+        assert all(key in service.games for key in [(4, 4), (5, 4), (15, 5)])
+
+    def test_background_warm_up(self, service):
+        """Test that the background thread warms up the worker."""
+        monitor = HealthMonitor(service, interval=60)
+        try:
+            assert monitor.warmed_up.wait(5)
+            assert monitor.is_ready()
+        finally:
+            monitor.stop()
+
+    def test_failed_self_test(self, service, monkeypatch):
+        """Test that a wrong self-test answer makes the worker not ready."""
+        monitor = HealthMonitor(service, background=False)
+        monitor.warm_up()
+        monkeypatch.setattr(service.game, "get_computer_move", lambda board: 5)
+        assert monitor.run_self_test() is False
+        status, body = monitor.readiness()
+        assert status == 503
+        assert json.loads(body)["self_test"]["error"] == "expected move 2, got 5"
+
+    def test_stale_self_test(self, service):
+        """Test that readiness fails when the self-test stops running."""
+        monitor = HealthMonitor(service, interval=0.001, background=False)
+        monitor.warm_up()
+        time.sleep(0.01)
+        status, body = monitor.readiness()
+        assert status == 503
+        assert json.loads(body)["stale"] is True
+
+    def test_start_runs_self_test(self, service):
+        """Test that a worker forked long after the master's self-test is ready as soon as it starts."""
+        monitor = HealthMonitor(service, interval=60, background=False)
+        monitor.warm_up()
+        monitor._last_run -= 3600
+        assert monitor.readiness()[0] == 503
+        monitor.start()
+        try:
+            deadline = time.monotonic() + 5
+            while monitor.readiness()[0] != 200:
+                assert time.monotonic() < deadline, "self-test did not run on start"
+                time.sleep(0.01)
+        finally:
+            monitor.stop()
+
+    def test_fork_leaves_monitor_alone(self, service):
+        """Test that a forked child starts no self-test thread and a dropped monitor is freed."""
+        import gc
+        import os
+        import threading
+        import weakref
+        monitor = HealthMonitor(service, interval=60)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                os._exit(int(any(thread.name == "health-monitor" for thread in threading.enumerate())))
+            assert os.waitpid(pid, 0)[1] == 0
+        finally:
+            monitor.stop(wait=True)
+        ref = weakref.ref(monitor)
+        del monitor
+        gc.collect()
+        assert ref() is None
+
+    def test_cached_response(self, service):
+        """Test that probes return the same encoded bytes between self-tests."""
+        monitor = HealthMonitor(service, background=False)
+        monitor.warm_up()
+        assert monitor.readiness()[1] is monitor.readiness()[1]
+
+
+class TestProbeEndpoints:
+    """Test cases for /health/live and /health/ready."""
+
+    def test_flask_probes(self, client, monkeypatch):
+        """Test the Flask probes and that they skip request logging."""
+        monkeypatch.setattr(request_log, "finish", lambda token, status: pytest.fail("probe was logged"))
+        assert client.get("/health/live").get_json() == {"status": "alive"}
+        monitor = client.application.extensions['health_monitor']
+        assert monitor.warmed_up.wait(5)
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.get_json()["self_test"]["status"] == "ok"
+
+    def test_health_reports_readiness(self, client):
+        """Test that the full health check includes the readiness flag."""
+        client.application.extensions['health_monitor'].warmed_up.wait(5)
+        checks = client.get("/health").get_json()["checks"]
+        assert checks["game_logic"] == "ok"
+        assert checks["ready"] is True
+
+    def test_asgi_probes(self):
+        """Test the ASGI probes."""
+        from asgi import create_asgi_app
+        app = create_asgi_app('testing', search_workers=0, max_threads=1)
+        assert asgi_get(app, "/health/live") == (200, {"status": "alive"})
+        assert app.health_monitor.warmed_up.wait(5)
+        status, body = asgi_get(app, "/health/ready")
+        assert status == 200 and body["status"] == "ready"
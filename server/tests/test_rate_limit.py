@@ -0,0 +1,193 @@
+import pytest
+from flask import Flask
+from rate_limit import HybridLimiter, RateLimit, RedisCounterStore, create_counter_store
+
+
+class Clock:
+    """Settable wall clock shared by the limiters of one test."""
+
+    def __init__(self, now=1_000_020.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(redis=None, clock=None, max_error=0.1):
+    """A limiter as one worker would have it, sharing the given stand-in."""
+    store = RedisCounterStore(redis) if redis is not None else None
+    return HybridLimiter(store=store, sync_interval=3600, max_error=max_error, clock=clock or Clock())
+
+
+class TestRateLimit:
+    """Test cases for limit parsing."""
+
+    def test_parse(self):
+        """Test the flask_limiter-style limit strings the app uses."""
+        limit = RateLimit("30 per minute")
+        assert (limit.amount, limit.period) == (30, 60)
+        assert RateLimit("200 per day").period == 86400
+        assert RateLimit("5/2 hours").period == 7200
+        with pytest.raises(ValueError):
+            RateLimit("often")
+
+    def test_counter_store_only_for_redis_urls(self):
+        """Test that memory:// storage limits per worker."""
+        assert create_counter_store("memory://") is None
+        assert create_counter_store("") is None
+        assert isinstance(create_counter_store("redis://localhost:6379"), RedisCounterStore)
+
+
+class TestHybridLimiter:
+    """Test cases for local token buckets and their Redis reconciliation."""
+
+    def test_local_bucket(self):
+        """Test that a worker without a shared store rejects past the limit and refills over time."""
+        clock = Clock()
+        limiter = make_limiter(clock=clock)
+        limits = [RateLimit("3 per minute")]
+        assert [limiter.hit("move", "1.2.3.4", limits)[0] for _ in range(4)] == [True, True, True, False]
+        assert limiter.hit("move", "5.6.7.8", limits)[0] is True
+        clock.now += 20
+        assert limiter.hit("move", "1.2.3.4", limits)[0] is True
+        assert limiter.hit("move", "1.2.3.4", limits)[0] is False
+
+    def test_all_limits_or_none(self):
+        """Test that a request rejected by one limit takes no tokens from the others."""
+        limiter = make_limiter()
+        limits = [RateLimit("10 per minute"), RateLimit("2 per hour")]
+        limiter.hit("default", "ip", limits)
+        limiter.hit("default", "ip", limits)
+        admitted, bucket = limiter.hit("default", "ip", limits)
+        assert not admitted and bucket.limit is limits[1]
+        assert limiter.buckets["default:10/60:ip"].tokens == 8
+
+    def test_requests_do_not_wait_on_redis(self, local_redis):
+        """Test that requests within the error bound are admitted without a round trip."""
+        redis = local_redis
+        limiter = make_limiter(redis)
+        limits = [RateLimit("30 per minute")]
+        for _ in range(3):
+            assert limiter.hit("move", "ip", limits)[0]
+        assert redis.round_trips == 0
+        limiter.sync()
+        assert redis.round_trips == 1
+        assert sum(redis.data.values()) == 3
+
+    def test_workers_share_the_limit(self, local_redis):
+        """Test that two workers together admit at most the limit plus each one's error bound."""
+        redis, clock = local_redis, Clock()
+        workers = [make_limiter(redis, clock), make_limiter(redis, clock)]
+        limits = [RateLimit("30 per minute")]
+        admitted = 0
+        for i in range(100):
+            worker = workers[i % 2]
+            admitted += worker.hit("move", "ip", limits)[0]
+            if i % 10 == 9:
+                for worker in workers:
+                    worker.sync()
+        bound = sum(worker.max_unsynced(limits[0]) for worker in workers)
+        assert 30 <= admitted <= 30 + bound
+        assert workers[0].inline_syncs > 0
+
+    def test_error_bound_forces_inline_sync(self, local_redis):
+        """Test that a worker that spent its error bound syncs before admitting more."""
+        redis, clock = local_redis, Clock()
+        first, second = make_limiter(redis, clock), make_limiter(redis, clock)
+        limits = [RateLimit("10 per minute")]
+        for _ in range(10):
+            assert first.hit("move", "ip", limits)[0]
+        assert first.inline_syncs == 9
+        # The second worker learns on its first sync that the limit is used up
+        assert second.hit("move", "ip", limits)[0] is True
+        assert second.hit("move", "ip", limits)[0] is False
+
+    def test_redis_outage_falls_back_to_local_limits(self, local_redis):
+        """Test that an unreachable store neither fails requests nor loses the spends."""
+        redis, clock = local_redis, Clock()
+        limiter = make_limiter(redis, clock)
+        limits = [RateLimit("5 per minute")]
+        redis.down = True
+        assert [limiter.hit("move", "ip", limits)[0] for _ in range(6)] == [True] * 5 + [False]
+        assert limiter.sync_failures == 1
+        redis.down = False
+        # Retried once the back-off of one sync interval has passed
+        clock.now += limiter.sync_interval
+        limiter.sync()
+        assert sum(redis.data.values()) == 5
+
+    def test_idle_buckets_dropped(self, local_redis):
+        """Test that synced buckets unused for a whole period are forgotten."""
+        redis, clock = local_redis, Clock()
+        limiter = make_limiter(redis, clock)
+        limiter.hit("move", "ip", [RateLimit("30 per minute")])
+        limiter.sync()
+        clock.now += 61
+        limiter.sync()
+        assert limiter.buckets == {}
+
+    def test_fork_resets_without_keeping_limiters(self):
+        """Test that a forked child starts with empty buckets and no sync thread, and dropped limiters are freed."""
+        import gc
+        import os
+        import weakref
+        limiter = HybridLimiter(default_limits=("30 per minute",))
+        limiter.hit("move", "ip", limiter.default_limits)
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if limiter.buckets == {} and limiter._thread is None else 1)
+        assert os.waitpid(pid, 0)[1] == 0
+        assert limiter.buckets
+        ref = weakref.ref(limiter)
+        del limiter
+        gc.collect()
+        assert ref() is None
+
+
+class TestFlaskIntegration:
+    """Test cases for the limiter on a Flask app."""
+
+    @pytest.fixture
+    def app(self):
+        """A small app with a limited, a default-limited, a costed and an exempt route."""
+        app = Flask(__name__)
+        app.config['RATELIMIT_HEADERS_ENABLED'] = True
+        limiter = HybridLimiter(app, key_func=lambda: "client", default_limits=("2 per hour",))
+
+        @limiter.limit("3 per minute")
+        def move():
+            return "ok"
+
+        @limiter.limit("5 per minute", cost=lambda: 3)
+        def moves():
+            return "ok"
+
+        @limiter.exempt
+        def health():
+            return "ok"
+
+        app.add_url_rule('/move', 'move', move)
+        app.add_url_rule('/moves', 'moves', moves)
+        app.add_url_rule('/health', 'health', health)
+        app.add_url_rule('/games', 'games', lambda: "ok")
+        return app
+
+    def test_route_and_default_limits(self, app):
+        """Test route limits, default limits, request costs and exempt routes."""
+        client = app.test_client()
+        assert [client.get('/move').status_code for _ in range(4)] == [200, 200, 200, 429]
+        assert [client.get('/games').status_code for _ in range(3)] == [200, 200, 429]
+        assert [client.get('/moves').status_code for _ in range(2)] == [200, 429]
+        assert all(client.get('/health').status_code == 200 for _ in range(5))
+
+    def test_headers(self, app):
+        """Test the X-RateLimit headers and Retry-After on rejection."""
+        client = app.test_client()
+        response = client.get('/move')
+        assert response.headers['X-RateLimit-Limit'] == "3"
+        assert response.headers['X-RateLimit-Remaining'] == "2"
+        for _ in range(2):
+            client.get('/move')
+        response = client.get('/move')
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
@@ -0,0 +1,120 @@
+import json
+import logging
+
+import pytest
+import request_log
+from config.logs import RequestContextFilter, make_formatter
+from asgi import create_asgi_app
+from tests.test_asgi import call
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Collect the request events emitted by request_log.finish."""
+    emitted = []
+    finish = request_log.finish
+
+    def record(token, status):
+        emitted.append(finish(token, status))
+        return emitted[-1]
+
+    monkeypatch.setattr(request_log, "finish", record)
+    return emitted
+
+
+@pytest.fixture(scope="module")
+def asgi_app():
+    """Create one ASGI app for the module."""
+    return create_asgi_app('testing', search_workers=0, max_threads=2)
+
+
+def near_full_4x4():
+    """A 4x4 board with two empty cells, cheap to search but above the inline threshold."""
+    board = ['O', 'X', 'X', 'O', 'O', 'O', 'O', 'X', 'X', 'X', 'O', 'X', 'X', 'O', None, None]
+    return {"board": board, "index": 14, "size": 4}
+
+
+class TestRequestContext:
+    """Test cases for request context, fields and phase timings."""
+
+    def test_event_fields(self):
+        """Test that bound fields and phase timings end up in the event."""
+        token = request_log.begin("POST", "/move", "req-1")
+        request_log.bind(index=4, nodes=12)
+        with request_log.phase("search"):
+            pass
+        with request_log.phase("search"):
+            pass
+        event = request_log.finish(token, 200)
+        assert event["request_id"] == "req-1"
+        assert event["index"] == 4 and event["nodes"] == 12
+        assert set(event["phases_ms"]) == {"search"}
+        assert event["status"] == 200 and event["duration_ms"] >= 0
+        assert request_log.current_request_id() is None
+
+    def test_oversized_request_id_replaced(self):
+        """Test that overlong client request ids are replaced by a generated one."""
+        token = request_log.begin("GET", "/health", "x" * 1000)
+        assert len(request_log.current_request_id()) == 32
+        request_log.finish(token, 200)
+
+    def test_outside_request_is_noop(self):
+        """Test that bind and phase do nothing without an open request."""
+        request_log.bind(index=1)
+        with request_log.phase("search"):
+            pass
+        assert request_log.current_request_id() is None
+
+    def test_json_formatter(self):
+        """Test that stdlib records render as JSON with the request id."""
+        record = logging.LogRecord("app", logging.WARNING, __file__, 1, "Input validation failed: %s",
+                                   ({"index": ["bad"]},), None)
+        token = request_log.begin("POST", "/move", "req-2")
+        RequestContextFilter().filter(record)
+        request_log.finish(token, 400)
+        line = json.loads(make_formatter('json').format(record))
+        assert line["event"] == "Input validation failed: {'index': ['bad']}"
+        assert line["level"] == "warning"
+        assert line["request_id"] == "req-2"
+        assert line["timestamp"].endswith("Z")
+
+
+class TestRequestEvents:
+    """Test cases for the request events emitted by the apps."""
+
+    def test_flask_move_event(self, client, events):
+        """Test that a move logs its request id, index, nodes and phases."""
+        response = client.post("/move", json=near_full_4x4(), headers={"X-Request-ID": "abc"})
+        assert response.headers["X-Request-ID"] == "abc"
+        event = events[-1]
+        assert event["request_id"] == "abc" and event["path"] == "/move" and event["status"] == 200
+        assert event["index"] == 14 and event["size"] == 4 and "nodes" in event
+        assert {"parse", "cache", "validate", "search", "encode"} <= set(event["phases_ms"])
+
+    def test_flask_pool_search_event(self, events):
+        """Test that a move searched in the pool still logs its nodes."""
+        from main import create_app
+        app = create_app('testing', search_workers=1)
+        try:
+            with app.test_client() as pool_client:
+                response = pool_client.post("/move", json={"board": [None] * 16, "index": 0, "size": 4})
+            assert response.status_code == 200
+            assert app.extensions['search_executor'].stats()["submitted"] == 1
+            assert events[-1]["nodes"] > 0
+        finally:
+            app.extensions['search_executor'].shutdown()
+
+    def test_flask_generates_request_id(self, client, events):
+        """Test that requests without X-Request-ID get a generated one."""
+        response = client.post("/games")
+        assert response.headers["X-Request-ID"] == events[-1]["request_id"]
+        assert events[-1]["game_id"] == response.get_json()["game_id"]
+
+    def test_asgi_search_phase_in_thread(self, asgi_app, events):
+        """Test that searches run in the thread pool are logged with their request."""
+        status, headers, _ = call(asgi_app, "POST", "/move", near_full_4x4(), [(b"x-request-id", b"def")])
+        assert status == 200
+        assert headers[b"x-request-id"] == b"def"
+        event = events[-1]
+        assert event["request_id"] == "def"
+        assert "search" in event["phases_ms"] and "nodes" in event
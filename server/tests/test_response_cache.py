@@ -0,0 +1,36 @@
+from response_cache import MoveResponseCache
+
+class TestMoveResponseCache:
+    """Test cases for the /move response cache."""
+
+    def test_key_from_request(self):
+        """Test that the key covers board, index and variant."""
+        key = MoveResponseCache.key({"board": [None] * 9, "index": 4})
+        assert key == ((None,) * 9, 4, None, None, "application/json")
+        assert key != MoveResponseCache.key({"board": [None] * 9, "index": 4, "size": 3})
+        assert key != MoveResponseCache.key({"board": [None] * 9, "index": 4}, "application/msgpack")
+
+    def test_uncacheable_requests(self):
+        """Test that requests with extra fields or odd shapes get no key."""
+        assert MoveResponseCache.key({"board": [None] * 9, "index": 4, "extra": 1}) is None
+        assert MoveResponseCache.key({"board": "xxx", "index": 4}) is None
+        assert MoveResponseCache.key({"board": [[1]], "index": 4}) is None
+        assert MoveResponseCache.key([1, 2]) is None
+        assert MoveResponseCache.key({"board": [None] * 9, "index": True}) is None
+        assert MoveResponseCache.key({"board": [None] * 9, "index": 4, "size": 3.0}) is None
+        assert MoveResponseCache.key({"board": [True] + [None] * 8, "index": 4}) is None
+
+    def test_put_and_get(self):
+        """Test that stored bytes come back with a stable ETag."""
+        cache = MoveResponseCache(max_size=2)
+        key = MoveResponseCache.key({"board": [None] * 9, "index": 4})
+        assert cache.get(key) is None
+        etag = cache.put(key, b'{"status":"in_progress"}', "in_progress")
+        assert cache.get(key) == (b'{"status":"in_progress"}', etag, "in_progress")
+        assert etag.startswith('"') and etag.endswith('"')
+        assert cache.stats()["hits"] == 1
+
+    def test_cache_control(self):
+        """Test the Cache-Control header for the configured max age."""
+        assert MoveResponseCache(max_age=60).cache_control == "public, max-age=60"
+        assert MoveResponseCache(max_age=0).cache_control == "no-cache"
@@ -0,0 +1,84 @@
+import pytest
+from schemas import CELL_ERROR, MoveSchema, MoveValidator, validate_move_input
+
+# Requests whose outcome must match the marshmallow schema exactly
+SCHEMA_CASES = [
+    {"board": [None] * 9, "index": 4},
+    {"board": ['X', None, 'O'] + [None] * 6, "index": 1, "size": 3},
+    {"board": [None] * 16, "index": 0, "size": 4},
+    {"board": [None] * 25, "index": 0, "size": 5, "win_length": 4},
+    {"board": [None] * 9, "index": 4, "win_length": None},
+    {"board": [None] * 9, "index": "4"},
+    {"board": [None] * 9, "index": 4.0},
+    {"board": [None] * 9, "index": True},
+    {"board": [None] * 9, "index": None},
+    {"board": [None] * 9},
+    {"index": 4},
+    {"board": None, "index": 1},
+    {"board": "abc", "index": 1},
+    {"board": [None] * 9, "index": 1, "size": None},
+    {"board": [None] * 9, "index": 1, "size": "3"},
+    {"board": [None] * 9, "index": 1, "size": 7},
+    {"board": [None] * 9, "index": 1, "win_length": 4},
+    {"board": [None] * 9, "index": 1, "extra": 2},
+    {"board": [None] * 8, "index": 1},
+    {"board": [None] * 9, "index": 0, "size": 4},
+    {"board": [None] * 9, "index": 9},
+    {"board": [None] * 9, "index": -1},
+    {"board": ['X'] + [None] * 8, "index": 0},
+    {"board": ['X'] + [None] * 8, "index": "0"},
+    {},
+    [1],
+    "board",
+    None,
+]
+
+def schema_result(data):
+    """Load a request with a fresh marshmallow schema."""
+    from marshmallow import ValidationError
+    try:
+        return MoveSchema().load(data), None
+    except ValidationError as err:
+        return None, err.messages
+
+class TestMoveValidator:
+    """Test cases for the precompiled move validator."""
+
+    @pytest.mark.parametrize("data", SCHEMA_CASES)
+    def test_matches_schema(self, data):
+        """Test that results and error messages match marshmallow."""
+        assert validate_move_input(data) == schema_result(data)
+
+    def test_compiled_from_schema(self):
+        """Test that supported sizes and defaults come from MoveSchema."""
+        validator = MoveValidator()
+        assert validator.sizes == {3, 4, 5, 15}
+        assert validator.default_size == 3
+        assert validator.field_names == {"board", "index", "size", "win_length"}
+
+    def test_invalid_cells_rejected(self):
+        """Test that cell values other than X, O and null are reported per position."""
+        data, errors = validate_move_input({"board": ['X', 'Z', None, 1, None, None, None, None, None], "index": 2})
+        assert data is None
+        assert errors == {"board": {1: [CELL_ERROR], 3: [CELL_ERROR]}}
+
+    def test_invalid_cells_on_schema_path(self):
+        """Test that cells are also checked when the request needs marshmallow coercion."""
+        _, errors = validate_move_input({"board": [{}] + [None] * 8, "index": "2"})
+        assert errors == {"board": {0: [CELL_ERROR]}}
+
+    def test_length_and_index_checked(self):
+        """Test that board length, index range and occupied cells fail validation, not the game."""
+        assert validate_move_input({"board": [None] * 9, "index": 0, "size": 4}) == \
+            (None, {"board": ["Invalid board size: 9"]})
+        assert validate_move_input({"board": [None] * 16, "index": 16, "size": 4}) == \
+            (None, {"index": ["Invalid move index: 16"]})
+        assert validate_move_input({"board": [None] * 4 + ['O'] + [None] * 4, "index": 4}) == \
+            (None, {"index": ["Position 4 already occupied"]})
+
+    def test_board_is_copied(self):
+        """Test that the validated board can be changed without touching the request."""
+        request = {"board": [None] * 9, "index": 4}
+        data, _ = validate_move_input(request)
+        data["board"][4] = 'X'
+        assert request["board"][4] is None
@@ -0,0 +1,57 @@
+import msgpack
+import pytest
+import serialization
+from serialization import JSON, MSGPACK, dumps, loads, negotiate
+
+class TestNegotiation:
+    """Test cases for picking the response media type."""
+
+    @pytest.mark.parametrize("accept,expected", [
+        (None, JSON),
+        ("", JSON),
+        ("*/*", JSON),
+        ("application/json", JSON),
+        ("application/msgpack", MSGPACK),
+        ("application/x-msgpack", MSGPACK),
+        ("application/msgpack, */*", MSGPACK),
+        ("application/json;q=0.5, application/msgpack", MSGPACK),
+        ("application/msgpack;q=0.5, application/json", JSON),
+        ("application/msgpack;q=0", JSON),
+        ("text/html", JSON),
+    ])
+    def test_negotiate(self, accept, expected):
+        """Test q-values, explicit types and wildcards."""
+        assert negotiate(accept) == expected
+
+class TestEncoding:
+    """Test cases for encoding and decoding bodies."""
+
+    def test_json_round_trip(self):
+        """Test compact JSON output that decodes to the same object."""
+        body = {"board": ['X', None, 'O'], "status": "in_progress"}
+        payload = dumps(body)
+        assert payload == b'{"board":["X",null,"O"],"status":"in_progress"}'
+        assert loads(payload) == body
+
+    def test_json_integer_keys(self):
+        """Test that per-cell error dicts with integer keys can be encoded."""
+        assert loads(dumps({"board": {1: ["bad"]}})) == {"board": {"1": ["bad"]}}
+
+    def test_msgpack_round_trip(self):
+        """Test that msgpack bodies are smaller and decode to the same object."""
+        body = {"board": [None] * 225, "status": "in_progress"}
+        payload = dumps(body, MSGPACK)
+        assert msgpack.unpackb(payload) == body
+        assert loads(payload, "application/x-msgpack") == body
+        assert len(payload) < len(dumps(body)) / 3
+
+    def test_invalid_bodies_raise_value_error(self):
+        """Test that malformed JSON and msgpack both raise ValueError."""
+        with pytest.raises(ValueError):
+            loads(b"{nope")
+        with pytest.raises(ValueError):
+            loads(b"\xc1", MSGPACK)
+
+    def test_fast_encoder_detected(self):
+        """Test that the encoder in use is reported."""
+        assert serialization.JSON_ENCODER in ("orjson", "json")
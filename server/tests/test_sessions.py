@@ -0,0 +1,122 @@
+import time
+from sessions import MemorySessionStore, RedisSessionStore, create_session_store, new_game_id
+
+def make_state(board=None):
+    """Build a session state for a 3x3 game."""
+    return {"board": board or [None] * 9, "size": 3, "win_length": 3, "status": "in_progress"}
+
+class TestMemorySessionStore:
+    """Test cases for the in-process session store."""
+
+    def test_put_and_get(self):
+        """Test that a stored session is returned as an independent copy."""
+        store = MemorySessionStore()
+        store.put("g1", make_state())
+        state = store.get("g1")
+        state["board"][0] = 'X'
+        assert store.get("g1")["board"][0] is None
+        assert store.get("missing") is None
+
+    def test_sessions_expire(self):
+        """Test that sessions past their TTL are dropped."""
+        store = MemorySessionStore(ttl=0.01)
+        store.put("g1", make_state())
+        time.sleep(0.02)
+        assert store.get("g1") is None
+        assert store.stats()["expirations"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used session is evicted when full."""
+        store = MemorySessionStore(max_size=2)
+        store.put("g1", make_state())
+        store.put("g2", make_state())
+        store.get("g1")
+        store.put("g3", make_state())
+        assert store.get("g2") is None
+        assert store.get("g1") is not None
+        assert store.stats()["evictions"] == 1
+
+    def test_replace_only_unchanged_session(self):
+        """Test that a move is saved only over the state it was computed from."""
+        store = MemorySessionStore()
+        store.put("g1", make_state())
+        before = store.get("g1")
+        assert store.replace("g1", before, make_state(['X', 'O'] + [None] * 7))
+        assert not store.replace("g1", before, make_state([None, 'O', 'X'] + [None] * 6))
+        assert store.get("g1")["board"][:2] == ['X', 'O']
+        assert not store.replace("missing", before, make_state())
+
+    def test_delete(self):
+        """Test that deleted sessions are gone."""
+        store = MemorySessionStore()
+        store.put("g1", make_state())
+        store.delete("g1")
+        assert store.get("g1") is None
+
+class TestRedisSessionStore:
+    """Test cases for the Redis session store against a local stand-in."""
+
+    def test_round_trip(self, local_redis):
+        """Test that sessions survive JSON serialization."""
+        store = RedisSessionStore(local_redis, ttl=60)
+        state = make_state(['X', None, None, None, 'O', None, None, None, None])
+        store.put("g1", state)
+        assert store.get("g1") == state
+        store.delete("g1")
+        assert store.get("g1") is None
+
+    def test_replace_is_compare_and_set(self, local_redis):
+        """Test that replace fails when the session changed before or during the transaction."""
+        client = local_redis
+        store = RedisSessionStore(client, ttl=60)
+        store.put("g1", make_state())
+        before = store.get("g1")
+        assert store.replace("g1", before, make_state(['X', 'O'] + [None] * 7))
+        assert not store.replace("g1", before, make_state([None, 'O', 'X'] + [None] * 6))
+
+        current = store.get("g1")
+        pipeline = client.pipeline
+
+        def interleaved():
+            # Another worker writes after this worker compared the session, before EXEC
+            transaction = pipeline()
+            get = transaction.get
+
+            def get_then_write(name):
+                payload = get(name)
+                store.put("g1", make_state(['X', 'O', 'X', 'O'] + [None] * 5))
+                return payload
+            transaction.get = get_then_write
+            return transaction
+        client.pipeline = interleaved
+        assert not store.replace("g1", current, make_state(['X', 'O', 'O'] + [None] * 6))
+        assert store.get("g1")["board"][:4] == ['X', 'O', 'X', 'O']
+
+    def test_keys_are_prefixed(self, local_redis):
+        """Test that sessions live under the store prefix."""
+        RedisSessionStore(local_redis, prefix="ttt:").put("g1", make_state())
+        assert list(local_redis.data) == ["ttt:g1"]
+
+class TestSessionHelpers:
+    """Test cases for session ids and store selection."""
+
+    def test_game_ids_are_unique(self):
+        """Test that game ids do not repeat."""
+        assert len({new_game_id() for _ in range(100)}) == 100
+
+    def test_memory_store_by_default(self):
+        """Test that no URL selects the in-process store."""
+        store = create_session_store(None, max_size=5, ttl=10)
+        assert isinstance(store, MemorySessionStore)
+        assert store.max_size == 5
+
+    def test_production_shares_sessions_through_redis(self, monkeypatch):
+        """Test that production keeps sessions in REDIS_URL unless SESSION_STORE_URL is set."""
+        import importlib
+        monkeypatch.setenv("SECRET_KEY", "test-secret")
+        monkeypatch.setenv("REDIS_URL", "redis://cache:6379")
+        monkeypatch.delenv("SESSION_STORE_URL", raising=False)
+        import config.production
+        assert importlib.reload(config.production).ProductionConfig.SESSION_STORE_URL == "redis://cache:6379"
+        monkeypatch.setenv("SESSION_STORE_URL", "redis://sessions:6379/1")
+        assert importlib.reload(config.production).ProductionConfig.SESSION_STORE_URL == "redis://sessions:6379/1"
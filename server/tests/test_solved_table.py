@@ -0,0 +1,118 @@
+import mmap
+import sys
+
+import pytest
+import solved_table
+from game import TicTacToeGame
+from solved_table import (
+    build_table, encode_board, enumerate_positions, load_solved_table, parse_table, HEADER
+)
+
+@pytest.fixture(scope="module")
+def table_bytes():
+    """Build the solved table once for the module."""
+    return build_table()
+
+class TestEncoding:
+    """Test cases for base-3 board encoding."""
+
+    def test_encode_empty_and_full(self):
+        """Test encoding of boundary boards."""
+        assert encode_board([None] * 9) == 0
+        assert encode_board(['O'] * 9) == 3 ** 9 - 1
+
+    def test_encode_rejects_invalid_boards(self):
+        """Test that malformed boards cannot be encoded."""
+        assert encode_board([None] * 8) is None
+        assert encode_board(['Z'] + [None] * 8) is None
+        assert encode_board([[1]] + [None] * 8) is None
+
+class TestSolvedTable:
+    """Test cases for the precomputed move table."""
+
+    def test_positions_have_computer_to_move(self):
+        """Test that every enumerated position is the computer's turn."""
+        positions = enumerate_positions()
+        assert len(positions) > 2000
+        for board in positions:
+            assert board.count('X') == board.count('O') + 1
+
+    def test_table_matches_search(self, table_bytes):
+        """Test that every table entry matches the live search."""
+        table = parse_table(table_bytes)
+        game = TicTacToeGame()
+        for board in enumerate_positions():
+            move, score = table.lookup(board)
+            assert move == game.get_computer_move(board)
+            assert score in (-1, 0, 1)
+
+    def test_checked_in_artifact_is_current(self, table_bytes):
+        """Test that data/solved_table.bin matches a fresh build."""
+        table = load_solved_table()
+        assert table is not None
+        assert table.checksum == parse_table(table_bytes).checksum
+
+    def test_corrupt_artifact_is_rejected(self, table_bytes, tmp_path):
+        """Test that a checksum mismatch falls back to no table."""
+        corrupt = bytearray(table_bytes)
+        corrupt[HEADER.size] ^= 0xFF
+        path = tmp_path / "solved.bin"
+        path.write_bytes(bytes(corrupt))
+
+        with pytest.raises(ValueError, match="checksum"):
+            parse_table(bytes(corrupt))
+        assert load_solved_table(str(path)) is None
+
+    def test_missing_artifact_returns_none(self, tmp_path):
+        """Test that a missing file falls back to no table."""
+        assert load_solved_table(str(tmp_path / "missing.bin")) is None
+
+    def test_game_uses_table_before_search(self, table_bytes):
+        """Test that get_computer_move answers from the table without searching."""
+        game = TicTacToeGame()
+        game.solved_table = parse_table(table_bytes)
+        move = game.get_computer_move(['X'] + [None] * 8)
+
+        assert move == 4
+        assert game.transposition_table.hits == 0
+        assert game.transposition_table.misses == 0
+
+    def test_records_build_algorithm(self, table_bytes):
+        """Test that the artifact records which engine produced it."""
+        assert parse_table(table_bytes).algorithm == 'minimax'
+
+        table = parse_table(build_table('alphabeta'))
+        assert table.algorithm == 'alphabeta'
+        board = ['O', 'X', None, 'X', 'O', 'X', None, None, None]
+        assert table.lookup(['X'] + [None] * 8)[0] == 4
+        assert table.lookup(board)[0] == 8
+
+    def test_artifact_is_memory_mapped(self):
+        """Test that the loaded table reads records straight from a shared mapping."""
+        table = load_solved_table()
+        assert isinstance(table.records.obj, mmap.mmap)
+        assert len(table) == len(enumerate_positions())
+        assert table.lookup(['X'] + [None] * 8) == (4, 0)
+
+    def test_positions_outside_table(self, table_bytes):
+        """Test that positions the computer never faces have empty records."""
+        table = parse_table(table_bytes)
+        assert table.lookup([None] * 9) is None
+        assert table.lookup(['X', 'X', 'X', 'O', 'O', None, None, None, None]) is None
+        assert table.lookup([None] * 16) is None
+
+    def test_other_version_is_rejected(self, table_bytes):
+        """Test that an artifact with another format version is not read."""
+        data = bytearray(table_bytes)
+        data[4] = solved_table.VERSION - 1
+        with pytest.raises(ValueError, match="version"):
+            parse_table(bytes(data))
+
+    def test_builder_replaces_file(self, tmp_path, monkeypatch):
+        """Test that the builder CLI writes a loadable table through a temporary file."""
+        path = tmp_path / "solved.bin"
+        path.write_bytes(b"old")
+        monkeypatch.setattr(sys, "argv", ["solved_table.py", "--output", str(path)])
+        solved_table.main()
+        assert [p.name for p in tmp_path.iterdir()] == ["solved.bin"]
+        assert load_solved_table(str(path)).checksum == load_solved_table().checksum
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+import types
+
+import integrations
+from flask import Flask
+from startup import StartupProfile, slowest_imports
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that a development app must not import at startup
+OPTIONAL_PACKAGES = ("sentry_sdk", "flask_talisman", "flask_limiter", "redis", "structlog")
+
+
+def run_python(code, **env):
+    """Run code in a fresh interpreter from the server directory and return its stdout."""
+    environ = {key: value for key, value in os.environ.items() if key not in ("TESTING", "FLASK_ENV")}
+    environ.update(env)
+    return subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, env=environ,
+                          check=True, capture_output=True, text=True).stdout
+
+
+class TestStartupProfile:
+    """Test cases for startup step timings."""
+
+    def test_steps_accumulate(self):
+        """Test that repeated steps add up and the total sums all steps."""
+        profile = StartupProfile()
+        with profile.step("imports"):
+            pass
+        with profile.step("imports"):
+            pass
+        with profile.step("service"):
+            pass
+        result = profile.as_dict()
+        assert set(result["steps_ms"]) == {"imports", "service"}
+        assert result["total_ms"] == round(sum(result["steps_ms"].values()), 3)
+
+    def test_health_reports_startup(self, client):
+        """Test that /health includes the startup timings of the app."""
+        startup = client.get("/health").get_json()["checks"]["startup"]
+        assert {"imports", "config", "service", "health_monitor"} <= set(startup["steps_ms"])
+        assert startup["total_ms"] >= 0
+
+    def test_slowest_imports(self):
+        """Test that the import profile lists packages, not the app's own modules."""
+        packages = dict(slowest_imports("import main", limit=50))
+        assert "flask" in packages
+        assert "main" not in packages and "config" not in packages
+
+
+class TestLazyStartup:
+    """Test cases for deferred app creation and optional integrations."""
+
+    def test_import_main_builds_no_app(self):
+        """Test that importing main neither creates the app nor configures logging."""
+        out = run_python("import main, logging; print('app' in vars(main), len(logging.getLogger().handlers))")
+        assert out.split() == ["False", "0"]
+
+    def test_development_app_skips_optional_packages(self):
+        """Test that a development app imports no optional integration."""
+        code = ("import sys, main; main.app; "
+                f"print([name for name in {OPTIONAL_PACKAGES!r} if name in sys.modules])")
+        assert run_python(code, FLASK_ENV="development", LOG_TO_STDOUT="true", LOG_LEVEL="ERROR").strip() == "[]"
+
+    def test_lazy_sentry(self):
+        """Test that lazy mode initializes Sentry on the first captured exception."""
+        code = ("import sys, main, integrations; main.app; print('sentry_sdk' in sys.modules); "
+                "integrations.capture_exception(ValueError('boom')); print('sentry_sdk' in sys.modules)")
+        out = run_python(code, FLASK_ENV="development", LOG_TO_STDOUT="true", LOG_LEVEL="ERROR",
+                         STARTUP_MODE="lazy", SENTRY_DSN="http://key@127.0.0.1:9/1")
+        assert out.split() == ["False", "True"]
+
+    def test_capture_without_sentry_is_noop(self, monkeypatch):
+        """Test that capturing an exception without SENTRY_DSN does nothing."""
+        monkeypatch.delenv("SENTRY_DSN", raising=False)
+        monkeypatch.setattr(integrations, "_sentry_active", None)
+        integrations.capture_exception(ValueError("boom"))
+        assert integrations._sentry_active is False
+
+    def test_production_limiter(self, monkeypatch):
+        """Test that production apps get a rate limiter and other environments do not."""
+        config = types.SimpleNamespace(RATELIMIT_STORAGE_URL="memory://")
+        assert integrations.init_limiter(Flask(__name__), config) is None
+        monkeypatch.setenv("FLASK_ENV", "production")
+        assert integrations.init_limiter(Flask(__name__), config) is not None
@@ -0,0 +1,103 @@
+import pytest
+from transposition import TranspositionTable, symmetry_permutations
+
+class TestSymmetryPermutations:
+    """Test cases for board symmetry generation."""
+
+    def test_eight_distinct_permutations(self):
+        """Test that a 3x3 grid has 8 distinct symmetries."""
+        perms = symmetry_permutations(3)
+        assert len(perms) == 8
+        assert len(set(perms)) == 8
+
+    def test_identity_is_first(self):
+        """Test that the first permutation leaves the board unchanged."""
+        assert symmetry_permutations(3)[0] == tuple(range(9))
+
+    def test_center_is_fixed(self):
+        """Test that every symmetry keeps the center cell in place."""
+        for perm in symmetry_permutations(3):
+            assert perm[4] == 4
+            assert sorted(perm) == list(range(9))
+
+    def test_corners_map_to_corners(self):
+        """Test that corners only ever map onto corners."""
+        corners = {0, 2, 6, 8}
+        for perm in symmetry_permutations(3):
+            assert {perm[c] for c in corners} == corners
+
+class TestTranspositionTable:
+    """Test cases for the bounded LRU transposition table."""
+
+    def test_miss_then_hit(self):
+        """Test that lookups count hits and misses."""
+        table = TranspositionTable(max_size=4)
+        assert table.get('a') is None
+        table.put('a', 0)
+        assert table.get('a') == 0
+        assert table.hits == 1
+        assert table.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted first."""
+        table = TranspositionTable(max_size=2)
+        table.put('a', 1)
+        table.put('b', 2)
+        table.get('a')
+        table.put('c', 3)
+
+        assert 'a' in table
+        assert 'b' not in table
+        assert 'c' in table
+        assert table.evictions == 1
+        assert len(table) == 2
+
+    def test_zero_size_disables_storage(self):
+        """Test that a zero-sized table never stores entries."""
+        table = TranspositionTable(max_size=0)
+        table.put('a', 1)
+        assert len(table) == 0
+
+    def test_stats_and_clear(self):
+        """Test that stats report counters and clear resets them."""
+        table = TranspositionTable(max_size=4)
+        table.put('a', 1)
+        table.get('a')
+        table.get('b')
+        stats = table.stats()
+        assert stats['hit_rate'] == pytest.approx(0.5)
+        assert stats['size'] == 1
+
+        table.clear()
+        assert table.stats()['hits'] == 0
+        assert len(table) == 0
+
+    def test_concurrent_access(self):
+        """Test that threads sharing a small table never fail a lookup or lose a count."""
+        import sys
+        import threading
+        table = TranspositionTable(max_size=4)
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(5000):
+                    table.put((offset + i) % 8, i)
+                    table.get((offset + i + 1) % 8)
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert errors == []
+        stats = table.stats()
+        assert stats['hits'] + stats['misses'] == 4 * 5000
+        assert len(table) == 4
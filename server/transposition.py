@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+def symmetry_permutations(dim: int) -> List[Tuple[int, ...]]:
+    """Index permutations for the 8 rotations and reflections of a dim x dim grid.
+
+    Each permutation maps a destination cell to its source cell, so the
+    transformed board is ``[board[p] for p in perm]``.
+    """
+    last = dim - 1
+    transforms = [
+        lambda r, c: (r, c),                    # identity
+        lambda r, c: (last - c, r),             # rotate 90
+        lambda r, c: (last - r, last - c),      # rotate 180
+        lambda r, c: (c, last - r),             # rotate 270
+        lambda r, c: (r, last - c),             # mirror left-right
+        lambda r, c: (last - r, c),             # mirror top-bottom
+        lambda r, c: (c, r),                    # main diagonal
+        lambda r, c: (last - c, last - r),      # anti diagonal
+    ]
+    permutations = []
+    for transform in transforms:
+        perm = []
+        for index in range(dim * dim):
+            row, col = transform(*divmod(index, dim))
+            perm.append(row * dim + col)
+        permutations.append(tuple(perm))
+    return permutations
+
+
+class TranspositionTable:
+    """Bounded LRU cache for search results keyed on canonical positions.
+
+    Tables are shared by the request threads of a worker, so every access
+    to the LRU order and the counters holds a lock.
+    """
+
+    def __init__(self, max_size: int = 8192):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Return the cached value for a key, or None on a miss."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return size and hit/miss counters for monitoring."""
+        with self._lock:
+            hits, misses, evictions, size = self.hits, self.misses, self.evictions, len(self._entries)
+        lookups = hits + misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries